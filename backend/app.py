@@ -13,15 +13,19 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.core.config import settings
+from backend.core.http_transport import close_all as close_http_pools, get_azure_transport
 from backend.gateway.api import routes
 from backend.gateway.api.support_routes import build_support_router
 from backend.gateway.entry_handler import EntryHandler
 from backend.core.graph import compiled_graph
 from backend.storage.blob_storage import BlobStorageClient, CaseRepository, CaseReadRepository
+from backend.storage.case_neighbours import CaseNeighbourStore
+from backend.storage.index_pointer import resolve_index_name
 from backend.core.llm import get_llm
 from backend.storage.ingestion.case_ingestion import CaseEntryService, CaseIngestionService, CaseSearchIndex
 from backend.storage.ingestion.evidence_ingestion import EvidenceIngestionService
 from backend.storage.ingestion.knowledge_ingestion import KnowledgeIngestionService
+from backend.storage.knowledge_catalog import KnowledgeCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +52,8 @@ _blob_client = BlobStorageClient(
     settings.AZURE_STORAGE_CONTAINER,
 )
 _case_repository = CaseRepository(_blob_client)
+_knowledge_catalog = KnowledgeCatalog(_blob_client)
+_case_neighbours = CaseNeighbourStore(_blob_client, top_n=settings.CASE_NEIGHBOURS_TOP_N)
 _case_read_repository = CaseReadRepository(
     settings.AZURE_STORAGE_CONNECTION_STRING,
     settings.AZURE_STORAGE_CONTAINER,
@@ -57,6 +63,7 @@ _search_index = CaseSearchIndex(
     endpoint=settings.AZURE_SEARCH_ENDPOINT,
     index_name=settings.CASE_INDEX_NAME,
     admin_key=settings.AZURE_SEARCH_ADMIN_KEY,
+    follow_pointer=True,
 )
 
 
@@ -64,12 +71,14 @@ def _validate_search_indexes_exist() -> None:
     client = SearchIndexClient(
         endpoint=settings.AZURE_SEARCH_ENDPOINT,
         credential=AzureKeyCredential(settings.AZURE_SEARCH_ADMIN_KEY),
+        transport=get_azure_transport(settings.AZURE_SEARCH_ENDPOINT),
     )
-    for index_name in (
+    for logical_name in (
         settings.CASE_INDEX_NAME,
         settings.EVIDENCE_INDEX_NAME,
         settings.KNOWLEDGE_INDEX_NAME,
     ):
+        index_name = resolve_index_name(logical_name)
         try:
             client.get_index(index_name)
         except ResourceNotFoundError as exc:
@@ -81,6 +90,7 @@ _validate_search_indexes_exist()
 _case_ingestion = CaseIngestionService(
     search_index=_search_index,
     case_repository=_case_read_repository,
+    neighbour_store=_case_neighbours,
 )
 _case_entry = CaseEntryService(_case_repository)
 _evidence_ingestion = EvidenceIngestionService(
@@ -88,6 +98,7 @@ _evidence_ingestion = EvidenceIngestionService(
 )
 _knowledge_ingestion = KnowledgeIngestionService(
     _blob_client,
+    catalog=_knowledge_catalog,
 )
 _entry_handler = EntryHandler(
     case_entry=_case_entry,
@@ -121,6 +132,7 @@ app.include_router(
         entry_handler=_entry_handler,
         case_repository=_case_repository,
         blob_client=_blob_client,
+        knowledge_catalog=_knowledge_catalog,
     )
 )
 
@@ -131,4 +143,9 @@ def health_check() -> dict:
     return {"status": "ok"}
 
 
+@app.on_event("shutdown")
+def _close_http_pools() -> None:
+    close_http_pools()
+
+
 __all__ = ["app"]
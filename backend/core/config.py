@@ -140,6 +140,337 @@ class Settings(BaseSettings):
         description="Azure deployment name for powerful analysis, reflection, and formatting.",
     )
 
+    TOKENIZER_ENCODING: str = Field(
+        "cl100k_base",
+        env="TOKENIZER_ENCODING",
+        description="tiktoken encoding used to size ingestion chunks (matches the embedding deployment).",
+    )
+    KNOWLEDGE_SECTION_MAX_TOKENS: int = Field(
+        750,
+        env="KNOWLEDGE_SECTION_MAX_TOKENS",
+        description="Heading-based knowledge sections above this token count are sub-split.",
+    )
+    KNOWLEDGE_FALLBACK_SECTION_TOKENS: int = Field(
+        500,
+        env="KNOWLEDGE_FALLBACK_SECTION_TOKENS",
+        description="Section size in tokens when a knowledge document has no usable headings.",
+    )
+    KNOWLEDGE_FALLBACK_OVERLAP_TOKENS: int = Field(
+        50,
+        env="KNOWLEDGE_FALLBACK_OVERLAP_TOKENS",
+        description="Token overlap between fallback knowledge sections.",
+    )
+    KNOWLEDGE_SMALL_CHUNK_TOKENS: int = Field(
+        128,
+        env="KNOWLEDGE_SMALL_CHUNK_TOKENS",
+        description="Target size in tokens of knowledge small_chunk documents.",
+    )
+    KNOWLEDGE_SMALL_CHUNK_OVERLAP_TOKENS: int = Field(
+        25,
+        env="KNOWLEDGE_SMALL_CHUNK_OVERLAP_TOKENS",
+        description="Token overlap between knowledge small_chunk documents.",
+    )
+    EVIDENCE_CHUNK_TOKENS: int = Field(
+        1000,
+        env="EVIDENCE_CHUNK_TOKENS",
+        description="Target size in tokens of evidence chunks.",
+    )
+    EVIDENCE_CHUNK_OVERLAP_TOKENS: int = Field(
+        100,
+        env="EVIDENCE_CHUNK_OVERLAP_TOKENS",
+        description="Token overlap between evidence chunks.",
+    )
+    BULK_IMPORT_CONCURRENCY: int = Field(
+        8,
+        env="BULK_IMPORT_CONCURRENCY",
+        description="Cases saved and indexed in parallel during a bulk import.",
+    )
+    INDEX_POINTER_TTL_SECONDS: float = Field(
+        30.0,
+        env="INDEX_POINTER_TTL_SECONDS",
+        description="How long a resolved logical → physical index name is cached before re-reading the pointer blob.",
+    )
+    CASE_HNSW_M: int = Field(
+        4,
+        env="CASE_HNSW_M",
+        description="HNSW bi-directional links per node for the case index (4-10).",
+    )
+    CASE_HNSW_EF_CONSTRUCTION: int = Field(
+        400,
+        env="CASE_HNSW_EF_CONSTRUCTION",
+        description="HNSW candidate list size at build time for the case index (100-1000).",
+    )
+    CASE_HNSW_EF_SEARCH: int = Field(
+        500,
+        env="CASE_HNSW_EF_SEARCH",
+        description="HNSW candidate list size at query time for the case index (100-1000).",
+    )
+    CASE_VECTOR_METRIC: str = Field(
+        "cosine",
+        env="CASE_VECTOR_METRIC",
+        description="Vector similarity metric for the case index: cosine | euclidean | dotProduct.",
+    )
+    CASE_VECTOR_QUANTIZATION: str = Field(
+        "none",
+        env="CASE_VECTOR_QUANTIZATION",
+        description="Vector compression for the case index: none | scalar (int8 with rescoring).",
+    )
+    KNOWLEDGE_HNSW_M: int = Field(
+        4,
+        env="KNOWLEDGE_HNSW_M",
+        description="HNSW bi-directional links per node for the knowledge index (4-10).",
+    )
+    KNOWLEDGE_HNSW_EF_CONSTRUCTION: int = Field(
+        400,
+        env="KNOWLEDGE_HNSW_EF_CONSTRUCTION",
+        description="HNSW candidate list size at build time for the knowledge index (100-1000).",
+    )
+    KNOWLEDGE_HNSW_EF_SEARCH: int = Field(
+        500,
+        env="KNOWLEDGE_HNSW_EF_SEARCH",
+        description="HNSW candidate list size at query time for the knowledge index (100-1000).",
+    )
+    KNOWLEDGE_VECTOR_METRIC: str = Field(
+        "cosine",
+        env="KNOWLEDGE_VECTOR_METRIC",
+        description="Vector similarity metric for the knowledge index: cosine | euclidean | dotProduct.",
+    )
+    KNOWLEDGE_VECTOR_QUANTIZATION: str = Field(
+        "none",
+        env="KNOWLEDGE_VECTOR_QUANTIZATION",
+        description="Vector compression for the knowledge index: none | scalar (int8 with rescoring).",
+    )
+    LOCAL_CASE_INDEX_ENABLED: bool = Field(
+        True,
+        env="LOCAL_CASE_INDEX_ENABLED",
+        description="Answer closed-case similarity from the in-process replica of the case index.",
+    )
+    LOCAL_CASE_INDEX_DIR: str = Field(
+        ".cache/local_case_index",
+        env="LOCAL_CASE_INDEX_DIR",
+        description="Directory holding the memory-mapped closed-case replica.",
+    )
+    LOCAL_CASE_INDEX_SYNC_SECONDS: float = Field(
+        300.0,
+        env="LOCAL_CASE_INDEX_SYNC_SECONDS",
+        description="Minimum interval between incremental syncs of the closed-case replica.",
+    )
+    LOCAL_CASE_INDEX_ANN_THRESHOLD: int = Field(
+        20000,
+        env="LOCAL_CASE_INDEX_ANN_THRESHOLD",
+        description="Closed-case count from which an hnswlib graph replaces brute force (if installed).",
+    )
+    CASE_NEIGHBOURS_TOP_N: int = Field(
+        10,
+        env="CASE_NEIGHBOURS_TOP_N",
+        description="Similar closed cases precomputed per closed case (globally and per country).",
+    )
+    RETRIEVAL_CACHE_ENABLED: bool = Field(
+        True,
+        env="RETRIEVAL_CACHE_ENABLED",
+        description="Cache case/knowledge/evidence search results until the next write or TTL.",
+    )
+    RETRIEVAL_CACHE_TTL_SECONDS: float = Field(
+        300.0,
+        env="RETRIEVAL_CACHE_TTL_SECONDS",
+        description="Upper bound on the age of a cached retrieval result.",
+    )
+    RETRIEVAL_CACHE_MAX_ENTRIES: int = Field(
+        512,
+        env="RETRIEVAL_CACHE_MAX_ENTRIES",
+        description="LRU capacity of each cached search function.",
+    )
+    KNOWLEDGE_PASSAGE_CHARS: int = Field(
+        600,
+        env="KNOWLEDGE_PASSAGE_CHARS",
+        description="Character budget of the query-relevant passage extracted per knowledge hit.",
+    )
+    PROMPT_CASES_TOKEN_BUDGET: int = Field(
+        2500,
+        env="PROMPT_CASES_TOKEN_BUDGET",
+        description="Token budget for the supporting cases serialised into a reasoning prompt.",
+    )
+    PROMPT_CASES_MMR_LAMBDA: float = Field(
+        0.7,
+        env="PROMPT_CASES_MMR_LAMBDA",
+        description="MMR trade-off between relevance (1.0) and diversity (0.0) when selecting prompt cases.",
+    )
+    PROMPT_CASES_VECTOR_WEIGHT: float = Field(
+        0.5,
+        env="PROMPT_CASES_VECTOR_WEIGHT",
+        description="Weight of the retrieval score against local BM25 when re-ranking prompt cases.",
+    )
+    HTTP_POOL_MAXSIZE: int = Field(
+        32,
+        env="HTTP_POOL_MAXSIZE",
+        description="Keep-alive connections pooled per remote host (shared by all clients of that host).",
+    )
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = Field(
+        5.0,
+        env="HTTP_CONNECT_TIMEOUT_SECONDS",
+        description="TCP/TLS connect timeout of the shared HTTP pools.",
+    )
+    HTTP_READ_TIMEOUT_SECONDS: float = Field(
+        120.0,
+        env="HTTP_READ_TIMEOUT_SECONDS",
+        description="Read timeout of the shared HTTP pools.",
+    )
+    HTTP_KEEPALIVE_SECONDS: float = Field(
+        60.0,
+        env="HTTP_KEEPALIVE_SECONDS",
+        description="Idle time after which pooled httpx connections are closed.",
+    )
+    LLM_TPM_LIMIT: int = Field(
+        120000,
+        env="LLM_TPM_LIMIT",
+        description="Tokens-per-minute quota assumed for deployments not listed in LLM_DEPLOYMENT_QUOTAS.",
+    )
+    LLM_RPM_LIMIT: int = Field(
+        0,
+        env="LLM_RPM_LIMIT",
+        description="Requests-per-minute quota for unlisted deployments (0 = 6 per 1000 TPM, as Azure assigns).",
+    )
+    LLM_DEPLOYMENT_QUOTAS: str = Field(
+        "",
+        env="LLM_DEPLOYMENT_QUOTAS",
+        description="Per-deployment quotas as 'deployment=tpm/rpm,...' (rpm optional).",
+    )
+    LLM_QUEUE_TIMEOUT_SECONDS: float = Field(
+        120.0,
+        env="LLM_QUEUE_TIMEOUT_SECONDS",
+        description="Longest an LLM call waits in the scheduler queue for quota.",
+    )
+    LLM_MAX_RETRIES: int = Field(
+        3,
+        env="LLM_MAX_RETRIES",
+        description="Retries of throttled or transiently failing LLM calls (the scheduler owns retries).",
+    )
+    LLM_COMPLETION_TOKENS_ESTIMATE: int = Field(
+        800,
+        env="LLM_COMPLETION_TOKENS_ESTIMATE",
+        description="Completion tokens reserved per LLM call when max_tokens is not set.",
+    )
+    LLM_BACKENDS: str = Field(
+        "",
+        env="LLM_BACKENDS",
+        description="Role backend pools as 'role=endpoint|deployment[|api_key_env];...,role2=...' (overrides the role's single deployment).",
+    )
+    LLM_BACKEND_EJECT_SECONDS: float = Field(
+        30.0,
+        env="LLM_BACKEND_EJECT_SECONDS",
+        description="How long a failing LLM backend is taken out of its pool (doubles on repeat failures, up to 8x).",
+    )
+    LLM_BACKEND_EWMA_ALPHA: float = Field(
+        0.3,
+        env="LLM_BACKEND_EWMA_ALPHA",
+        description="Smoothing factor of the per-backend latency EWMA used for routing.",
+    )
+    SEARCH_RESILIENCE_ENABLED: bool = Field(
+        True,
+        env="SEARCH_RESILIENCE_ENABLED",
+        description="Deadlines, hedging and circuit breaking around search calls.",
+    )
+    SEARCH_DEADLINE_SECONDS: float = Field(
+        5.0,
+        env="SEARCH_DEADLINE_SECONDS",
+        description="Deadline of a search call; past it the caller gets a degraded result.",
+    )
+    SEARCH_HEDGING_ENABLED: bool = Field(
+        True,
+        env="SEARCH_HEDGING_ENABLED",
+        description="Send a duplicate search when the first is slower than the observed p95.",
+    )
+    SEARCH_HEDGE_MIN_SECONDS: float = Field(
+        0.1,
+        env="SEARCH_HEDGE_MIN_SECONDS",
+        description="Floor on the hedge delay, so fast indexes are not double-queried.",
+    )
+    SEARCH_BREAKER_FAILURES: int = Field(
+        5,
+        env="SEARCH_BREAKER_FAILURES",
+        description="Consecutive outages that open a search function's circuit breaker.",
+    )
+    SEARCH_BREAKER_RESET_SECONDS: float = Field(
+        30.0,
+        env="SEARCH_BREAKER_RESET_SECONDS",
+        description="How long an open breaker fails fast before letting a trial call through.",
+    )
+    SEARCH_STALE_TTL_SECONDS: float = Field(
+        3600.0,
+        env="SEARCH_STALE_TTL_SECONDS",
+        description="How long a last good result may be served as the degraded fallback.",
+    )
+    SEARCH_RESILIENCE_WORKERS: int = Field(
+        16,
+        env="SEARCH_RESILIENCE_WORKERS",
+        description="Threads running guarded search calls (and their hedges).",
+    )
+    ANSWER_CACHE_ENABLED: bool = Field(
+        True,
+        env="ANSWER_CACHE_ENABLED",
+        description="Serve repeated questions about an unchanged case from the answer cache.",
+    )
+    ANSWER_CACHE_TTL_SECONDS: float = Field(
+        3600.0,
+        env="ANSWER_CACHE_TTL_SECONDS",
+        description="Lifetime of a cached answer.",
+    )
+    ANSWER_CACHE_MAX_ENTRIES: int = Field(
+        1024,
+        env="ANSWER_CACHE_MAX_ENTRIES",
+        description="Answers kept in memory (LRU) and on disk.",
+    )
+    ANSWER_CACHE_PATH: str = Field(
+        "",
+        env="ANSWER_CACHE_PATH",
+        description="SQLite file persisting cached answers across restarts (empty = memory only); without blob storage for the shared index generations entries only live as long as the process.",
+    )
+    SEMANTIC_CACHE_ENABLED: bool = Field(
+        False,
+        env="SEMANTIC_CACHE_ENABLED",
+        description="Answer paraphrases of recently answered questions from the answer cache (off until its matches have been evaluated).",
+    )
+    SEMANTIC_CACHE_THRESHOLD: float = Field(
+        0.92,
+        env="SEMANTIC_CACHE_THRESHOLD",
+        description="Cosine similarity at or above which a question reuses a stored answer.",
+    )
+    SEMANTIC_CACHE_MAX_PER_SCOPE: int = Field(
+        64,
+        env="SEMANTIC_CACHE_MAX_PER_SCOPE",
+        description="Answered questions remembered per case version for semantic lookup.",
+    )
+    SINGLE_FLIGHT_ENABLED: bool = Field(
+        True,
+        env="SINGLE_FLIGHT_ENABLED",
+        description="Coalesce identical in-flight reasoning requests into one graph run.",
+    )
+    LLM_CACHE_ENABLED: bool = Field(
+        True,
+        env="LLM_CACHE_ENABLED",
+        description="Serve repeated temperature-0 LLM calls from the persistent call cache.",
+    )
+    LLM_CACHE_PATH: str = Field(
+        ".cache/llm_calls.sqlite",
+        env="LLM_CACHE_PATH",
+        description="SQLite file of the LLM call cache (empty keeps it in memory).",
+    )
+    LLM_CACHE_MAX_ENTRIES: int = Field(
+        20000,
+        env="LLM_CACHE_MAX_ENTRIES",
+        description="Rows kept in the LLM call cache before LRU eviction.",
+    )
+    LLM_CACHE_MAX_MB: float = Field(
+        64,
+        env="LLM_CACHE_MAX_MB",
+        description="Stored-result size of the LLM call cache before LRU eviction, in MB.",
+    )
+    INDEX_GENERATIONS_TTL_SECONDS: float = Field(
+        5.0,
+        env="INDEX_GENERATIONS_TTL_SECONDS",
+        description="How long the shared retrieval generation counters are cached before re-reading their blob; bounds how soon other processes' index writes invalidate cached answers.",
+    )
+
     class Config(BaseSettings.Config):
         env_file = ".env"
 
@@ -192,6 +523,72 @@ settings = Settings(
     ),
     LLM_INTENT_DEPLOYMENT=os.getenv("LLM_INTENT_DEPLOYMENT", "intent-model"),
     LLM_REASONING_DEPLOYMENT=os.getenv("LLM_REASONING_DEPLOYMENT", "operational-premium"),
+    TOKENIZER_ENCODING=os.getenv("TOKENIZER_ENCODING", "cl100k_base"),
+    KNOWLEDGE_SECTION_MAX_TOKENS=int(os.getenv("KNOWLEDGE_SECTION_MAX_TOKENS", "750")),
+    KNOWLEDGE_FALLBACK_SECTION_TOKENS=int(os.getenv("KNOWLEDGE_FALLBACK_SECTION_TOKENS", "500")),
+    KNOWLEDGE_FALLBACK_OVERLAP_TOKENS=int(os.getenv("KNOWLEDGE_FALLBACK_OVERLAP_TOKENS", "50")),
+    KNOWLEDGE_SMALL_CHUNK_TOKENS=int(os.getenv("KNOWLEDGE_SMALL_CHUNK_TOKENS", "128")),
+    KNOWLEDGE_SMALL_CHUNK_OVERLAP_TOKENS=int(os.getenv("KNOWLEDGE_SMALL_CHUNK_OVERLAP_TOKENS", "25")),
+    EVIDENCE_CHUNK_TOKENS=int(os.getenv("EVIDENCE_CHUNK_TOKENS", "1000")),
+    EVIDENCE_CHUNK_OVERLAP_TOKENS=int(os.getenv("EVIDENCE_CHUNK_OVERLAP_TOKENS", "100")),
+    BULK_IMPORT_CONCURRENCY=int(os.getenv("BULK_IMPORT_CONCURRENCY", "8")),
+    INDEX_POINTER_TTL_SECONDS=float(os.getenv("INDEX_POINTER_TTL_SECONDS", "30")),
+    CASE_HNSW_M=int(os.getenv("CASE_HNSW_M", "4")),
+    CASE_HNSW_EF_CONSTRUCTION=int(os.getenv("CASE_HNSW_EF_CONSTRUCTION", "400")),
+    CASE_HNSW_EF_SEARCH=int(os.getenv("CASE_HNSW_EF_SEARCH", "500")),
+    CASE_VECTOR_METRIC=os.getenv("CASE_VECTOR_METRIC", "cosine"),
+    CASE_VECTOR_QUANTIZATION=os.getenv("CASE_VECTOR_QUANTIZATION", "none"),
+    KNOWLEDGE_HNSW_M=int(os.getenv("KNOWLEDGE_HNSW_M", "4")),
+    KNOWLEDGE_HNSW_EF_CONSTRUCTION=int(os.getenv("KNOWLEDGE_HNSW_EF_CONSTRUCTION", "400")),
+    KNOWLEDGE_HNSW_EF_SEARCH=int(os.getenv("KNOWLEDGE_HNSW_EF_SEARCH", "500")),
+    KNOWLEDGE_VECTOR_METRIC=os.getenv("KNOWLEDGE_VECTOR_METRIC", "cosine"),
+    KNOWLEDGE_VECTOR_QUANTIZATION=os.getenv("KNOWLEDGE_VECTOR_QUANTIZATION", "none"),
+    LOCAL_CASE_INDEX_ENABLED=os.getenv("LOCAL_CASE_INDEX_ENABLED", "true").lower() == "true",
+    LOCAL_CASE_INDEX_DIR=os.getenv("LOCAL_CASE_INDEX_DIR", ".cache/local_case_index"),
+    LOCAL_CASE_INDEX_SYNC_SECONDS=float(os.getenv("LOCAL_CASE_INDEX_SYNC_SECONDS", "300")),
+    LOCAL_CASE_INDEX_ANN_THRESHOLD=int(os.getenv("LOCAL_CASE_INDEX_ANN_THRESHOLD", "20000")),
+    CASE_NEIGHBOURS_TOP_N=int(os.getenv("CASE_NEIGHBOURS_TOP_N", "10")),
+    RETRIEVAL_CACHE_ENABLED=os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() == "true",
+    RETRIEVAL_CACHE_TTL_SECONDS=float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "300")),
+    RETRIEVAL_CACHE_MAX_ENTRIES=int(os.getenv("RETRIEVAL_CACHE_MAX_ENTRIES", "512")),
+    KNOWLEDGE_PASSAGE_CHARS=int(os.getenv("KNOWLEDGE_PASSAGE_CHARS", "600")),
+    PROMPT_CASES_TOKEN_BUDGET=int(os.getenv("PROMPT_CASES_TOKEN_BUDGET", "2500")),
+    PROMPT_CASES_MMR_LAMBDA=float(os.getenv("PROMPT_CASES_MMR_LAMBDA", "0.7")),
+    PROMPT_CASES_VECTOR_WEIGHT=float(os.getenv("PROMPT_CASES_VECTOR_WEIGHT", "0.5")),
+    HTTP_POOL_MAXSIZE=int(os.getenv("HTTP_POOL_MAXSIZE", "32")),
+    HTTP_CONNECT_TIMEOUT_SECONDS=float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5")),
+    HTTP_READ_TIMEOUT_SECONDS=float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "120")),
+    HTTP_KEEPALIVE_SECONDS=float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60")),
+    LLM_TPM_LIMIT=int(os.getenv("LLM_TPM_LIMIT", "120000")),
+    LLM_RPM_LIMIT=int(os.getenv("LLM_RPM_LIMIT", "0")),
+    LLM_DEPLOYMENT_QUOTAS=os.getenv("LLM_DEPLOYMENT_QUOTAS", ""),
+    LLM_QUEUE_TIMEOUT_SECONDS=float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "120")),
+    LLM_MAX_RETRIES=int(os.getenv("LLM_MAX_RETRIES", "3")),
+    LLM_COMPLETION_TOKENS_ESTIMATE=int(os.getenv("LLM_COMPLETION_TOKENS_ESTIMATE", "800")),
+    LLM_BACKENDS=os.getenv("LLM_BACKENDS", ""),
+    LLM_BACKEND_EJECT_SECONDS=float(os.getenv("LLM_BACKEND_EJECT_SECONDS", "30")),
+    LLM_BACKEND_EWMA_ALPHA=float(os.getenv("LLM_BACKEND_EWMA_ALPHA", "0.3")),
+    SEARCH_RESILIENCE_ENABLED=os.getenv("SEARCH_RESILIENCE_ENABLED", "true").lower() == "true",
+    SEARCH_DEADLINE_SECONDS=float(os.getenv("SEARCH_DEADLINE_SECONDS", "5")),
+    SEARCH_HEDGING_ENABLED=os.getenv("SEARCH_HEDGING_ENABLED", "true").lower() == "true",
+    SEARCH_HEDGE_MIN_SECONDS=float(os.getenv("SEARCH_HEDGE_MIN_SECONDS", "0.1")),
+    SEARCH_BREAKER_FAILURES=int(os.getenv("SEARCH_BREAKER_FAILURES", "5")),
+    SEARCH_BREAKER_RESET_SECONDS=float(os.getenv("SEARCH_BREAKER_RESET_SECONDS", "30")),
+    SEARCH_STALE_TTL_SECONDS=float(os.getenv("SEARCH_STALE_TTL_SECONDS", "3600")),
+    SEARCH_RESILIENCE_WORKERS=int(os.getenv("SEARCH_RESILIENCE_WORKERS", "16")),
+    ANSWER_CACHE_ENABLED=os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true",
+    ANSWER_CACHE_TTL_SECONDS=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600")),
+    ANSWER_CACHE_MAX_ENTRIES=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1024")),
+    ANSWER_CACHE_PATH=os.getenv("ANSWER_CACHE_PATH", ""),
+    SEMANTIC_CACHE_ENABLED=os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true",
+    SEMANTIC_CACHE_THRESHOLD=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+    SEMANTIC_CACHE_MAX_PER_SCOPE=int(os.getenv("SEMANTIC_CACHE_MAX_PER_SCOPE", "64")),
+    SINGLE_FLIGHT_ENABLED=os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true",
+    LLM_CACHE_ENABLED=os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+    LLM_CACHE_PATH=os.getenv("LLM_CACHE_PATH", ".cache/llm_calls.sqlite"),
+    LLM_CACHE_MAX_ENTRIES=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000")),
+    LLM_CACHE_MAX_MB=float(os.getenv("LLM_CACHE_MAX_MB", "64")),
+    INDEX_GENERATIONS_TTL_SECONDS=float(os.getenv("INDEX_GENERATIONS_TTL_SECONDS", "5")),
 )
 
 __all__ = ["Settings", "settings"]
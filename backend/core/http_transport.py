@@ -0,0 +1,288 @@
+"""Process-wide HTTP connection pools, one per remote host.
+
+Azure SDK clients (Search, Blob) get a ``RequestsTransport`` bound to a shared
+``requests.Session`` per host; OpenAI / LangChain clients get a shared
+``httpx.Client`` per host. Every client talking to the same host therefore
+reuses the same keep-alive connections and TLS sessions instead of opening
+its own pool.
+
+The Azure SDK's synchronous transports speak HTTP/1.1 only. The httpx
+clients negotiate HTTP/2 when the optional ``h2`` package is installed.
+
+``pool_stats()`` reports, per host, requests sent, connections opened, the
+reuse ratio and how close the pool is to saturation.
+
+Inside ``request_deadline(at)`` every Azure SDK request has its connect and
+read timeouts capped to the time left, so a caller's deadline also frees the
+thread making the request instead of leaving it blocked on the socket.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+from urllib.parse import urlparse
+
+from backend.core.config import settings
+
+logger = logging.getLogger("http_transport")
+
+_lock = threading.Lock()
+_sessions: dict[str, Any] = {}
+_httpx_clients: dict[str, Any] = {}
+
+# Absolute time.monotonic() deadline of the current request, if any.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+# Floor for capped timeouts, so an expired deadline fails fast rather than
+# handing requests a zero or negative timeout.
+_MIN_TIMEOUT_SECONDS = 0.01
+
+
+@contextmanager
+def request_deadline(at: float) -> Iterator[None]:
+    """Cap Azure SDK request timeouts to ``at`` (a ``time.monotonic()`` value)."""
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def host_of(url_or_host: str) -> str:
+    """Lower-cased ``host[:port]`` of a URL (or the value itself if bare)."""
+    parsed = urlparse(url_or_host if "//" in url_or_host else f"//{url_or_host}")
+    return (parsed.netloc or url_or_host).lower()
+
+
+def blob_host(connection_string: str) -> str:
+    """Blob endpoint host of an Azure Storage connection string."""
+    parts = dict(
+        p.split("=", 1) for p in connection_string.split(";") if "=" in p
+    )
+    if parts.get("BlobEndpoint"):
+        return host_of(parts["BlobEndpoint"])
+    suffix = parts.get("EndpointSuffix", "core.windows.net")
+    return f"{parts.get('AccountName', '').lower()}.blob.{suffix}"
+
+
+# ---------------------------------------------------------------------------
+# Azure SDK (requests)
+# ---------------------------------------------------------------------------
+
+def _new_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # Retries are the SDK pipeline's job; the adapter must not retry as well.
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
+def _deadline_transport_class():
+    from azure.core.pipeline.transport import RequestsTransport
+
+    class _DeadlineTransport(RequestsTransport):
+        def send(self, request, **kwargs):
+            deadline = _deadline.get()
+            connect = kwargs.get("connection_timeout", self.connection_config.timeout)
+            if deadline is not None and not isinstance(connect, tuple):
+                remaining = max(deadline - time.monotonic(), _MIN_TIMEOUT_SECONDS)
+                read = kwargs.get("read_timeout", self.connection_config.read_timeout)
+                kwargs["connection_timeout"] = min(connect, remaining)
+                kwargs["read_timeout"] = min(read, remaining)
+            return super().send(request, **kwargs)
+
+    return _DeadlineTransport
+
+
+def get_azure_transport(url_or_host: str):
+    """A ``RequestsTransport`` on the shared session for ``url_or_host``.
+
+    Each client gets its own transport object (clients close their transport
+    on exit); the session is shared and never closed by them.
+    """
+    host = host_of(url_or_host)
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = _new_session()
+            logger.info("[HTTP] new Azure SDK pool for %s", host)
+    return _deadline_transport_class()(
+        session=session,
+        session_owner=False,
+        connection_timeout=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=settings.HTTP_READ_TIMEOUT_SECONDS,
+    )
+
+
+def _session_stats(session) -> dict:
+    requests_sent = connections = in_use = capacity = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections += pool.num_connections
+            capacity += pool.pool.maxsize if pool.pool is not None else 0
+            in_use += (pool.pool.maxsize - pool.pool.qsize()) if pool.pool is not None else 0
+    return {
+        "kind": "azure-sdk",
+        "http2": False,
+        "requests": requests_sent,
+        "connections_opened": connections,
+        "reuse_ratio": _reuse_ratio(requests_sent, connections),
+        "in_use": in_use,
+        "capacity": capacity,
+        "saturation": round(in_use / capacity, 3) if capacity else 0.0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# OpenAI / LangChain (httpx)
+# ---------------------------------------------------------------------------
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _PoolMetrics:
+    def __init__(self, http2: bool) -> None:
+        self.http2 = http2
+        self.requests = 0
+        self.connections_opened = 0
+        self.seen: set[int] = set()
+
+
+def _metered_transport_class():
+    import httpx
+
+    class _MeteredTransport(httpx.HTTPTransport):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.metrics = _PoolMetrics(bool(kwargs.get("http2")))
+
+        def handle_request(self, request):
+            response = super().handle_request(request)
+            m = self.metrics
+            m.requests += 1
+            current = {id(c) for c in self._pool.connections}
+            m.connections_opened += len(current - m.seen)
+            m.seen = current
+            return response
+
+    return _MeteredTransport
+
+
+def get_httpx_client(url_or_host: str):
+    """Shared keep-alive ``httpx.Client`` for ``url_or_host`` (HTTP/2 if available)."""
+    import httpx
+
+    host = host_of(url_or_host)
+    with _lock:
+        client = _httpx_clients.get(host)
+        if client is None:
+            http2 = _h2_available()
+            limits = httpx.Limits(
+                max_connections=settings.HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=settings.HTTP_POOL_MAXSIZE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_SECONDS,
+            )
+            client = httpx.Client(
+                transport=_metered_transport_class()(http2=http2, limits=limits),
+                timeout=httpx.Timeout(
+                    settings.HTTP_READ_TIMEOUT_SECONDS,
+                    connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+                ),
+            )
+            _httpx_clients[host] = client
+            logger.info("[HTTP] new httpx pool for %s (http2=%s)", host, http2)
+    return client
+
+
+def _httpx_stats(client) -> dict:
+    transport = client._transport
+    metrics: _PoolMetrics = transport.metrics
+    connections = list(transport._pool.connections)
+    in_use = sum(1 for c in connections if not c.is_idle())
+    capacity = settings.HTTP_POOL_MAXSIZE
+    return {
+        "kind": "httpx",
+        "http2": metrics.http2,
+        "requests": metrics.requests,
+        "connections_opened": metrics.connections_opened,
+        "reuse_ratio": _reuse_ratio(metrics.requests, metrics.connections_opened),
+        "open_connections": len(connections),
+        "in_use": in_use,
+        "capacity": capacity,
+        "saturation": round(in_use / capacity, 3) if capacity else 0.0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+def _reuse_ratio(requests_sent: int, connections: int) -> float:
+    if not requests_sent:
+        return 0.0
+    return round(max(0.0, 1 - connections / requests_sent), 3)
+
+
+def pool_stats() -> dict[str, dict]:
+    """Per-host connection reuse and saturation for every shared pool."""
+    with _lock:
+        sessions = dict(_sessions)
+        clients = dict(_httpx_clients)
+    stats: dict[str, dict] = {}
+    for host, session in sessions.items():
+        stats[f"{host} (azure-sdk)"] = _session_stats(session)
+    for host, client in clients.items():
+        try:
+            stats[f"{host} (httpx)"] = _httpx_stats(client)
+        except AttributeError as exc:  # httpx/httpcore internals moved
+            stats[f"{host} (httpx)"] = {"kind": "httpx", "error": str(exc)}
+    return stats
+
+
+def close_all() -> None:
+    """Close every shared pool (application shutdown)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        for client in _httpx_clients.values():
+            client.close()
+        _sessions.clear()
+        _httpx_clients.clear()
+
+
+__all__ = [
+    "host_of",
+    "blob_host",
+    "get_azure_transport",
+    "request_deadline",
+    "get_httpx_client",
+    "pool_stats",
+    "close_all",
+]
@@ -5,39 +5,253 @@ All nodes import from here — never instantiate AzureChatOpenAI inline.
 """
 from __future__ import annotations
 
+import asyncio
+import json
 import os
+import time
 from functools import lru_cache
+from typing import Any, Optional, Sequence
 
 from dotenv import load_dotenv
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
 from langchain_openai import AzureChatOpenAI
 
 from backend.core.config import settings
+from backend.core.http_transport import get_httpx_client, host_of
+from backend.core.llm_cache import get_llm_cache, make_key
+from backend.core.llm_router import BackendPool, LLMBackend, parse_backends
+from backend.core.llm_scheduler import get_scheduler, is_retryable, retry_after_seconds
+from backend.utils.tokens import count_tokens
 
 load_dotenv(override=True)  # MUST use override=True — project requirement
 
-# Role → Azure deployment name mapping
-_ROLE_MAP: dict[str, str] = {
-    "intent": settings.LLM_INTENT_DEPLOYMENT,
-    "reasoning": settings.LLM_REASONING_DEPLOYMENT,
+# Role → pool of Azure endpoint/deployment pairs. An empty endpoint means
+# AZURE_OPENAI_ENDPOINT; LLM_BACKENDS overrides whole roles.
+_ROLE_MAP: dict[str, tuple[LLMBackend, ...]] = {
+    "intent": (LLMBackend("", settings.LLM_INTENT_DEPLOYMENT),),
+    "reasoning": (LLMBackend("", settings.LLM_REASONING_DEPLOYMENT),),
+    **parse_backends(settings.LLM_BACKENDS),
 }
 
 
+# Per-message framing overhead of the chat format, in tokens.
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_prompt_tokens(messages: Sequence[BaseMessage], tools: Any = None) -> int:
+    """Approximate prompt tokens of ``messages`` (plus any bound tool schemas)."""
+    total = 0
+    for message in messages:
+        content = message.content
+        if not isinstance(content, str):
+            content = json.dumps(content, default=str)
+        total += count_tokens(content) + _MESSAGE_OVERHEAD_TOKENS
+    if tools:
+        total += count_tokens(json.dumps(tools, default=str))
+    return total
+
+
+def _usage_tokens(result: ChatResult) -> Optional[int]:
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    total = usage.get("total_tokens")
+    return int(total) if total is not None else None
+
+
+class ScheduledAzureChatOpenAI(AzureChatOpenAI):
+    """AzureChatOpenAI whose calls are admitted by the quota-aware scheduler.
+
+    Hooks ``_generate`` so plain ``invoke`` and ``with_structured_output``
+    chains are both covered. The scheduler owns retries, so the client is
+    built with ``max_retries=0``. Temperature-0 calls are deterministic
+    enough to be answered from the LLM call cache (``llm_cache.py``) first.
+    """
+
+    def _reservation(self, messages: list[BaseMessage], kwargs: dict) -> int:
+        completion = (
+            kwargs.get("max_tokens")
+            or getattr(self, "max_tokens", None)
+            or settings.LLM_COMPLETION_TOKENS_ESTIMATE
+        )
+        return estimate_prompt_tokens(messages, kwargs.get("tools")) + int(completion)
+
+    @property
+    def scheduler_key(self) -> str:
+        return f"{host_of(self.azure_endpoint or '')}/{self.deployment_name or ''}"
+
+    def _scheduled_generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]],
+        run_manager: Any,
+        kwargs: dict,
+        max_retries: Optional[int] = None,
+    ) -> ChatResult:
+        return get_scheduler().run(
+            self.scheduler_key,
+            self._reservation(messages, kwargs),
+            lambda: AzureChatOpenAI._generate(
+                self, messages, stop=stop, run_manager=run_manager, **kwargs
+            ),
+            usage=_usage_tokens,
+            max_retries=max_retries,
+        )
+
+    def _dispatch(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]],
+        run_manager: Any,
+        kwargs: dict,
+    ) -> ChatResult:
+        return self._scheduled_generate(messages, stop, run_manager, kwargs)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if not (settings.LLM_CACHE_ENABLED and self.temperature == 0):
+            return self._dispatch(messages, stop, run_manager, kwargs)
+        cache = get_llm_cache()
+        key = make_key(self.deployment_name or "", messages, stop, kwargs)
+        result = cache.get(key)
+        if result is None:
+            result = self._dispatch(messages, stop, run_manager, kwargs)
+            cache.put(key, result)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Admission blocks; keep it off the event loop.
+        return await asyncio.to_thread(
+            self._generate, messages, stop, None, **kwargs
+        )
+
+
+class RoutedAzureChatOpenAI(ScheduledAzureChatOpenAI):
+    """Chat model served by a pool of backends, chosen per call.
+
+    Configured like its pool's first backend (so structured output, binding
+    and tracing behave as for a single deployment); every call is routed by
+    the ``BackendPool`` and fails over to the next backend on 429 / 5xx /
+    connection errors. Once every backend has failed, the best one is retried
+    with the scheduler's normal Retry-After handling.
+    """
+
+    _pool: Optional[BackendPool] = None
+    _members: dict = {}
+
+    def _call_backend(
+        self, backend: LLMBackend, messages, stop, run_manager, kwargs, max_retries
+    ) -> ChatResult:
+        pool = self._pool
+        start = time.monotonic()
+        try:
+            result = self._members[backend]._scheduled_generate(
+                messages, stop, run_manager, kwargs, max_retries=max_retries
+            )
+        except Exception as exc:
+            if is_retryable(exc):
+                pool.record_failure(backend, retry_after_seconds(exc))
+            raise
+        pool.record_success(backend, time.monotonic() - start)
+        return result
+
+    def _dispatch(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]],
+        run_manager: Any,
+        kwargs: dict,
+    ) -> ChatResult:
+        pool = self._pool
+        tried: list[LLMBackend] = []
+        for _ in pool.backends:
+            backend = pool.choose(exclude=tried)
+            try:
+                return self._call_backend(backend, messages, stop, run_manager, kwargs, 0)
+            except Exception as exc:
+                if not is_retryable(exc):
+                    raise
+                tried.append(backend)
+        return self._call_backend(pool.choose(), messages, stop, run_manager, kwargs, None)
+
+
+def _resolve_backend(backend: LLMBackend) -> LLMBackend:
+    if backend.endpoint:
+        return backend
+    return backend._replace(endpoint=os.environ["AZURE_OPENAI_ENDPOINT"])
+
+
 class LLMProvider:
     """Factory for cached AzureChatOpenAI instances."""
 
+    def __init__(self) -> None:
+        self._pools: dict[tuple[LLMBackend, ...], BackendPool] = {}
+
+    def _build(
+        self, cls: type, backend: LLMBackend, temperature: float
+    ) -> ScheduledAzureChatOpenAI:
+        return cls(
+            azure_endpoint=backend.endpoint,
+            azure_deployment=backend.deployment,
+            api_version=os.environ.get("AZURE_OPENAI_API_VERSION", "2024-10-21"),
+            api_key=os.environ[backend.api_key_env],
+            temperature=temperature,
+            max_retries=0,
+            http_client=get_httpx_client(backend.endpoint),
+        )
+
+    def pool_for(self, backends: tuple[LLMBackend, ...]) -> BackendPool:
+        """Shared health/latency state of ``backends`` (one per distinct pool)."""
+        pool = self._pools.get(backends)
+        if pool is None:
+            pool = self._pools.setdefault(
+                backends,
+                BackendPool(
+                    backends,
+                    headroom=get_scheduler().headroom,
+                    ewma_alpha=settings.LLM_BACKEND_EWMA_ALPHA,
+                    eject_seconds=settings.LLM_BACKEND_EJECT_SECONDS,
+                ),
+            )
+        return pool
+
     @lru_cache(maxsize=16)
+    def get_pool_llm(
+        self, backends: tuple[LLMBackend, ...], temperature: float = 0.2
+    ) -> AzureChatOpenAI:
+        """Return a cached LLM per (backend pool, temperature) pair."""
+        backends = tuple(_resolve_backend(b) for b in backends)
+        if len(backends) == 1:
+            return self._build(ScheduledAzureChatOpenAI, backends[0], temperature)
+        llm = self._build(RoutedAzureChatOpenAI, backends[0], temperature)
+        llm._pool = self.pool_for(backends)
+        llm._members = {
+            b: self._build(ScheduledAzureChatOpenAI, b, temperature) for b in backends
+        }
+        return llm
+
     def get_llm(
         self, deployment: str | None = None, temperature: float = 0.2
     ) -> AzureChatOpenAI:
         """Return a cached AzureChatOpenAI instance per (deployment, temperature) pair."""
-        return AzureChatOpenAI(
-            azure_endpoint=os.environ["AZURE_OPENAI_ENDPOINT"],
-            azure_deployment=deployment or os.environ["AZURE_OPENAI_CHAT_DEPLOYMENT"],
-            api_version=os.environ.get("AZURE_OPENAI_API_VERSION", "2024-10-21"),
-            api_key=os.environ["AZURE_OPENAI_API_KEY"],
-            temperature=temperature,
-            max_retries=3,
-        )
+        backend = LLMBackend("", deployment or os.environ["AZURE_OPENAI_CHAT_DEPLOYMENT"])
+        return self.get_pool_llm((backend,), temperature)
+
+    def backend_stats(self) -> dict[str, list[dict]]:
+        return {
+            "+".join(b.key for b in backends): pool.stats()
+            for backends, pool in list(self._pools.items())
+        }
 
 
 # ── Module-level singleton and shim (all existing callers unchanged) ──
@@ -61,5 +275,17 @@ def get_llm(
     The ``deployment`` kwarg is kept for backwards compatibility with deprecated code.
     """
     name = role or deployment
-    resolved = _ROLE_MAP.get(name, name) if name else None
-    return _provider.get_llm(deployment=resolved, temperature=temperature)
+    backends = _ROLE_MAP.get(name) if name else None
+    if backends:
+        return _provider.get_pool_llm(backends, temperature)
+    return _provider.get_llm(deployment=name, temperature=temperature)
+
+
+def backend_stats() -> dict[str, list[dict]]:
+    """Latency, headroom and health of every multi-backend pool in use."""
+    return _provider.backend_stats()
+
+
+def llm_cache_stats() -> dict:
+    """Size and hit rate of the temperature-0 LLM call cache."""
+    return get_llm_cache().stats()
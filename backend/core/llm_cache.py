@@ -0,0 +1,233 @@
+"""Persistent cache of deterministic (temperature-0) LLM calls.
+
+The intent classifier, the readiness check and the reflection audits all
+make temperature-0 structured calls, and they are asked the same thing
+again and again: the same draft re-audited, the same question re-classified.
+``LLMCallCache`` stores those results in SQLite. The key is the deployment,
+a hash of the messages, and the call's schema (tools, response format and
+the other request kwargs). A repeated call is answered without reaching
+Azure or taking scheduler quota.
+
+Entries are evicted least-recently-used once the table exceeds
+LLM_CACHE_MAX_ENTRIES rows or LLM_CACHE_MAX_MB of stored results.
+
+The file is opened in WAL mode so several worker processes can share it. A
+database error (locked, full disk, corrupt file) never fails the LLM call: a
+file that cannot be opened leaves the cache in memory, a failed read counts
+as a miss and a failed write is logged and skipped.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from backend.core.config import settings
+
+logger = logging.getLogger("llm_cache")
+
+# How long a statement waits for another connection's write lock.
+_BUSY_TIMEOUT_SECONDS = 5.0
+
+
+def _jsonable(value: Any) -> Any:
+    """Pydantic schemas / instances as plain JSON data, recursively."""
+    if isinstance(value, type) and hasattr(value, "model_json_schema"):
+        return {"title": value.__name__, "schema": value.model_json_schema()}
+    if isinstance(value, type) and hasattr(value, "schema"):
+        return {"title": value.__name__, "schema": value.schema()}
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def make_key(
+    deployment: str,
+    messages: Sequence[BaseMessage],
+    stop: Optional[list[str]],
+    kwargs: dict,
+) -> str:
+    """Stable key of one chat call: deployment + messages + schema/kwargs."""
+    parts = {
+        "deployment": deployment,
+        "messages": [message_to_dict(m) for m in messages],
+        "stop": stop,
+        "kwargs": _jsonable(kwargs),
+    }
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def dump_result(result: ChatResult) -> str:
+    generations = []
+    for gen in result.generations:
+        message = message_to_dict(gen.message)
+        message["data"] = _jsonable(message["data"])
+        generations.append({"message": message, "generation_info": gen.generation_info})
+    return json.dumps(
+        {"generations": generations, "llm_output": result.llm_output}, default=str
+    )
+
+
+def load_result(value: str) -> ChatResult:
+    data = json.loads(value)
+    generations = [
+        ChatGeneration(
+            message=messages_from_dict([g["message"]])[0],
+            generation_info=g.get("generation_info"),
+        )
+        for g in data["generations"]
+    ]
+    return ChatResult(generations=generations, llm_output=data.get("llm_output"))
+
+
+class LLMCallCache:
+    """SQLite-backed LRU of serialised ``ChatResult``s, bounded by rows and bytes."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int,
+        max_bytes: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._path = path
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, timeout=_BUSY_TIMEOUT_SECONDS
+        )
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_calls ("
+                " key TEXT PRIMARY KEY, last_access REAL NOT NULL,"
+                " size INTEGER NOT NULL, value TEXT NOT NULL)"
+            )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[ChatResult]:
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT value FROM llm_calls WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE llm_calls SET last_access = ? WHERE key = ?", (self._clock(), key)
+                )
+                self.hits += 1
+        except sqlite3.Error as exc:
+            logger.warning("[LLM_CACHE] read failed, treating as a miss: %s", exc)
+            self.misses += 1
+            return None
+        try:
+            return load_result(row[0])
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.warning("[LLM_CACHE] unreadable entry dropped: %s", exc)
+            try:
+                with self._lock, self._conn:
+                    self._conn.execute("DELETE FROM llm_calls WHERE key = ?", (key,))
+            except sqlite3.Error:
+                pass
+            return None
+
+    def put(self, key: str, result: ChatResult) -> None:
+        try:
+            value = dump_result(result)
+        except (TypeError, ValueError) as exc:
+            logger.warning("[LLM_CACHE] result not cacheable: %s", exc)
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_calls (key, last_access, size, value)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, self._clock(), len(value), value),
+                )
+                self._evict()
+        except sqlite3.Error as exc:
+            logger.warning("[LLM_CACHE] write failed: %s", exc)
+
+    def _evict(self) -> None:
+        # Least recently used first, until both the row and the byte bounds hold.
+        evicted = self._conn.execute(
+            "DELETE FROM llm_calls WHERE key IN (SELECT key FROM ("
+            " SELECT key,"
+            "  ROW_NUMBER() OVER (ORDER BY last_access DESC, key) AS rank,"
+            "  SUM(size) OVER (ORDER BY last_access DESC, key) AS running"
+            " FROM llm_calls) WHERE rank > ? OR running > ?)",
+            (self._max_entries, self._max_bytes),
+        ).rowcount
+        self.evictions += max(evicted, 0)
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_calls")
+
+    def stats(self) -> dict:
+        with self._lock:
+            try:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_calls"
+                ).fetchone()
+                error = None
+            except sqlite3.Error as exc:
+                entries, size, error = None, None, str(exc)
+            total = self.hits + self.misses
+            return {
+                "enabled": settings.LLM_CACHE_ENABLED,
+                "path": self._path,
+                "error": error,
+                "entries": entries,
+                "bytes": size,
+                "max_entries": self._max_entries,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+_cache: Optional[LLMCallCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCallCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            path = settings.LLM_CACHE_PATH or ":memory:"
+            max_entries = settings.LLM_CACHE_MAX_ENTRIES
+            max_bytes = int(settings.LLM_CACHE_MAX_MB * 1024 * 1024)
+            try:
+                _cache = LLMCallCache(path, max_entries, max_bytes)
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("[LLM_CACHE] %s unusable, caching in memory only: %s", path, exc)
+                _cache = LLMCallCache(":memory:", max_entries, max_bytes)
+        return _cache
+
+
+__all__ = ["make_key", "dump_result", "load_result", "LLMCallCache", "get_llm_cache"]
@@ -0,0 +1,163 @@
+"""Latency- and quota-aware routing across a pool of Azure OpenAI backends.
+
+A role ("intent", "reasoning") may be served by several endpoint/deployment
+pairs, typically the same model deployed in different regions. For every call
+``BackendPool.choose`` picks the healthy backend with the best ratio of
+observed latency (EWMA) to remaining quota headroom. A backend that answers
+429 or 5xx (or drops the connection) is ejected for a while and the call fails
+over to the next one.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, NamedTuple, Optional, Sequence
+
+from backend.core.http_transport import host_of
+
+logger = logging.getLogger("llm_router")
+
+# Floor on headroom so an almost-drained backend is deprioritised, not divided by 0.
+_MIN_HEADROOM = 0.05
+
+
+class LLMBackend(NamedTuple):
+    """One Azure OpenAI endpoint + deployment that can serve a role."""
+
+    endpoint: str
+    deployment: str
+    api_key_env: str = "AZURE_OPENAI_API_KEY"
+
+    @property
+    def key(self) -> str:
+        """Scheduler / metrics key: ``host/deployment``."""
+        return f"{host_of(self.endpoint)}/{self.deployment}"
+
+
+class _BackendState:
+    __slots__ = (
+        "ewma_latency", "ejected_until", "consecutive_failures",
+        "successes", "failures", "ejections",
+    )
+
+    def __init__(self) -> None:
+        self.ewma_latency: Optional[float] = None
+        self.ejected_until = 0.0
+        self.consecutive_failures = 0
+        self.successes = 0
+        self.failures = 0
+        self.ejections = 0
+
+
+class BackendPool:
+    """Health and latency bookkeeping for the backends of one role.
+
+    ``headroom(key)`` reports the fraction of quota a backend has left (the
+    LLM scheduler's token bucket level); unknown backends count as full.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[LLMBackend],
+        headroom: Callable[[str], float] = lambda _key: 1.0,
+        ewma_alpha: float = 0.3,
+        eject_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not backends:
+            raise ValueError("a backend pool needs at least one backend")
+        self.backends = tuple(backends)
+        self._headroom = headroom
+        self._alpha = ewma_alpha
+        self._eject_seconds = eject_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = {b: _BackendState() for b in self.backends}
+
+    def _cost(self, backend: LLMBackend) -> float:
+        # Untried backends cost 0 so each one gets measured early.
+        latency = self._state[backend].ewma_latency or 0.0
+        return latency / max(_MIN_HEADROOM, self._headroom(backend.key))
+
+    def choose(self, exclude: Sequence[LLMBackend] = ()) -> LLMBackend:
+        """Best healthy backend not in ``exclude``.
+
+        When every candidate is ejected, the one whose ejection ends first is
+        returned; when all are excluded, the choice is made among all backends.
+        """
+        now = self._clock()
+        with self._lock:
+            candidates = [b for b in self.backends if b not in exclude] or list(self.backends)
+            healthy = [b for b in candidates if self._state[b].ejected_until <= now]
+            if not healthy:
+                return min(candidates, key=lambda b: self._state[b].ejected_until)
+        return min(healthy, key=self._cost)
+
+    def record_success(self, backend: LLMBackend, latency: float) -> None:
+        with self._lock:
+            state = self._state[backend]
+            state.successes += 1
+            state.consecutive_failures = 0
+            state.ewma_latency = (
+                latency
+                if state.ewma_latency is None
+                else self._alpha * latency + (1 - self._alpha) * state.ewma_latency
+            )
+
+    def record_failure(self, backend: LLMBackend, retry_after: Optional[float] = None) -> None:
+        """Eject ``backend`` for ``retry_after`` (or the default eject period)."""
+        with self._lock:
+            state = self._state[backend]
+            state.failures += 1
+            state.consecutive_failures += 1
+            state.ejections += 1
+            # Repeat offenders stay out longer, capped at 8x the base period.
+            period = retry_after if retry_after is not None else (
+                self._eject_seconds * min(8, 2 ** (state.consecutive_failures - 1))
+            )
+            state.ejected_until = max(state.ejected_until, self._clock() + period)
+        logger.warning("[LLM] backend %s ejected for %.1fs", backend.key, period)
+
+    def stats(self) -> list[dict]:
+        now = self._clock()
+        with self._lock:
+            return [
+                {
+                    "backend": b.key,
+                    "ewma_latency_ms": (
+                        round(1000 * s.ewma_latency, 1) if s.ewma_latency is not None else None
+                    ),
+                    "headroom": round(self._headroom(b.key), 3),
+                    "healthy": s.ejected_until <= now,
+                    "ejected_for_seconds": round(max(0.0, s.ejected_until - now), 1),
+                    "successes": s.successes,
+                    "failures": s.failures,
+                    "ejections": s.ejections,
+                }
+                for b, s in self._state.items()
+            ]
+
+
+def parse_backends(spec: str) -> dict[str, tuple[LLMBackend, ...]]:
+    """Parse ``"role=endpoint|deployment[|api_key_env];...,role2=..."``.
+
+    Backends of one role are separated by ``;``; roles by ``,``.
+    """
+    pools: dict[str, tuple[LLMBackend, ...]] = {}
+    for item in (spec or "").split(","):
+        role, sep, value = item.partition("=")
+        if not sep or not role.strip():
+            continue
+        backends = []
+        for entry in value.split(";"):
+            parts = [p.strip() for p in entry.split("|")]
+            if len(parts) < 2 or not parts[0] or not parts[1]:
+                continue
+            backends.append(LLMBackend(*parts[:3]))
+        if backends:
+            pools[role.strip()] = tuple(backends)
+    return pools
+
+
+__all__ = ["LLMBackend", "BackendPool", "parse_backends"]
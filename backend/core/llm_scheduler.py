@@ -0,0 +1,427 @@
+"""Quota-aware admission control for Azure OpenAI calls.
+
+Every chat completion passes through ``LLMScheduler.run``: the prompt size is
+estimated, then the call waits for its deployment's token and request buckets
+(sized from the configured TPM / RPM quotas) before it is sent. Waiters queue
+per deployment in priority order — interactive requests ahead of background
+work, FIFO within a priority. A 429 pauses the whole deployment for the
+``Retry-After`` the service returned, so queued calls wait it out instead of
+adding to a retry storm; transient 5xx / connection errors are retried with
+backoff.
+
+``stats()`` reports queue depth, wait times, bucket levels and throttle counts
+per deployment.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger("llm_scheduler")
+
+_T = TypeVar("_T")
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "llm_priority", default=PRIORITY_INTERACTIVE
+)
+
+# Azure evaluates quotas over short windows, not the full minute: buckets hold
+# this many seconds' worth of quota so a burst cannot spend a minute at once.
+_BURST_SECONDS = 10.0
+_RETRYABLE_STATUS = frozenset({408, 409, 429})
+_RETRYABLE_ERRORS = frozenset({"APIConnectionError", "APITimeoutError"})
+_WAIT_SAMPLES = 512
+
+
+class LLMQueueTimeout(RuntimeError):
+    """Raised when a call waited longer than its queue timeout for quota."""
+
+
+@contextlib.contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    """Run LLM calls made inside the block at ``priority`` (lower goes first)."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+class TokenBucket:
+    """Continuously refilled bucket; ``level`` may go negative after a debit."""
+
+    def __init__(
+        self,
+        capacity: float,
+        per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = float(capacity)
+        self.per_second = float(per_second)
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.per_second)
+        self._updated = now
+
+    @property
+    def level(self) -> float:
+        self._refill()
+        return self._level
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` can be taken (0.0 if it can be taken now)."""
+        amount = min(amount, self.capacity)
+        self._refill()
+        if self._level >= amount:
+            return 0.0
+        if self.per_second <= 0:
+            return float("inf")
+        return (amount - self._level) / self.per_second
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self._level -= min(amount, self.capacity)
+
+    def give(self, amount: float) -> None:
+        self._refill()
+        self._level = min(self.capacity, self._level + amount)
+
+
+def parse_quotas(spec: str) -> dict[str, tuple[int, int]]:
+    """Parse ``"deployment=tpm/rpm,..."`` (``/rpm`` optional, 0 = derive)."""
+    quotas: dict[str, tuple[int, int]] = {}
+    for item in (spec or "").split(","):
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        tpm, _, rpm = value.partition("/")
+        quotas[name.strip()] = (int(tpm or 0), int(rpm or 0))
+    return quotas
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """``Retry-After`` (or ``retry-after-ms``) of an HTTP error, if it sent one."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Throttling, server errors and dropped connections (as the OpenAI SDK does)."""
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status in _RETRYABLE_STATUS or status >= 500
+    return type(exc).__name__ in _RETRYABLE_ERRORS
+
+
+class _Ticket:
+    __slots__ = ("deployment", "tokens", "priority", "enqueued", "admitted")
+
+    def __init__(self, deployment: str, tokens: int, priority: int, enqueued: float) -> None:
+        self.deployment = deployment
+        self.tokens = tokens
+        self.priority = priority
+        self.enqueued = enqueued
+        self.admitted = enqueued
+
+
+class _Deployment:
+    def __init__(self, tpm: int, rpm: int, clock: Callable[[], float]) -> None:
+        self.tpm = tpm
+        self.rpm = rpm
+        self.tokens = TokenBucket(tpm * _BURST_SECONDS / 60.0, tpm / 60.0, clock)
+        self.requests = TokenBucket(
+            max(1.0, rpm * _BURST_SECONDS / 60.0), rpm / 60.0, clock
+        )
+        self.paused_until = 0.0
+        self.cond = threading.Condition()
+        self.queue: list[tuple[int, int, _Ticket]] = []
+        self.in_flight = 0
+        self.admitted = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self.waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+
+    def delay_for(self, tokens: int, now: float) -> float:
+        return max(
+            self.paused_until - now,
+            self.tokens.delay_for(tokens),
+            self.requests.delay_for(1),
+        )
+
+
+class LLMScheduler:
+    """Per-deployment token buckets with a priority queue in front of each.
+
+    ``quotas`` maps deployment name to ``(tpm, rpm)``; deployments not listed
+    use ``default_tpm`` / ``default_rpm``. An ``rpm`` of 0 is derived from the
+    TPM as Azure does (6 RPM per 1000 TPM).
+    """
+
+    def __init__(
+        self,
+        default_tpm: int,
+        default_rpm: int = 0,
+        quotas: Optional[dict[str, tuple[int, int]]] = None,
+        queue_timeout: float = 120.0,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._default = (default_tpm, default_rpm)
+        self._quotas = dict(quotas or {})
+        self._queue_timeout = queue_timeout
+        self._max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._deployments: dict[str, _Deployment] = {}
+        self._seq = itertools.count()
+
+    def _deployment(self, name: str) -> _Deployment:
+        with self._lock:
+            dep = self._deployments.get(name)
+            if dep is None:
+                # Keys may be "host/deployment"; quotas are configured per deployment.
+                tpm, rpm = self._quotas.get(
+                    name, self._quotas.get(name.rsplit("/", 1)[-1], self._default)
+                )
+                dep = _Deployment(tpm, rpm or max(1, tpm * 6 // 1000), self._clock)
+                self._deployments[name] = dep
+            return dep
+
+    # -- admission ------------------------------------------------------------
+
+    def acquire(self, deployment: str, tokens: int, priority: Optional[int] = None) -> _Ticket:
+        """Block until ``deployment`` has quota for ``tokens``; returns a ticket.
+
+        Pass the ticket to ``release`` once the call has finished.
+        """
+        dep = self._deployment(deployment)
+        priority = current_priority() if priority is None else priority
+        ticket = _Ticket(deployment, tokens, priority, self._clock())
+        entry = (priority, next(self._seq), ticket)
+        deadline = ticket.enqueued + self._queue_timeout
+        with dep.cond:
+            heapq.heappush(dep.queue, entry)
+            try:
+                while True:
+                    now = self._clock()
+                    delay = float("inf")  # not at the head: wait to be notified
+                    if dep.queue[0] is entry:
+                        delay = dep.delay_for(tokens, now)
+                        if delay <= 0:
+                            break
+                    if now >= deadline:
+                        dep.timeouts += 1
+                        raise LLMQueueTimeout(
+                            f"waited {now - ticket.enqueued:.1f}s for quota on {deployment!r}"
+                        )
+                    dep.cond.wait(timeout=min(delay, deadline - now))
+                heapq.heappop(dep.queue)
+                dep.tokens.take(tokens)
+                dep.requests.take(1)
+                dep.in_flight += 1
+                dep.admitted += 1
+                ticket.admitted = self._clock()
+                dep.waits.append(ticket.admitted - ticket.enqueued)
+            except BaseException:
+                if entry in dep.queue:
+                    dep.queue.remove(entry)
+                    heapq.heapify(dep.queue)
+                raise
+            finally:
+                # The head changed (or may have): let the next waiter re-check.
+                dep.cond.notify_all()
+        return ticket
+
+    def release(self, ticket: _Ticket, actual_tokens: Optional[int] = None) -> None:
+        """Finish a call; corrects the token bucket to ``actual_tokens`` if known."""
+        dep = self._deployment(ticket.deployment)
+        with dep.cond:
+            dep.in_flight -= 1
+            if actual_tokens is not None:
+                diff = ticket.tokens - actual_tokens
+                if diff > 0:
+                    dep.tokens.give(diff)
+                elif diff < 0:
+                    dep.tokens.take(-diff)
+            dep.cond.notify_all()
+
+    def throttle(self, deployment: str, retry_after: float) -> None:
+        """Pause admissions to ``deployment`` for ``retry_after`` seconds (a 429)."""
+        dep = self._deployment(deployment)
+        with dep.cond:
+            dep.throttled += 1
+            dep.paused_until = max(dep.paused_until, self._clock() + retry_after)
+            dep.cond.notify_all()
+        logger.warning("[LLM] %s throttled, pausing %.1fs", deployment, retry_after)
+
+    # -- execution ------------------------------------------------------------
+
+    def _retry_delay(self, exc: BaseException, attempt: int) -> float:
+        delay = retry_after_seconds(exc)
+        if delay is None:
+            delay = min(8.0, 0.5 * 2 ** attempt) * (0.75 + random.random() / 2)
+        return delay
+
+    def run(
+        self,
+        deployment: str,
+        tokens: int,
+        call: Callable[[], _T],
+        usage: Callable[[_T], Optional[int]] = lambda _result: None,
+        max_retries: Optional[int] = None,
+    ) -> _T:
+        """Admit, run ``call()`` and retry throttled / transient failures.
+
+        A 429 pauses the deployment for its ``Retry-After`` and the call
+        re-queues behind it; other retryable errors back off exponentially.
+        ``usage(result)`` returns the tokens actually consumed, if known.
+        """
+        max_retries = self._max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            ticket = self.acquire(deployment, tokens)
+            try:
+                result = call()
+            except Exception as exc:
+                self.release(ticket)
+                if not is_retryable(exc):
+                    raise
+                delay = self._retry_delay(exc, attempt)
+                throttled = getattr(exc, "status_code", None) == 429
+                if throttled:
+                    self.throttle(deployment, delay)
+                if attempt >= max_retries:
+                    raise
+                attempt += 1
+                if not throttled:
+                    logger.warning(
+                        "[LLM] %s failed (%s), retry %d in %.1fs",
+                        deployment, type(exc).__name__, attempt, delay,
+                    )
+                    self._sleep(delay)
+                continue
+            self.release(ticket, usage(result))
+            return result
+
+    # -- metrics --------------------------------------------------------------
+
+    def headroom(self, deployment: str) -> float:
+        """Fraction of ``deployment``'s token bucket available now (0 while paused)."""
+        with self._lock:
+            dep = self._deployments.get(deployment)
+        if dep is None:
+            return 1.0
+        with dep.cond:
+            if dep.paused_until > self._clock():
+                return 0.0
+            return max(0.0, dep.tokens.level / dep.tokens.capacity) if dep.tokens.capacity else 1.0
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            deployments = dict(self._deployments)
+        out: dict[str, dict] = {}
+        for name, dep in deployments.items():
+            with dep.cond:
+                waits = sorted(dep.waits)
+                by_priority: dict[int, int] = {}
+                for priority, _, _ in dep.queue:
+                    by_priority[priority] = by_priority.get(priority, 0) + 1
+                out[name] = {
+                    "tpm": dep.tpm,
+                    "rpm": dep.rpm,
+                    "queue_depth": len(dep.queue),
+                    "queue_by_priority": by_priority,
+                    "in_flight": dep.in_flight,
+                    "admitted": dep.admitted,
+                    "throttled": dep.throttled,
+                    "queue_timeouts": dep.timeouts,
+                    "tokens_available": round(dep.tokens.level),
+                    "requests_available": round(dep.requests.level, 1),
+                    "paused_for_seconds": round(max(0.0, dep.paused_until - self._clock()), 2),
+                    "wait_ms_avg": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                    "wait_ms_p95": round(1000 * waits[int(0.95 * (len(waits) - 1))], 1) if waits else 0.0,
+                    "wait_ms_max": round(1000 * waits[-1], 1) if waits else 0.0,
+                }
+        return out
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """Process-wide scheduler configured from the LLM_* settings."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from backend.core.config import settings
+
+            _scheduler = LLMScheduler(
+                default_tpm=settings.LLM_TPM_LIMIT,
+                default_rpm=settings.LLM_RPM_LIMIT,
+                quotas=parse_quotas(settings.LLM_DEPLOYMENT_QUOTAS),
+                queue_timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+                max_retries=settings.LLM_MAX_RETRIES,
+            )
+        return _scheduler
+
+
+def scheduler_stats() -> dict[str, Any]:
+    return get_scheduler().stats()
+
+
+__all__ = [
+    "PRIORITY_INTERACTIVE",
+    "PRIORITY_BACKGROUND",
+    "LLMQueueTimeout",
+    "llm_priority",
+    "current_priority",
+    "TokenBucket",
+    "parse_quotas",
+    "retry_after_seconds",
+    "is_retryable",
+    "LLMScheduler",
+    "get_scheduler",
+    "scheduler_stats",
+]
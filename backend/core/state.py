@@ -48,5 +48,8 @@ class IncidentGraphState(TypedDict, total=False):
 
     knowledge_result: dict | None
 
+    # Set by retrieval nodes when a search served an outage fallback.
+    retrieval_degraded: bool
+
     final_response: dict | None
     _last_node: str
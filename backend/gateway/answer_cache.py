@@ -0,0 +1,341 @@
+"""Answer cache in front of the reasoning graph.
+
+The same questions — many straight from the suggestion chips — are asked
+again and again about the same case. ``invoke_graph_cached`` returns the
+stored graph result when nothing the answer depends on has changed. The key
+is built from:
+
+- the normalised question;
+- the case id and the case's ``meta.version``, which every patch bumps;
+- the request intent;
+- the shared retrieval generations of the case, evidence and knowledge
+  indexes (``retrieval_cache.shared_generations``), which every ingestion
+  write bumps from whichever process makes it.
+
+Entries live in a TTL + LRU cache. When ANSWER_CACHE_PATH is set they are
+also written to a SQLite file, so they survive a restart; the TTL still
+bounds them. The shared generations live in blob storage; without it they
+fall back to per-process counters tagged with a boot id, and persisted
+entries are never reused by a restarted or second process. A file that
+cannot be opened or read only costs cache hits.
+
+Only answered results are cached — clarifying responses, graph failures and
+answers built on degraded retrieval (``retrieval_degraded``) always re-run
+the graph.
+
+On an exact miss, paraphrases are looked up in the semantic cache
+(``semantic_cache.py``), scoped the same way. The question is embedded with
+``query_vector``, the memoised embedding the case search uses, so a question
+that goes on to run the graph is not embedded twice.
+
+Concurrent identical requests (a team opening the same case, a dashboard
+firing on load for several users) are coalesced under the same key: one
+runs the graph, the others wait for it and share its result
+(SINGLE_FLIGHT_ENABLED). This also applies when the answer cache is off.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from backend.core.config import settings
+from backend.gateway.semantic_cache import SemanticAnswerCache
+from backend.knowledge.case_search_client import entity_terms, query_vector
+from backend.knowledge.retrieval_cache import shared_generations
+from backend.reasoning.nodes.context_node import load_case_document
+from backend.utils.single_flight import SingleFlight
+from backend.utils.ttl_cache import MISSING, TTLCache
+
+logger = logging.getLogger("answer_cache")
+
+# Graph result keys needed to rebuild a response.
+_RESULT_KEYS = (
+    "final_response",
+    "route",
+    "classification",
+    "question_ready",
+    "clarifying_question",
+    "classification_low_confidence",
+)
+
+_SPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.]+$")
+
+
+def normalize_question(question: str) -> str:
+    """Case-, whitespace- and trailing-punctuation-insensitive form of ``question``."""
+    text = _SPACE_RE.sub(" ", (question or "").strip().lower())
+    return _TRAILING_PUNCT_RE.sub("", text)
+
+
+def case_version(case_doc: Optional[dict]) -> Optional[int]:
+    if not case_doc:
+        return None
+    try:
+        return int((case_doc.get("meta") or {}).get("version", 1))
+    except (TypeError, ValueError):
+        return None
+
+
+def _stored(result: dict) -> dict:
+    return {k: result[k] for k in _RESULT_KEYS if k in result}
+
+
+def make_scope(case_id: Optional[str], version: Optional[int], intent: str) -> tuple:
+    """Everything but the question that an answer depends on."""
+    return (case_id or "", version, intent, shared_generations())
+
+
+def _is_answer(result: dict) -> bool:
+    return (
+        bool(result.get("final_response"))
+        and result.get("question_ready", True)
+        and not result.get("classification_low_confidence", False)
+    )
+
+
+class _DiskStore:
+    """SQLite persistence of answer-cache entries (wall-clock expiry)."""
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                " key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM answers WHERE expires_at <= ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM answers WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, value: dict, ttl_seconds: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, time.time() + ttl_seconds, json.dumps(value, default=str)),
+            )
+            # Keep the file bounded: drop the entries closest to expiry.
+            self._conn.execute(
+                "DELETE FROM answers WHERE key IN (SELECT key FROM answers"
+                " ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM answers")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+
+class AnswerCache:
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        path: Optional[str] = None,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._memory = TTLCache(maxsize=max_entries, ttl_seconds=ttl_seconds)
+        self._disk: Optional[_DiskStore] = None
+        if path:
+            try:
+                self._disk = _DiskStore(path, max_entries)
+            except (sqlite3.Error, OSError) as exc:
+                logger.warning("[ANSWER_CACHE] %s unusable, caching in memory only: %s", path, exc)
+
+    @staticmethod
+    def make_key(
+        question: str, case_id: Optional[str], version: Optional[int], intent: str
+    ) -> str:
+        parts = {
+            "question": normalize_question(question),
+            "scope": make_scope(case_id, version, intent),
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        value = self._memory.get(key)
+        if value is MISSING and self._disk is not None:
+            try:
+                value = self._disk.get(key)
+            except (sqlite3.Error, ValueError) as exc:
+                logger.warning("[ANSWER_CACHE] disk read failed, treating as a miss: %s", exc)
+                value = None
+            if value is not None:
+                self._memory.put(key, value)
+        if value is MISSING or value is None:
+            return None
+        return copy.deepcopy(value)
+
+    def put(self, key: str, result: dict) -> None:
+        value = _stored(result)
+        self._memory.put(key, copy.deepcopy(value))
+        if self._disk is not None:
+            try:
+                self._disk.put(key, value, self._ttl)
+            except (sqlite3.Error, TypeError, ValueError) as exc:
+                logger.warning("[ANSWER_CACHE] disk write failed: %s", exc)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> dict:
+        stats = {"enabled": settings.ANSWER_CACHE_ENABLED, **self._memory.stats()}
+        if self._disk is not None:
+            try:
+                stats["disk_entries"] = len(self._disk)
+            except sqlite3.Error as exc:
+                stats["disk_error"] = str(exc)
+        return stats
+
+
+_cache: Optional[AnswerCache] = None
+_semantic: Optional[SemanticAnswerCache] = None
+_cache_lock = threading.Lock()
+_flights = SingleFlight()
+
+
+def get_answer_cache() -> AnswerCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnswerCache(
+                max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+                path=settings.ANSWER_CACHE_PATH or None,
+            )
+        return _cache
+
+
+def get_semantic_cache() -> SemanticAnswerCache:
+    global _semantic
+    with _cache_lock:
+        if _semantic is None:
+            _semantic = SemanticAnswerCache(
+                threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+                max_per_scope=settings.SEMANTIC_CACHE_MAX_PER_SCOPE,
+                entities=_entities,
+            )
+        return _semantic
+
+
+def _entities() -> frozenset[str]:
+    try:
+        return entity_terms()
+    except Exception as exc:  # guard on digits and time / negation words only
+        logger.warning("[ANSWER_CACHE] entity vocabulary unavailable: %s", exc)
+        return frozenset()
+
+
+def _embed(question: str) -> Optional[tuple[float, ...]]:
+    try:
+        return query_vector(question)
+    except Exception as exc:  # the graph still runs; it just is not cached semantically
+        logger.warning("[ANSWER_CACHE] question embedding failed: %s", exc)
+        return None
+
+
+def _run_graph(graph: Any, state: dict, store: Optional[Callable[[dict], None]]) -> dict:
+    result = graph.invoke(state)
+    if store is None or not _is_answer(result):
+        return result
+    if result.get("retrieval_degraded"):
+        # Built on an outage fallback (stale or empty search results).
+        logger.info("[ANSWER_CACHE] not stored: retrieval degraded")
+    else:
+        store(result)
+    return result
+
+
+def invoke_graph_cached(graph: Any, state: dict, intent: str) -> tuple[dict, bool]:
+    """Run ``graph`` on ``state`` unless an equivalent answer is cached.
+
+    Returns ``(graph_result, cache_hit)``. The case document loaded for the
+    version check is handed to the graph as ``case_context`` so it is not
+    read twice. Identical requests that arrive while the graph is already
+    running for the same key wait for that run and share its result; they
+    are reported as hits too, since they did not run the graph themselves.
+    """
+    if not (settings.ANSWER_CACHE_ENABLED or settings.SINGLE_FLIGHT_ENABLED):
+        return graph.invoke(state), False
+
+    case_id = state.get("case_id")
+    case_doc = load_case_document(case_id) if case_id else None
+    if case_doc is not None:
+        state = {**state, "case_context": case_doc}
+    question = state.get("question") or ""
+    version = case_version(case_doc)
+    key = AnswerCache.make_key(question, case_id, version, intent)
+    store: Optional[Callable[[dict], None]] = None
+
+    if settings.ANSWER_CACHE_ENABLED:
+        cache = get_answer_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("[ANSWER_CACHE] hit case_id=%r question=%r", case_id, question)
+            return cached, True
+
+        semantic = get_semantic_cache() if settings.SEMANTIC_CACHE_ENABLED else None
+        scope = make_scope(case_id, version, intent)
+        vector = _embed(question) if semantic is not None else None
+        terms = semantic.guard(question) if vector is not None else None
+        if vector is not None:
+            match = semantic.lookup(scope, question, vector, terms)
+            if match is not None:
+                stored, similarity, matched = match
+                logger.info(
+                    "[ANSWER_CACHE] semantic hit case_id=%r question=%r ~ %r (%.3f)",
+                    case_id, question, matched, similarity,
+                )
+                return copy.deepcopy(stored), True
+
+        def store(result: dict) -> None:
+            cache.put(key, result)
+            if vector is not None:
+                semantic.add(scope, question, vector, copy.deepcopy(_stored(result)), terms)
+
+    if not settings.SINGLE_FLIGHT_ENABLED:
+        return _run_graph(graph, state, store), False
+
+    result, shared = _flights.do(key, lambda: _run_graph(graph, state, store))
+    if shared:
+        logger.info("[ANSWER_CACHE] coalesced case_id=%r question=%r", case_id, question)
+        return copy.deepcopy(_stored(result)), True
+    return result, False
+
+
+def single_flight_stats() -> dict:
+    return {"enabled": settings.SINGLE_FLIGHT_ENABLED, **_flights.stats()}
+
+
+__all__ = [
+    "normalize_question",
+    "case_version",
+    "AnswerCache",
+    "make_scope",
+    "get_answer_cache",
+    "get_semantic_cache",
+    "invoke_graph_cached",
+    "single_flight_stats",
+]
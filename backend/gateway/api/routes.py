@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException
 from backend.gateway.api.schemas import CoSolveRequest, CoSolveResponse, Source, SuggestedQuestions
 from backend.core.graph import compiled_graph
 from backend.core.state import IncidentGraphState
+from backend.gateway.answer_cache import invoke_graph_cached
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +24,15 @@ def ask(request: CoSolveRequest) -> CoSolveResponse:
         "session_id": request.session_id,
     }
     try:
-        result = compiled_graph.invoke(state)
+        # Same graph and inputs as /entry/reasoning, so both share cache entries.
+        result, cache_hit = invoke_graph_cached(compiled_graph, state, "AI_REASONING")
     except Exception as exc:
         logger.exception("[ASK] graph invocation failed")
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return _build_response(result)
+    return _build_response(result, cache_hit)
 
 
-def _build_response(state: IncidentGraphState) -> CoSolveResponse:
+def _build_response(state: IncidentGraphState, cache_hit: bool = False) -> CoSolveResponse:
     """Translate graph result state → CoSolveResponse envelope."""
     final = state.get("final_response") or {}
     classification = final.get("classification") or {}
@@ -94,6 +96,7 @@ def _build_response(state: IncidentGraphState) -> CoSolveResponse:
         intent=intent,
         sources=sources,
         suggested_questions=suggested_questions,
+        cache_hit=cache_hit,
     )
 
 
@@ -26,12 +26,20 @@ class CoSolveResponse(BaseModel):
     sources: list[Source] = []
     suggested_questions: SuggestedQuestions | None = None
     warning: str | None = None
+    cache_hit: bool = False
 
 
 class CaseSearchRequest(BaseModel):
     query: str
     search_type: str = "text"  # 'case_id' | 'site_or_country' | 'text'
     limit: int = 10
+    cursor: str | None = None  # next_cursor of the previous page
+    fields: str = "full"  # 'full' | 'compact' (id, status, location, date)
+
+
+class BulkImportRequest(BaseModel):
+    """Closed cases to import: [{"case_id": ..., "case_doc": {...}}, ...]."""
+    cases: list[dict]
 
 
 class SuggestionsRequest(BaseModel):
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import base64
+import hashlib
 import io
 import json
 import logging
@@ -12,11 +14,31 @@ from typing import Optional
 from fastapi import APIRouter, File, HTTPException, Request, UploadFile
 from fastapi.responses import Response, StreamingResponse
 
-from backend.gateway.api.schemas import CaseSearchRequest, SuggestionsRequest
+from backend.gateway.api.schemas import BulkImportRequest, CaseSearchRequest, SuggestionsRequest
 from backend.gateway.entry_handler import EntryEnvelope
-from backend.knowledge.case_search_client import filtered_search_cases, text_search_cases, _get_case_search_client
-from backend.knowledge.knowledge_search_client import _get_knowledge_search_client
+from backend.knowledge.case_search_client import (
+    _get_case_search_client,
+    get_case_document,
+    search_cases_page,
+    suggest_cases,
+)
+from backend.knowledge.knowledge_search_client import (
+    _get_knowledge_search_client,
+    delete_knowledge_by_source,
+)
+from backend.core.http_transport import pool_stats
+from backend.core.llm import backend_stats, llm_cache_stats
+from backend.core.llm_cache import get_llm_cache
+from backend.core.llm_scheduler import scheduler_stats
+from backend.gateway.answer_cache import (
+    get_answer_cache,
+    get_semantic_cache,
+    single_flight_stats,
+)
+from backend.knowledge.resilience import resilience_stats
+from backend.knowledge.retrieval_cache import cache_stats, clear_retrieval_caches
 from backend.knowledge.tools import get_kpis
+from backend.storage.knowledge_catalog import KnowledgeCatalog
 from backend.utils.text import normalize_action
 from backend.reasoning.nodes.kpi_reflection_node import kpi_reflection_node as _kpi_reflection_fn
 
@@ -30,26 +52,64 @@ def _sanitize(value: str) -> str:
     return value.replace("'", "").replace('"', "").strip()
 
 
-def _normalize_hit(hit: dict) -> dict:
+def _normalize_hit(hit: dict, compact: bool = False) -> dict:
     """Project raw Azure Search hit to a stable UI-facing shape."""
-    return {
+    item = {
         "case_id": hit.get("case_id") or hit.get("id", ""),
-        "problem_description": (hit.get("problem_description") or "")[:200],
         "country": hit.get("organization_country") or hit.get("country") or "",
         "site": hit.get("organization_site") or hit.get("site") or "",
         "case_status": hit.get("case_status") or hit.get("status") or "",
         "opening_date": str(hit.get("opening_date") or ""),
-        "closure_date": str(hit.get("closure_date") or ""),
-        "summary": hit.get("ai_summary") or "",
     }
+    if compact:
+        return item
+    item.update(
+        problem_description=(hit.get("problem_description") or "")[:200],
+        closure_date=str(hit.get("closure_date") or ""),
+        summary=hit.get("ai_summary") or "",
+    )
+    return item
+
+
+# Index fields fetched per /cases/search field set (None = the default list).
+_FIELD_SETS: dict[str, Optional[tuple[str, ...]]] = {
+    "full": None,
+    "compact": ("case_id", "status", "organization_country", "organization_site", "opening_date"),
+}
+_MAX_PAGE_SIZE = 100
+_MAX_SKIP = 100_000  # Azure Search rejects larger $skip values
+
+
+def _query_fingerprint(mode: str, query: str, fields: str) -> str:
+    return hashlib.sha1(f"{mode}|{query}|{fields}".encode()).hexdigest()[:12]
+
+
+def _encode_cursor(fingerprint: str, skip: int) -> str:
+    raw = json.dumps({"f": fingerprint, "s": skip}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, fingerprint: str) -> int:
+    """Skip offset from an opaque cursor; 400 if it is malformed or for another query."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        skip = int(payload["s"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if payload.get("f") != fingerprint or skip < 0:
+        raise HTTPException(status_code=400, detail="Cursor does not match this query")
+    return skip
 
 
 def build_support_router(
     entry_handler,
     case_repository,
     blob_client,
+    knowledge_catalog: Optional[KnowledgeCatalog] = None,
 ) -> APIRouter:
     router = APIRouter()
+    catalog = knowledge_catalog or KnowledgeCatalog(blob_client)
 
     _allowed_case_actions = {
         "CREATE_CASE",
@@ -104,6 +164,21 @@ def build_support_router(
             )
         return _dispatch_entry_handler(envelope)
 
+    @router.post("/entry/case/bulk")
+    def handle_bulk_case_import(request: BulkImportRequest):
+        """Import closed cases concurrently, streaming one NDJSON line per case.
+
+        The final line is the summary ({"status": "bulk_imported", ...}).
+        """
+        if not request.cases:
+            raise HTTPException(status_code=400, detail="cases must not be empty")
+
+        def _ndjson():
+            for result in entry_handler.import_cases_stream(request.cases):
+                yield json.dumps(result) + "\n"
+
+        return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
     @router.post("/entry/reasoning")
     def handle_reasoning_entry(envelope: EntryEnvelope):
         if (envelope.intent or "").upper() != "AI_REASONING":
@@ -217,15 +292,20 @@ def build_support_router(
         if not query:
             raise HTTPException(status_code=400, detail="query must not be empty")
 
+        if request.fields not in _FIELD_SETS:
+            raise HTTPException(status_code=400, detail=f"Unknown field set: {request.fields}")
+        limit = max(1, min(request.limit, _MAX_PAGE_SIZE))
+        fingerprint = _query_fingerprint(mode, query, request.fields)
+        skip = _decode_cursor(request.cursor, fingerprint) if request.cursor else 0
+
+        total: Optional[int]
         try:
             if request.search_type == "case_id":
                 safe = _sanitize(query).upper()
-                filter_expr = f"case_id eq '{safe}'"
-                logger.info("[SEARCH] Running exact case_id filter: %r", filter_expr)
-                hits = filtered_search_cases(
-                    filter_expression=filter_expr,
-                    top_k=1,
-                )
+                logger.info("[SEARCH] Running case_id key lookup: %r", safe)
+                document = get_case_document(safe, select=_FIELD_SETS[request.fields])
+                hits = [document] if document else []
+                total = len(hits)
             elif request.search_type == "site_or_country":
                 safe = _sanitize(query)
                 safe_lower = safe.lower()
@@ -234,28 +314,56 @@ def build_support_router(
                     f"organization_site eq '{safe}' or organization_site eq '{safe_lower}' or "
                     f"organization_unit eq '{safe}' or organization_unit eq '{safe_lower}'"
                 )
-                logger.info("[SEARCH] Running location filter: %r", filter_expr)
-                hits = filtered_search_cases(
+                logger.info("[SEARCH] Running location filter: %r (skip=%d)", filter_expr, skip)
+                hits, total = search_cases_page(
                     filter_expression=filter_expr,
-                    top_k=request.limit,
+                    top=limit,
+                    skip=skip,
+                    select=_FIELD_SETS[request.fields],
                 )
             else:
-                logger.info("[SEARCH] Running text search for: %r", query)
-                hits = text_search_cases(
+                logger.info("[SEARCH] Running text search for: %r (skip=%d)", query, skip)
+                hits, total = search_cases_page(
                     query=query,
-                    top_k=request.limit,
+                    top=limit,
+                    skip=skip,
+                    select=_FIELD_SETS[request.fields],
                 )
         except Exception as exc:
             logger.exception("[SEARCH] Uncaught exception during search")
             raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-        results = [_normalize_hit(h) for h in hits]
+        results = [_normalize_hit(h, compact=request.fields == "compact") for h in hits]
+        next_skip = skip + len(results)
+        has_more = (
+            request.search_type != "case_id"
+            and len(results) == limit
+            and (total is None or next_skip < total)
+            and next_skip + limit <= _MAX_SKIP
+        )
         logger.info(
-            "[SEARCH] Returning %d result(s): %s",
+            "[SEARCH] Returning %d of %s result(s): %s",
             len(results),
+            total,
             [r.get("case_id") for r in results],
         )
-        return {"results": results, "count": len(results)}
+        return {
+            "results": results,
+            "count": len(results),
+            "total": total,
+            "next_cursor": _encode_cursor(fingerprint, next_skip) if has_more else None,
+        }
+
+    @router.get("/cases/suggest")
+    def suggest_cases_route(q: str = "", top: int = 8):
+        """Typeahead over case id, site and country — minimal payload."""
+        top = max(1, min(top, 20))
+        try:
+            suggestions = suggest_cases(q, top=top)
+        except Exception as exc:
+            logger.exception("[SUGGEST] typeahead failed")
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+        return {"suggestions": suggestions}
 
     @router.get("/cases/{case_id}")
     def get_case(case_id: str):
@@ -301,75 +409,48 @@ def build_support_router(
         except Exception as exc:
             raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+    @router.post("/cases/{case_id}/evidence/{filename}/reindex")
+    def reindex_evidence(case_id: str, filename: str):
+        """Re-chunk and re-index an evidence file from its cached extracted text."""
+        if not _CASE_ID_RE.match(case_id):
+            raise HTTPException(status_code=400, detail="Invalid case_id format")
+        try:
+            return entry_handler.reindex_evidence(case_id, filename)
+        except FileNotFoundError as exc:
+            raise HTTPException(
+                status_code=404, detail="Evidence file not found"
+            ) from exc
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+
     # ------------------------------------------------------------------ #
     # Knowledge library                                                    #
     # ------------------------------------------------------------------ #
 
     @router.get("/knowledge")
-    def list_knowledge_documents():
-        """Return deduplicated documents from the knowledge index (one per source file)."""
+    def list_knowledge_documents(offset: int = 0, limit: Optional[int] = None):
+        """Return one row per knowledge document from the pre-aggregated catalog."""
         try:
-            # Fetch metadata only — intentionally excludes content_text (large body field).
-            # Requesting content_text × top=1000 produces a multi-MB Azure response that
-            # causes a read timeout and makes the browser panel hang indefinitely.
-            raw = _get_knowledge_search_client().search(
-                search_text="*",
-                top=1000,
-                select=["doc_id", "title", "source", "created_at"],
-            )
-            # Group chunks by source filename → one entry per document
-            groups: dict[str, dict] = {}
-            for r in raw:
-                source = r.get("source") or r.get("title") or r.get("doc_id", "")
-                if source not in groups:
-                    groups[source] = {
-                        "doc_id": r.get("doc_id", ""),
-                        "title": r.get("title", source),
-                        "source": source,
-                        "created_at": r.get("created_at", ""),
-                        "chunk_count": 1,
-                    }
-                else:
-                    groups[source]["chunk_count"] += 1
-
-            # Determine which sources have no extractable text via a lightweight
-            # filter query (returns only doc_ids of no-text chunks — very small).
-            no_text_sources: set[str] = set()
-            try:
-                no_text_raw = _get_knowledge_search_client().search(
-                    search_text="*",
-                    filter="content_text eq '[No extractable text]'",
-                    top=1000,
-                    select=["source"],
-                )
-                for r in no_text_raw:
-                    src = r.get("source")
-                    if src:
-                        no_text_sources.add(src)
-            except Exception:
-                # Non-fatal: status badge falls back to "indexed" if this query fails
-                logger.warning(
-                    "[KNOWLEDGE] no-text filter query failed — skipping status check"
-                )
-
-            docs = [
-                {
-                    "doc_id": g["doc_id"],
-                    "title": g["title"],
-                    "source": g["source"],
-                    "created_at": g["created_at"],
-                    "chunk_count": g["chunk_count"],
-                    "status": (
-                        "no_text" if g["source"] in no_text_sources else "indexed"
-                    ),
-                }
-                for g in groups.values()
-            ]
-            return {"count": len(docs), "documents": docs}
+            total, docs = catalog.list_documents(offset=offset, limit=limit)
+            return {
+                "count": len(docs),
+                "total": total,
+                "offset": offset,
+                "documents": docs,
+            }
         except Exception as exc:
             logger.exception("[KNOWLEDGE] list_knowledge_documents failed")
             raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+    @router.post("/knowledge/catalog/rebuild")
+    def rebuild_knowledge_catalog():
+        """Recompute the knowledge catalog from the index (repair after drift)."""
+        try:
+            return {"status": "rebuilt", "count": catalog.rebuild()}
+        except Exception as exc:
+            logger.exception("[KNOWLEDGE] catalog rebuild failed")
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+
     @router.get("/knowledge/file/{filename}")
     def get_knowledge_file(filename: str):
         """Stream a raw knowledge file blob so the browser can open it inline."""
@@ -406,56 +487,38 @@ def build_support_router(
     @router.delete("/knowledge/{filename}")
     def delete_knowledge_document(filename: str):
         """Remove all indexed chunks for a source file and its blob."""
-        # 1. Find every chunk in the index whose source == filename.
-        safe = filename.replace("'", "''")
+        # 1. Page through and batch-delete every chunk whose source == filename.
         try:
-            raw = list(
-                _get_knowledge_search_client().search(
-                    search_text="*",
-                    filter=f"source eq '{safe}'",
-                    top=1000,
-                    select=["doc_id"],
-                )
-            )
+            deleted = delete_knowledge_by_source(filename)
         except Exception as exc:
-            logger.exception("[KNOWLEDGE] delete lookup failed for source=%r", filename)
+            logger.exception("[KNOWLEDGE] index delete failed for source=%r", filename)
             raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-        if not raw:
+        if not deleted:
             raise HTTPException(status_code=404, detail="Knowledge document not found")
 
-        doc_ids = [r["doc_id"] for r in raw if r.get("doc_id")]
         logger.info(
-            "[KNOWLEDGE] deleting %d chunk(s) for source=%r", len(doc_ids), filename
+            "[KNOWLEDGE] deleted %d index chunk(s) for source=%r", deleted, filename
         )
 
-        # 2. Delete the blob.
+        try:
+            catalog.remove(filename)
+        except Exception as exc:
+            logger.warning("[KNOWLEDGE] catalog remove failed for %r: %s", filename, exc)
+
+        # 2. Delete the blob once the index no longer references it.
         blob_path = f"knowledge/{filename}"
         try:
             blob_client.delete_file(blob_path)
             logger.info("[KNOWLEDGE] deleted blob %r", blob_path)
         except Exception as exc:
-            # Log but don't abort — index deletion is still useful even if blob is gone.
+            # Log but don't abort — the index is already clean.
             logger.warning("[KNOWLEDGE] blob delete failed for %r: %s", blob_path, exc)
 
-        # 3. Batch-delete all chunks from the search index.
-        try:
-            _get_knowledge_search_client().delete_documents(
-                documents=[{"doc_id": did} for did in doc_ids]
-            )
-            logger.info(
-                "[KNOWLEDGE] deleted %d index chunk(s) for source=%r",
-                len(doc_ids),
-                filename,
-            )
-        except Exception as exc:
-            logger.exception("[KNOWLEDGE] index delete failed for source=%r", filename)
-            raise HTTPException(status_code=500, detail=str(exc)) from exc
-
         return {
             "status": "deleted",
             "filename": filename,
-            "chunks_deleted": len(doc_ids),
+            "chunks_deleted": deleted,
         }
 
     # ------------------------------------------------------------------ #
@@ -527,6 +590,66 @@ def build_support_router(
             "models": sorted(models_seen),
         }
 
+    # ------------------------------------------------------------------ #
+    # Retrieval cache                                                      #
+    # ------------------------------------------------------------------ #
+
+    @router.get("/admin/retrieval-cache")
+    def get_retrieval_cache_stats():
+        return cache_stats()
+
+    @router.post("/admin/retrieval-cache/clear")
+    def clear_retrieval_cache():
+        clear_retrieval_caches()
+        return {"cleared": True}
+
+    @router.get("/admin/answer-cache")
+    def get_answer_cache_stats():
+        return {
+            **get_answer_cache().stats(),
+            "semantic": get_semantic_cache().stats(),
+            "single_flight": single_flight_stats(),
+        }
+
+    @router.post("/admin/answer-cache/clear")
+    def clear_answer_cache():
+        get_answer_cache().clear()
+        get_semantic_cache().clear()
+        return {"cleared": True}
+
+    @router.get("/admin/search-resilience")
+    def get_search_resilience_stats():
+        return resilience_stats()
+
+    # ------------------------------------------------------------------ #
+    # Shared HTTP pools                                                    #
+    # ------------------------------------------------------------------ #
+
+    @router.get("/admin/http-pools")
+    def get_http_pool_stats():
+        return pool_stats()
+
+    # ------------------------------------------------------------------ #
+    # LLM scheduler                                                        #
+    # ------------------------------------------------------------------ #
+
+    @router.get("/admin/llm-scheduler")
+    def get_llm_scheduler_stats():
+        return scheduler_stats()
+
+    @router.get("/admin/llm-backends")
+    def get_llm_backend_stats():
+        return backend_stats()
+
+    @router.get("/admin/llm-cache")
+    def get_llm_cache_stats():
+        return llm_cache_stats()
+
+    @router.post("/admin/llm-cache/clear")
+    def clear_llm_cache():
+        get_llm_cache().clear()
+        return {"cleared": True}
+
     # ------------------------------------------------------------------ #
     # Admin flow visualizer                                                #
     # ------------------------------------------------------------------ #
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Iterator
 
+from backend.core.config import settings
 from backend.storage.ingestion.case_ingestion import CaseEntryService, CaseIngestionService
 
 _logger = logging.getLogger(__name__)
@@ -54,30 +57,112 @@ def update_case(
     return {"status": "updated", **result}
 
 
-def import_bulk_cases(
-    cases: list[dict[str, Any]],
+def _import_case_items(
+    case_id: str,
+    case_docs: list[Any],
     case_entry: CaseEntryService,
     case_ingestion: CaseIngestionService,
-) -> dict[str, Any]:
-    """Import a batch of closed case documents sent as a JSON array."""
-    imported: list[dict[str, Any]] = []
-    failed: list[dict[str, Any]] = []
-    for item in cases:
-        case_id = str(item.get("case_id") or "").strip()
-        case_doc = item.get("case_doc") or {}
-        if not case_id:
-            failed.append({"case_id": None, "error": "missing case_id in item"})
-            continue
+) -> list[dict[str, Any]]:
+    """Save and index every document submitted for one case_id, in order."""
+    results: list[dict[str, Any]] = []
+    for case_doc in case_docs:
         try:
             if not isinstance(case_doc, dict):
                 case_doc = {}
             case_doc.setdefault("case_id", case_id)
             case_entry.save_case_document(case_id, case_doc)
             case_ingestion.ingest_closed_case(case_id)
-            imported.append({"case_id": case_id, "status": "imported"})
+            results.append({"case_id": case_id, "status": "imported"})
         except Exception as exc:
             _logger.exception("[BULK_IMPORT] failed for %s: %s", case_id, exc)
-            failed.append({"case_id": case_id, "error": str(exc)})
+            results.append({"case_id": case_id, "status": "failed", "error": str(exc)})
+    return results
+
+
+def iter_bulk_import(
+    cases: list[dict[str, Any]],
+    case_entry: CaseEntryService,
+    case_ingestion: CaseIngestionService,
+    max_workers: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Import closed cases concurrently, yielding each result as it completes.
+
+    At most ``max_workers`` cases are in flight; new work is only submitted
+    when the consumer pulls the next result, so a slow reader (e.g. a
+    streaming HTTP client) throttles the import instead of buffering it.
+    Items sharing a case_id run sequentially in submission order. The last
+    item yielded is a summary with status "bulk_imported".
+    """
+    started = time.perf_counter()
+    workers = max(1, max_workers or settings.BULK_IMPORT_CONCURRENCY)
+
+    grouped: dict[str, list[Any]] = {}
+    imported = failed = 0
+    for item in cases:
+        case_id = str((item or {}).get("case_id") or "").strip()
+        if not case_id:
+            failed += 1
+            yield {"case_id": None, "status": "failed", "error": "missing case_id in item"}
+            continue
+        grouped.setdefault(case_id, []).append(item.get("case_doc") or {})
+
+    pending_groups = iter(grouped.items())
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-import") as pool:
+        in_flight: set[Future] = set()
+
+        def _fill() -> None:
+            while len(in_flight) < workers:
+                nxt = next(pending_groups, None)
+                if nxt is None:
+                    return
+                in_flight.add(
+                    pool.submit(_import_case_items, nxt[0], nxt[1], case_entry, case_ingestion)
+                )
+
+        _fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.discard(future)
+                for result in future.result():
+                    if result["status"] == "imported":
+                        imported += 1
+                    else:
+                        failed += 1
+                    yield result
+            _fill()
+
+    elapsed = time.perf_counter() - started
+    _logger.info(
+        "[BULK_IMPORT] %d imported, %d failed in %.1fs (workers=%d)",
+        imported,
+        failed,
+        elapsed,
+        workers,
+    )
+    yield {
+        "status": "bulk_imported",
+        "imported": imported,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+def import_bulk_cases(
+    cases: list[dict[str, Any]],
+    case_entry: CaseEntryService,
+    case_ingestion: CaseIngestionService,
+) -> dict[str, Any]:
+    """Import a batch of closed case documents sent as a JSON array."""
+    imported: list[dict[str, Any]] = []
+    failed: list[dict[str, Any]] = []
+    for result in iter_bulk_import(cases, case_entry, case_ingestion):
+        if result.get("status") == "bulk_imported":
+            continue
+        if result["status"] == "imported":
+            imported.append(result)
+        else:
+            failed.append({"case_id": result["case_id"], "error": result["error"]})
     return {
         "status": "bulk_imported",
         "imported": len(imported),
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional, Literal
+from typing import Any, Iterator, Optional, Literal
 
 from pydantic import BaseModel
 from langchain_openai import AzureChatOpenAI
@@ -15,6 +15,7 @@ from backend.gateway.case_manager import (
     create_case,
     update_case,
     close_case,
+    iter_bulk_import,
     reindex_case as _reindex_case,
 )
 from backend.gateway.content_ingestion import (
@@ -41,6 +42,7 @@ class EntryResponseEnvelope(BaseModel):
     status: str
     data: dict[str, Any] = {}
     errors: list[str] = []
+    cache_hit: bool = False
 
 
 class EntryHandler:
@@ -100,9 +102,23 @@ class EntryHandler:
     def upload_knowledge(self, filename: str, data: bytes, content_type: str) -> None:
         upload_knowledge_file(filename, data, content_type, self._knowledge_ingestion)
 
+    def import_cases_stream(
+        self, cases: list[dict[str, Any]]
+    ) -> Iterator[dict[str, Any]]:
+        return iter_bulk_import(cases, self._case_entry, self._case_ingestion)
+
     def reindex_case(self, case_id: str) -> dict[str, str]:
         return _reindex_case(case_id, self._case_ingestion)
 
+    def reindex_evidence(self, case_id: str, filename: str) -> dict[str, Any]:
+        chunk_count = self._evidence_ingestion.reindex_evidence(case_id, filename)
+        return {
+            "status": "reindexed",
+            "case_id": case_id,
+            "filename": filename,
+            "chunk_count": chunk_count,
+        }
+
     def _compute_llm_stats(self) -> dict | str:
         # DEPRECATED: orphaned — llm_calls.jsonl no longer written
         raise NotImplementedError(
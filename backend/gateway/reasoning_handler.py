@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from backend.core.state import IncidentGraphState
+from backend.gateway.answer_cache import invoke_graph_cached
 
 _logger = logging.getLogger(__name__)
 
@@ -63,7 +64,7 @@ def handle_ai_reasoning(envelope, graph: Any):
     }
 
     try:
-        graph_result = graph.invoke(initial_state)
+        graph_result, cache_hit = invoke_graph_cached(graph, initial_state, envelope.intent)
     except Exception as e:
         _logger.error("[ENTRY_DEBUG] exception in graph: %s", str(e), exc_info=True)
         return build_clarifying_response(envelope)
@@ -84,6 +85,7 @@ def handle_ai_reasoning(envelope, graph: Any):
         intent=envelope.intent,
         status="accepted",
         data=response,
+        cache_hit=cache_hit,
     )
 
 
@@ -0,0 +1,164 @@
+"""Near-duplicate question lookup for the answer cache.
+
+Paraphrases ("how are we doing this year?" / "overall performance this
+year") miss the exact-match answer cache even though the graph would answer
+them identically. ``SemanticAnswerCache`` keeps, per scope (case, case
+version, intent, index generations), a small matrix of the embeddings of
+recently answered questions. A new question whose cosine similarity to a
+stored one reaches the threshold gets that stored answer.
+
+Embeddings alone blur "this year" and "last year", "with" and "without",
+"Linz" and "Graz" or "D4" and "D5", so a match also requires the same
+tokens containing digits, time / negation words and entity words (site and
+country names, supplied by the caller).
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Sequence
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_GUARD_WORDS = frozenset(
+    "last this next previous current past prior today yesterday tomorrow "
+    "week month quarter year annual monthly weekly daily ytd "
+    "not no never without except".split()
+)
+
+
+def guard_terms(question: str, entities: frozenset[str] = frozenset()) -> frozenset[str]:
+    """Tokens that must agree for two questions to share an answer."""
+    return frozenset(
+        t
+        for t in _TOKEN_RE.findall(question.lower())
+        if t in _GUARD_WORDS or t in entities or any(c.isdigit() for c in t)
+    )
+
+
+class _Scope:
+    __slots__ = ("vectors", "entries")
+
+    def __init__(self, dim: int) -> None:
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        # (expires_at, question, guard terms, stored result), row-aligned with vectors
+        self.entries: list[tuple[float, str, frozenset, dict]] = []
+
+    def drop(self, keep: np.ndarray) -> None:
+        self.vectors = self.vectors[keep]
+        self.entries = [e for e, k in zip(self.entries, keep) if k]
+
+
+class SemanticAnswerCache:
+    """Per-scope cosine-similarity lookup of previously answered questions."""
+
+    def __init__(
+        self,
+        threshold: float,
+        ttl_seconds: float,
+        max_per_scope: int = 64,
+        max_scopes: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+        entities: Callable[[], frozenset[str]] = frozenset,
+    ) -> None:
+        self._threshold = threshold
+        self._ttl = ttl_seconds
+        self._max_per_scope = max_per_scope
+        self._max_scopes = max_scopes
+        self._clock = clock
+        self._entities = entities
+        self._lock = threading.Lock()
+        self._scopes: OrderedDict[Hashable, _Scope] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _unit(vector: Sequence[float]) -> np.ndarray:
+        v = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm else v
+
+    def guard(self, question: str) -> frozenset[str]:
+        """``guard_terms`` of ``question`` under the current entity vocabulary."""
+        return guard_terms(question, self._entities())
+
+    def lookup(
+        self,
+        scope: Hashable,
+        question: str,
+        vector: Sequence[float],
+        terms: Optional[frozenset[str]] = None,
+    ) -> Optional[tuple[dict, float, str]]:
+        """``(result, similarity, matched question)`` of the best match, or None.
+
+        ``terms`` are the question's guard terms when already computed.
+        """
+        v = self._unit(vector)
+        guard = self.guard(question) if terms is None else terms
+        now = self._clock()
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None or not entry.entries or entry.vectors.shape[1] != v.shape[0]:
+                self.misses += 1
+                return None
+            self._scopes.move_to_end(scope)
+            alive = np.array([e[0] > now for e in entry.entries])
+            if not alive.all():
+                entry.drop(alive)
+            sims = entry.vectors @ v if entry.entries else np.empty(0)
+            for i in np.argsort(-sims):
+                if sims[i] < self._threshold:
+                    break
+                _, matched, terms, result = entry.entries[i]
+                if terms == guard:
+                    self.hits += 1
+                    return result, float(sims[i]), matched
+            self.misses += 1
+            return None
+
+    def add(
+        self,
+        scope: Hashable,
+        question: str,
+        vector: Sequence[float],
+        result: dict,
+        terms: Optional[frozenset[str]] = None,
+    ) -> None:
+        v = self._unit(vector)
+        if terms is None:
+            terms = self.guard(question)
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None or entry.vectors.shape[1] != v.shape[0]:
+                entry = self._scopes[scope] = _Scope(v.shape[0])
+            self._scopes.move_to_end(scope)
+            entry.vectors = np.vstack([entry.vectors, v[None, :]])
+            entry.entries.append((self._clock() + self._ttl, question, terms, result))
+            if len(entry.entries) > self._max_per_scope:
+                keep = np.zeros(len(entry.entries), dtype=bool)
+                keep[-self._max_per_scope:] = True
+                entry.drop(keep)
+            while len(self._scopes) > self._max_scopes:
+                self._scopes.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scopes.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "threshold": self._threshold,
+                "scopes": len(self._scopes),
+                "entries": sum(len(s.entries) for s in self._scopes.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+__all__ = ["guard_terms", "SemanticAnswerCache"]
@@ -8,6 +8,8 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import AzureChatOpenAI
 from pydantic import BaseModel
 
+from backend.core.llm_scheduler import PRIORITY_BACKGROUND, llm_priority
+
 
 class SuggestionItem(BaseModel):
     label: str
@@ -106,12 +108,14 @@ def generate_suggestions(
             f"Status: {status}"
         )
 
-        result: SuggestionsLLMResponse = llm_client.with_structured_output(
-            SuggestionsLLMResponse
-        ).invoke([
-            SystemMessage(content=_SUGGESTIONS_SYSTEM),
-            HumanMessage(content=user_prompt),
-        ])
+        # Suggestion chips are a nice-to-have: yield quota to user questions.
+        with llm_priority(PRIORITY_BACKGROUND):
+            result: SuggestionsLLMResponse = llm_client.with_structured_output(
+                SuggestionsLLMResponse
+            ).invoke([
+                SystemMessage(content=_SUGGESTIONS_SYSTEM),
+                HumanMessage(content=user_prompt),
+            ])
         suggestions = [
             {
                 "label": _DSTEP_RE.sub("", s.label).strip(" -:"),
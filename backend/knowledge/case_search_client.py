@@ -1,20 +1,34 @@
-"""Case search — module-level functions wrapping AzureSearch VectorStore + raw SDK.
+"""Case search — module-level functions wrapping the raw Azure Search SDK.
 
-Hybrid search uses LangChain AzureSearch VectorStore (embedding handled internally).
-Filtered and text searches use a thin SearchClient (no vector, no ranking bias).
+Similarity search embeds the query once (cached) and issues a vector query.
+Filtered and text searches use the same thin SearchClient (no vector, no
+ranking bias). Every query takes a ``select`` projection so callers only pay
+for the fields they map; see the ``*_FIELDS`` tuples in knowledge/tools.py.
+Closed-case similarity can be answered from an in-process replica
+(local_case_index) that is synced incrementally from the index.
 """
 from __future__ import annotations
 
 import logging
+import re
+import threading
+import time
 from functools import lru_cache
-from typing import Optional
+from typing import Iterator, Optional, Sequence
 
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
 from azure.search.documents import SearchClient
-from langchain_community.vectorstores.azuresearch import AzureSearch
+from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.models import VectorizedQuery
 
 from backend.core.config import Settings
-from backend.knowledge.embeddings import get_embeddings
+from backend.core.http_transport import get_azure_transport
+from backend.knowledge.embeddings import generate_embedding
+from backend.storage.index_pointer import resolve_index_name
+from backend.knowledge.resilience import resilient_search
+from backend.knowledge.retrieval_cache import cached_retrieval, generation
+from backend.utils.prefix_trie import PrefixTrie
 
 logger = logging.getLogger("case_search_client")
 
@@ -33,68 +47,106 @@ _TEXT_SEARCH_FIELDS = [
     "fishbone_text", "five_whys_text", "ai_summary", "team_members",
 ]
 
+_PAGE_SIZE = 1000
 
-@lru_cache(maxsize=1)
-def _get_settings() -> Settings:
-    return Settings()
+# Characters Azure Search accepts in a document key.
+_KEY_RE = re.compile(r"^[A-Za-z0-9_\-=]+$")
 
+# Index suggester used by the case board typeahead (see scripts/rebuild_index.py).
+CASE_SUGGESTER = "case-typeahead"
+SUGGEST_FIELDS = ("case_id", "organization_site", "organization_country")
 
-@lru_cache(maxsize=1)
-def _get_case_vectorstore() -> AzureSearch:
-    s = _get_settings()
-    return AzureSearch(
-        azure_search_endpoint=s.AZURE_SEARCH_ENDPOINT,
-        azure_search_key=s.AZURE_SEARCH_ADMIN_KEY,
-        index_name=s.CASE_INDEX_NAME,
-        embedding_function=get_embeddings().embed_query,
-        content_key="content_text",
-        vector_field_name="embedding",
-    )
+_local_sync_lock = threading.Lock()
+_local_last_sync = 0.0
+
+_typeahead_lock = threading.Lock()
+_typeahead_build_lock = threading.Lock()
+_typeahead_trie: Optional[PrefixTrie] = None
+_typeahead_built: tuple[int, float] = (-1, 0.0)  # (case generation, monotonic time)
+_typeahead_refreshing = False
+
+# Words of the site / country names in the typeahead trie they were read from.
+_entity_vocabulary: tuple[Optional[PrefixTrie], frozenset[str]] = (None, frozenset())
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Physical index name → whether it defines CASE_SUGGESTER.
+_suggester_present: dict[str, bool] = {}
 
 
 @lru_cache(maxsize=1)
-def _get_case_search_client() -> SearchClient:
-    """Thin SDK client for exhaustive filtered searches (KPI, case-by-id)."""
+def _get_settings() -> Settings:
+    return Settings()
+
+
+@lru_cache(maxsize=4)
+def _case_search_client_for(index_name: str) -> SearchClient:
     s = _get_settings()
     return SearchClient(
         endpoint=s.AZURE_SEARCH_ENDPOINT,
-        index_name=s.CASE_INDEX_NAME,
+        index_name=index_name,
         credential=AzureKeyCredential(s.AZURE_SEARCH_ADMIN_KEY),
+        transport=get_azure_transport(s.AZURE_SEARCH_ENDPOINT),
     )
 
 
+def _get_case_search_client() -> SearchClient:
+    """Thin SDK client bound to the currently active case index."""
+    return _case_search_client_for(resolve_index_name(_get_settings().CASE_INDEX_NAME))
+
+
+@cached_retrieval("case")
+@resilient_search("case.hybrid_search")
 def hybrid_search_cases(
     query: str,
     filter_expression: Optional[str] = None,
     top_k: int = 5,
+    select: Optional[Sequence[str]] = None,
 ) -> list[dict]:
-    """Hybrid BM25 + vector search via LangChain VectorStore."""
-    logger.info("[CASE] hybrid_search query=%r filter=%r top_k=%d", query, filter_expression, top_k)
-    docs_with_scores = _get_case_vectorstore().similarity_search_with_relevance_scores(
-        query,
-        k=top_k,
-        filters=filter_expression,
+    """Similarity search over case embeddings, projected to ``select``.
+
+    Without ``select`` every retrievable field except the embedding is
+    returned. Hits carry ``@search.score``.
+    """
+    logger.info(
+        "[CASE] hybrid_search query=%r filter=%r top_k=%d select=%s",
+        query, filter_expression, top_k, select,
     )
-    results = []
-    for doc, score in docs_with_scores:
-        item = dict(doc.metadata)
-        item["@search.score"] = score
-        results.append(item)
+    vector_query = VectorizedQuery(
+        vector=list(query_vector(query)),
+        k_nearest_neighbors=top_k,
+        fields="embedding",
+    )
+    results_iter = _get_case_search_client().search(
+        search_text=None,
+        vector_queries=[vector_query],
+        filter=filter_expression,
+        top=top_k,
+        select=list(select) if select else None,
+    )
+    results = [
+        {k: v for k, v in r.items() if k != "embedding"} for r in results_iter
+    ]
     logger.info("[CASE] hybrid_search returned %d hits", len(results))
     return results
 
 
+@cached_retrieval("case")
+@resilient_search("case.filtered_search")
 def filtered_search_cases(
     filter_expression: str,
     top_k: int = 100,
+    select: Optional[Sequence[str]] = None,
 ) -> list[dict]:
-    """Pure OData filter — no vector, no ranking. Used by KPI aggregation."""
+    """Pure OData filter — no vector, no ranking. Used by KPI aggregation.
+
+    ``select`` defaults to the case-list fields (``_SELECT_FIELDS``).
+    """
     logger.info("[CASE] filtered_search filter=%r top_k=%d", filter_expression, top_k)
     results_iter = _get_case_search_client().search(
         search_text="*",
         filter=filter_expression,
         top=top_k,
-        select=_SELECT_FIELDS,
+        select=list(select) if select else _SELECT_FIELDS,
     )
     hits = [dict(r) for r in results_iter]
     logger.info(
@@ -105,28 +157,379 @@ def filtered_search_cases(
     return hits
 
 
-def text_search_cases(
-    query: str,
-    top_k: int = 10,
-) -> list[dict]:
-    """BM25-only text search used by the case search UI.
+def case_doc_id(case_id: str) -> str:
+    """Index key of ``case_id`` (same scheme as CaseIngestionService._build_doc_id)."""
+    return f"{case_id}__{_get_settings().CASE_INDEX_NAME}"
+
+
+@cached_retrieval("case")
+def get_case_document(
+    case_id: str,
+    select: Optional[Sequence[str]] = None,
+) -> Optional[dict]:
+    """Point lookup of one case by index key; None when it is not indexed.
+
+    Cached with the other case queries, so repeated lookups are served from
+    memory until the next case write.
+    """
+    if not case_id or not _KEY_RE.match(case_id):
+        return None
+    try:
+        document = _get_case_search_client().get_document(
+            key=case_doc_id(case_id),
+            selected_fields=list(select) if select else _SELECT_FIELDS,
+        )
+    except ResourceNotFoundError:
+        logger.info("[CASE] get_case_document %s — not found", case_id)
+        return None
+    return dict(document)
+
+
+def _text_query_kwargs(query: str) -> dict:
+    """search_text / fields / syntax for a case board text query.
 
     Wildcard queries (ending with '*') use Lucene full syntax with
     search_fields=None so Azure fans out across all searchable fields.
     """
     is_wildcard = query.strip().endswith("*")
-    logger.info(
-        "[CASE] text_search query=%r wildcard=%s top_k=%d", query, is_wildcard, top_k
-    )
+    return {
+        "search_text": query,
+        "search_fields": None if is_wildcard else _TEXT_SEARCH_FIELDS,
+        "query_type": "full" if is_wildcard else "simple",
+        "search_mode": "any",
+    }
+
+
+def text_search_cases(
+    query: str,
+    top_k: int = 10,
+) -> list[dict]:
+    """BM25-only text search used by the case search UI."""
+    logger.info("[CASE] text_search query=%r top_k=%d", query, top_k)
     results = _get_case_search_client().search(
-        search_text=query,
-        search_fields=None if is_wildcard else _TEXT_SEARCH_FIELDS,
-        query_type="full" if is_wildcard else "simple",
-        search_mode="any",
+        **_text_query_kwargs(query),
         top=top_k,
         select=_SELECT_FIELDS,
     )
     return [dict(r) for r in results]
 
 
-__all__ = ["hybrid_search_cases", "filtered_search_cases", "text_search_cases"]
+def search_cases_page(
+    query: Optional[str] = None,
+    filter_expression: Optional[str] = None,
+    top: int = 10,
+    skip: int = 0,
+    select: Optional[Sequence[str]] = None,
+) -> tuple[list[dict], Optional[int]]:
+    """One page of a case board query, plus the total match count.
+
+    With ``query`` this is the BM25 text search of ``text_search_cases``;
+    without it, a pure filter ordered by case_id so that skip-based pages
+    are stable.
+    """
+    logger.info(
+        "[CASE] search_page query=%r filter=%r top=%d skip=%d",
+        query, filter_expression, top, skip,
+    )
+    if query:
+        kwargs = _text_query_kwargs(query)
+    else:
+        kwargs = {"search_text": "*", "order_by": ["case_id asc"]}
+    results = _get_case_search_client().search(
+        **kwargs,
+        filter=filter_expression,
+        top=top,
+        skip=skip,
+        select=list(select) if select else _SELECT_FIELDS,
+        include_total_count=True,
+    )
+    hits = [dict(r) for r in results]
+    return hits, results.get_count()
+
+
+# ---------------------------------------------------------------------------
+# Typeahead
+# ---------------------------------------------------------------------------
+
+def _build_typeahead_trie() -> PrefixTrie:
+    trie: PrefixTrie = PrefixTrie()
+    client = _get_case_search_client()
+    skip = 0
+    while True:
+        page = list(
+            client.search(
+                search_text="*",
+                select=list(SUGGEST_FIELDS),
+                order_by=["case_id asc"],
+                top=_PAGE_SIZE,
+                skip=skip,
+            )
+        )
+        for doc in page:
+            entry = tuple(doc.get(f) or "" for f in SUGGEST_FIELDS)
+            for key in entry:
+                trie.insert(key, entry)
+        if len(page) < _PAGE_SIZE:
+            return trie
+        skip += _PAGE_SIZE
+
+
+def _refresh_typeahead_trie(if_missing: bool = False) -> None:
+    """Build a new trie and swap it in; readers keep the old one meanwhile."""
+    global _typeahead_trie, _typeahead_built, _typeahead_refreshing
+    with _typeahead_build_lock:
+        if if_missing and _typeahead_trie is not None:
+            return
+        current = generation("case")
+        try:
+            trie = _build_typeahead_trie()
+            logger.info("[CASE] typeahead trie built: %d keys", len(trie))
+        except Exception as exc:
+            # Keep serving the old trie; retry once the TTL has passed.
+            logger.warning("[CASE] typeahead trie build failed: %s", exc)
+            trie = None
+        with _typeahead_lock:
+            if trie is not None or _typeahead_trie is None:
+                _typeahead_trie = trie or PrefixTrie()
+            _typeahead_built = (current, time.monotonic())
+            _typeahead_refreshing = False
+
+
+def _get_typeahead_trie() -> PrefixTrie:
+    """In-process trie over id / site / country, rebuilt after case writes or TTL.
+
+    Only the very first build runs on the calling thread; later rebuilds run
+    in the background while the previous trie keeps answering.
+    """
+    with _typeahead_lock:
+        trie = _typeahead_trie
+        built_generation, built_at = _typeahead_built
+        stale = (
+            built_generation != generation("case")
+            or time.monotonic() - built_at > _get_settings().RETRIEVAL_CACHE_TTL_SECONDS
+        )
+        if trie is not None and stale:
+            _refresh_typeahead_in_background()
+    if trie is None:
+        _refresh_typeahead_trie(if_missing=True)
+        trie = _typeahead_trie
+    return trie
+
+
+def _refresh_typeahead_in_background() -> None:
+    """Start a trie rebuild unless one is running; call with _typeahead_lock held."""
+    global _typeahead_refreshing
+    if not _typeahead_refreshing:
+        _typeahead_refreshing = True
+        threading.Thread(target=_refresh_typeahead_trie, name="typeahead-trie", daemon=True).start()
+
+
+def _has_suggester(index_name: str) -> bool:
+    """Whether ``index_name`` defines CASE_SUGGESTER (read once per index)."""
+    present = _suggester_present.get(index_name)
+    if present is None:
+        s = _get_settings()
+        try:
+            index = SearchIndexClient(
+                endpoint=s.AZURE_SEARCH_ENDPOINT,
+                credential=AzureKeyCredential(s.AZURE_SEARCH_ADMIN_KEY),
+                transport=get_azure_transport(s.AZURE_SEARCH_ENDPOINT),
+            ).get_index(index_name)
+        except HttpResponseError as exc:
+            logger.warning("[CASE] could not read %s definition: %s", index_name, exc.message)
+            return True  # let the suggest call decide; look again next time
+        present = any(sg.name == CASE_SUGGESTER for sg in index.suggesters or [])
+        _suggester_present[index_name] = present
+        if not present:
+            logger.info("[CASE] %s has no suggester — typeahead uses the local trie", index_name)
+    return present
+
+
+def entity_terms() -> frozenset[str]:
+    """Lower-case words of every known site and country name.
+
+    Read from the typeahead trie, so it follows case writes the same way.
+    Never builds the trie on the calling thread: until the first build has
+    finished in the background the vocabulary is empty.
+    """
+    global _entity_vocabulary
+    with _typeahead_lock:
+        if _typeahead_trie is None:
+            _refresh_typeahead_in_background()
+            return frozenset()
+    trie = _get_typeahead_trie()
+    built_from, terms = _entity_vocabulary
+    if built_from is not trie:
+        terms = frozenset(
+            word
+            for _, site, country in trie.search("", len(trie))
+            for word in _WORD_RE.findall(f"{site} {country}".lower())
+        )
+        _entity_vocabulary = (trie, terms)
+    return terms
+
+
+@cached_retrieval("case")
+def suggest_cases(prefix: str, top: int = 8) -> list[dict]:
+    """Prefix suggestions over case id, site and country for the typeahead.
+
+    Uses the index suggester; falls back to the in-process trie when the
+    active index has none (indexes built before the suggester was added).
+    Whether it has one is read from the index definition once per index.
+    """
+    prefix = (prefix or "").strip()[:100]
+    if not prefix:
+        return []
+    if _has_suggester(resolve_index_name(_get_settings().CASE_INDEX_NAME)):
+        try:
+            results = _get_case_search_client().suggest(
+                search_text=prefix,
+                suggester_name=CASE_SUGGESTER,
+                select=list(SUGGEST_FIELDS),
+                top=top,
+            )
+            return [{f: r.get(f) for f in SUGGEST_FIELDS} for r in results]
+        except HttpResponseError as exc:
+            logger.warning("[CASE] suggest failed (%s) — using local trie", exc.message)
+    return [dict(zip(SUGGEST_FIELDS, entry)) for entry in _get_typeahead_trie().search(prefix, top)]
+
+
+# ---------------------------------------------------------------------------
+# Local closed-case replica
+# ---------------------------------------------------------------------------
+
+def iter_closed_cases_with_vectors(since: Optional[str] = None) -> Iterator[dict]:
+    """Page through closed cases (with embeddings) updated at or after ``since``."""
+    from backend.knowledge.local_case_index import META_FIELDS
+
+    filter_expression = "status eq 'closed'"
+    if since:
+        filter_expression += f" and updated_at ge {since}"
+    client = _get_case_search_client()
+    skip = 0
+    while True:
+        page = [
+            dict(r)
+            for r in client.search(
+                search_text="*",
+                filter=filter_expression,
+                select=[*META_FIELDS, "updated_at", "embedding"],
+                order_by=["case_id asc"],
+                top=_PAGE_SIZE,
+                skip=skip,
+            )
+        ]
+        yield from page
+        if len(page) < _PAGE_SIZE:
+            return
+        skip += _PAGE_SIZE
+
+
+@lru_cache(maxsize=1)
+def get_local_case_index():
+    """Process-wide closed-case replica, or None when disabled/unavailable."""
+    s = _get_settings()
+    if not s.LOCAL_CASE_INDEX_ENABLED:
+        return None
+    try:
+        from backend.knowledge.local_case_index import LocalCaseIndex
+    except ImportError as exc:
+        logger.warning("[CASE] local case index unavailable: %s", exc)
+        return None
+    index = LocalCaseIndex(
+        s.LOCAL_CASE_INDEX_DIR, ann_threshold=s.LOCAL_CASE_INDEX_ANN_THRESHOLD
+    )
+    try:
+        index.load()
+    except Exception as exc:
+        logger.warning("[CASE] could not load local case index: %s", exc)
+    return index
+
+
+def sync_local_case_index() -> int:
+    """Pull closed cases changed since the last sync into the replica."""
+    index = get_local_case_index()
+    if index is None:
+        return 0
+    source = resolve_index_name(_get_settings().CASE_INDEX_NAME)
+    added = index.sync(iter_closed_cases_with_vectors, source)
+    logger.info("[CASE] local index sync from %s: %d case(s)", source, added)
+    return added
+
+
+def _maybe_sync_local_case_index() -> None:
+    """Kick off a background sync when the replica is older than the interval."""
+    global _local_last_sync
+    interval = _get_settings().LOCAL_CASE_INDEX_SYNC_SECONDS
+    if time.monotonic() - _local_last_sync < interval and _local_last_sync:
+        return
+    if not _local_sync_lock.acquire(blocking=False):
+        return  # a sync is already running
+    _local_last_sync = time.monotonic()
+
+    def _run() -> None:
+        try:
+            sync_local_case_index()
+        except Exception as exc:
+            logger.warning("[CASE] local index sync failed: %s", exc)
+        finally:
+            _local_sync_lock.release()
+
+    threading.Thread(target=_run, name="local-case-index-sync", daemon=True).start()
+
+
+@lru_cache(maxsize=256)
+def query_vector(query: str) -> tuple[float, ...]:
+    """Embedding of ``query``, memoised so one question is embedded once per process."""
+    return tuple(generate_embedding(query))
+
+
+def local_similar_cases(
+    query: str,
+    top_k: int = 5,
+    country: Optional[str] = None,
+    exclude_case_id: Optional[str] = None,
+) -> Optional[list[dict]]:
+    """Vector similarity over the local closed-case replica.
+
+    Returns None when the replica is disabled or still empty so callers can
+    fall back to ``hybrid_search_cases``.
+    """
+    index = get_local_case_index()
+    if index is None:
+        return None
+    _maybe_sync_local_case_index()
+    if index.size == 0:
+        return None
+    results = index.search(
+        list(query_vector(query)),
+        top_k,
+        country=country,
+        exclude_case_id=exclude_case_id,
+    )
+    logger.info(
+        "[CASE] local similar_cases query=%r country=%r returned %d hits",
+        query,
+        country,
+        len(results),
+    )
+    return results
+
+
+__all__ = [
+    "hybrid_search_cases",
+    "filtered_search_cases",
+    "text_search_cases",
+    "search_cases_page",
+    "case_doc_id",
+    "get_case_document",
+    "CASE_SUGGESTER",
+    "SUGGEST_FIELDS",
+    "suggest_cases",
+    "entity_terms",
+    "iter_closed_cases_with_vectors",
+    "get_local_case_index",
+    "sync_local_case_index",
+    "local_similar_cases",
+    "query_vector",
+]
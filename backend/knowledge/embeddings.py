@@ -12,6 +12,8 @@ from functools import lru_cache
 from dotenv import load_dotenv
 from langchain_openai import AzureOpenAIEmbeddings
 
+from backend.core.http_transport import get_httpx_client
+
 logger = logging.getLogger("embeddings")
 
 
@@ -46,6 +48,7 @@ def get_embeddings() -> AzureOpenAIEmbeddings:
         azure_deployment=deployment,
         api_key=api_key,
         api_version=api_version,
+        http_client=get_httpx_client(endpoint),
     )
 
 
@@ -7,13 +7,22 @@ from __future__ import annotations
 import logging
 from functools import lru_cache
 
+from azure.core.credentials import AzureKeyCredential
+from azure.search.documents import SearchClient
 from langchain_community.vectorstores.azuresearch import AzureSearch
 
 from backend.core.config import Settings
+from backend.core.http_transport import get_azure_transport
 from backend.knowledge.embeddings import get_embeddings
+from backend.knowledge.resilience import resilient_search
+from backend.knowledge.retrieval_cache import cached_retrieval
 
 logger = logging.getLogger("evidence_search_client")
 
+# Evidence is indexed in chunks; fetch extra hits so that top_k distinct
+# files remain after collapsing chunks of the same file.
+_CHUNK_OVERFETCH = 3
+
 
 @lru_cache(maxsize=1)
 def _get_settings() -> Settings:
@@ -23,7 +32,7 @@ def _get_settings() -> Settings:
 @lru_cache(maxsize=1)
 def _get_evidence_vectorstore() -> AzureSearch:
     s = _get_settings()
-    return AzureSearch(
+    store = AzureSearch(
         azure_search_endpoint=s.AZURE_SEARCH_ENDPOINT,
         azure_search_key=s.AZURE_SEARCH_ADMIN_KEY,
         index_name=s.EVIDENCE_INDEX_NAME,
@@ -31,8 +40,32 @@ def _get_evidence_vectorstore() -> AzureSearch:
         content_key="content_text",
         vector_field_name="embedding",
     )
+    # AzureSearch builds its own client; rebind it to the shared pool.
+    store.client = SearchClient(
+        endpoint=s.AZURE_SEARCH_ENDPOINT,
+        index_name=s.EVIDENCE_INDEX_NAME,
+        credential=AzureKeyCredential(s.AZURE_SEARCH_ADMIN_KEY),
+        transport=get_azure_transport(s.AZURE_SEARCH_ENDPOINT),
+    )
+    return store
+
+
+def collapse_chunks(hits: list[dict], top_k: int) -> list[dict]:
+    """Keep the best-scoring chunk of each evidence file, up to ``top_k`` files."""
+    best: dict[str, dict] = {}
+    for item in hits:
+        parent = str(
+            item.get("parent_evidence_id") or item.get("id") or item.get("source") or len(best)
+        )
+        current = best.get(parent)
+        if current is None or item["@search.score"] > current["@search.score"]:
+            best[parent] = item
+    ranked = sorted(best.values(), key=lambda item: item["@search.score"], reverse=True)
+    return ranked[:top_k]
 
 
+@cached_retrieval("evidence")
+@resilient_search("evidence.search")
 def search_evidence(
     query: str,
     case_id: str,
@@ -41,6 +74,7 @@ def search_evidence(
     """Semantic search over evidence documents scoped to a specific case.
 
     Returns the evidence most relevant to the query, not all evidence for the case.
+    Each file appears once, with the text of its best-matching chunk.
     """
     logger.info("[EVIDENCE] search query=%r case_id=%r top_k=%d", query, case_id, top_k)
     safe_case_id = case_id.replace("'", "''")
@@ -48,7 +82,7 @@ def search_evidence(
 
     docs_with_scores = _get_evidence_vectorstore().similarity_search_with_relevance_scores(
         query,
-        k=top_k,
+        k=top_k * _CHUNK_OVERFETCH,
         filters=filter_expression,
     )
 
@@ -59,8 +93,9 @@ def search_evidence(
         item["@search.score"] = score
         results.append(item)
 
+    results = collapse_chunks(results, top_k)
     logger.info("[EVIDENCE] search returned %d hits", len(results))
     return results
 
 
-__all__ = ["search_evidence"]
+__all__ = ["collapse_chunks", "search_evidence"]
@@ -6,15 +6,22 @@ content_text, source, section_title, cosolve_phase, and their own embedding.
 from __future__ import annotations
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Optional
+from typing import Iterator, Optional
 
 from azure.core.credentials import AzureKeyCredential
 from azure.search.documents import SearchClient
 from langchain_community.vectorstores.azuresearch import AzureSearch
 
 from backend.core.config import Settings
+from backend.core.http_transport import get_azure_transport
 from backend.knowledge.embeddings import get_embeddings
+from backend.knowledge.passages import best_passage
+from backend.storage.index_pointer import resolve_index_name
+from backend.knowledge.resilience import resilient_search
+from backend.knowledge.retrieval_cache import bump_generation, cached_retrieval
 
 logger = logging.getLogger("knowledge_search_client")
 
@@ -24,19 +31,31 @@ def _get_settings() -> Settings:
     return Settings()
 
 
-@lru_cache(maxsize=1)
-def _get_knowledge_vectorstore() -> AzureSearch:
+@lru_cache(maxsize=4)
+def _knowledge_vectorstore_for(index_name: str) -> AzureSearch:
     s = _get_settings()
-    return AzureSearch(
+    store = AzureSearch(
         azure_search_endpoint=s.AZURE_SEARCH_ENDPOINT,
         azure_search_key=s.AZURE_SEARCH_ADMIN_KEY,
-        index_name=s.KNOWLEDGE_INDEX_NAME,
+        index_name=index_name,
         embedding_function=get_embeddings().embed_query,
         content_key="content_text",
         vector_field_name="embedding",
     )
+    # AzureSearch builds its own client; rebind it to the shared pool.
+    store.client = _knowledge_search_client_for(index_name)
+    return store
 
 
+def _get_knowledge_vectorstore() -> AzureSearch:
+    """VectorStore bound to the currently active knowledge index."""
+    return _knowledge_vectorstore_for(
+        resolve_index_name(_get_settings().KNOWLEDGE_INDEX_NAME)
+    )
+
+
+@cached_retrieval("knowledge")
+@resilient_search("knowledge.hybrid_search")
 def hybrid_search_knowledge(
     query: str,
     top_k: int = 10,
@@ -46,6 +65,8 @@ def hybrid_search_knowledge(
 
     Searches directly on chunk_type='section' documents which contain the full
     content_text, source filename, section_title, page range, and cosolve_phase.
+    Each hit also carries ``passage``: the window of its section most relevant
+    to ``query``, sized for prompts (KNOWLEDGE_PASSAGE_CHARS).
     """
     logger.info("[KNOWLEDGE] hybrid_search query=%r top_k=%d phase=%r", query, top_k, cosolve_phase)
 
@@ -55,6 +76,7 @@ def hybrid_search_knowledge(
         filters.append(f"cosolve_phase eq '{safe_phase}'")
     filter_expression = " and ".join(filters)
 
+    passage_chars = _get_settings().KNOWLEDGE_PASSAGE_CHARS
     docs_with_scores = _get_knowledge_vectorstore().similarity_search_with_relevance_scores(
         query,
         k=top_k,
@@ -65,6 +87,7 @@ def hybrid_search_knowledge(
     for doc, score in docs_with_scores:
         item = dict(doc.metadata)
         item["content_text"] = item.get("content_text") or doc.page_content
+        item["passage"] = best_passage(item["content_text"], query, passage_chars)
         item["@search.score"] = score
         results.append(item)
 
@@ -72,15 +95,154 @@ def hybrid_search_knowledge(
     return results
 
 
-@lru_cache(maxsize=1)
-def _get_knowledge_search_client() -> SearchClient:
-    """Raw SDK client for admin operations (listing, deleting chunks)."""
+@lru_cache(maxsize=4)
+def _knowledge_search_client_for(index_name: str) -> SearchClient:
     s = _get_settings()
     return SearchClient(
         endpoint=s.AZURE_SEARCH_ENDPOINT,
-        index_name=s.KNOWLEDGE_INDEX_NAME,
+        index_name=index_name,
         credential=AzureKeyCredential(s.AZURE_SEARCH_ADMIN_KEY),
+        transport=get_azure_transport(s.AZURE_SEARCH_ENDPOINT),
     )
 
 
-__all__ = ["hybrid_search_knowledge"]
+def _get_knowledge_search_client() -> SearchClient:
+    """Raw SDK client for admin operations (listing, deleting chunks)."""
+    return _knowledge_search_client_for(
+        resolve_index_name(_get_settings().KNOWLEDGE_INDEX_NAME)
+    )
+
+
+# Azure AI Search accepts at most 1000 actions per indexing batch and 1000
+# results per page.
+_PAGE_SIZE = 1000
+_DELETE_BATCH_SIZE = 1000
+_DELETE_MAX_WORKERS = 4
+_DELETE_VERIFY_ATTEMPTS = 5
+_DELETE_VERIFY_DELAY_S = 1.0
+
+
+def _source_filter(source: str) -> str:
+    safe = source.replace("'", "''")
+    return f"source eq '{safe}'"
+
+
+def iter_knowledge_chunks(
+    select: list[str],
+    filter_expression: Optional[str] = None,
+    search_client: Optional[SearchClient] = None,
+) -> Iterator[dict]:
+    """Yield every chunk matching ``filter_expression``, page by page."""
+    client = search_client or _get_knowledge_search_client()
+    skip = 0
+    while True:
+        page = list(
+            client.search(
+                search_text="*",
+                filter=filter_expression,
+                select=select,
+                top=_PAGE_SIZE,
+                skip=skip,
+            )
+        )
+        yield from page
+        if len(page) < _PAGE_SIZE:
+            return
+        skip += _PAGE_SIZE
+
+
+def list_knowledge_chunk_ids(
+    source: str,
+    search_client: Optional[SearchClient] = None,
+) -> list[str]:
+    """Return every doc_id indexed for ``source``, walking all result pages."""
+    doc_ids: list[str] = []
+    seen: set[str] = set()
+    for r in iter_knowledge_chunks(["doc_id"], _source_filter(source), search_client):
+        doc_id = r.get("doc_id")
+        if doc_id and doc_id not in seen:
+            seen.add(doc_id)
+            doc_ids.append(doc_id)
+    return doc_ids
+
+
+def count_knowledge_chunks(
+    source: str,
+    search_client: Optional[SearchClient] = None,
+) -> int:
+    """Return the number of indexed chunks for ``source`` (no documents fetched)."""
+    client = search_client or _get_knowledge_search_client()
+    results = client.search(
+        search_text="*",
+        filter=_source_filter(source),
+        include_total_count=True,
+        top=0,
+    )
+    return int(results.get_count() or 0)
+
+
+def _delete_chunk_ids(client: SearchClient, doc_ids: list[str]) -> int:
+    """Delete ``doc_ids`` in parallel batches; returns the number acknowledged."""
+    batches = [
+        doc_ids[i : i + _DELETE_BATCH_SIZE]
+        for i in range(0, len(doc_ids), _DELETE_BATCH_SIZE)
+    ]
+
+    def _delete_batch(batch: list[str]) -> int:
+        results = client.delete_documents(documents=[{"doc_id": d} for d in batch])
+        return sum(1 for r in results if r.succeeded)
+
+    with ThreadPoolExecutor(max_workers=min(_DELETE_MAX_WORKERS, len(batches))) as pool:
+        return sum(pool.map(_delete_batch, batches))
+
+
+def delete_knowledge_by_source(
+    source: str,
+    search_client: Optional[SearchClient] = None,
+) -> int:
+    """Delete every indexed chunk for ``source`` and return how many were removed.
+
+    Ids are collected across all result pages first (deleting while paging
+    shifts the skip window), then removed in service-sized batches in
+    parallel. The remaining count is re-checked until the index reports zero;
+    RuntimeError is raised if chunks are still present after the retries.
+    """
+    client = search_client or _get_knowledge_search_client()
+    doc_ids = list_knowledge_chunk_ids(source, client)
+    if not doc_ids:
+        return 0
+
+    deleted = _delete_chunk_ids(client, doc_ids)
+    bump_generation("knowledge")
+    logger.info(
+        "[KNOWLEDGE] deleted %d/%d chunk(s) for source=%r",
+        deleted,
+        len(doc_ids),
+        source,
+    )
+
+    # Deletes become visible to queries after a short indexing delay.
+    remaining = count_knowledge_chunks(source, client)
+    for attempt in range(1, _DELETE_VERIFY_ATTEMPTS):
+        if remaining == 0:
+            break
+        time.sleep(_DELETE_VERIFY_DELAY_S * attempt)
+        leftover = list_knowledge_chunk_ids(source, client)
+        if leftover:
+            _delete_chunk_ids(client, leftover)
+        remaining = count_knowledge_chunks(source, client)
+
+    if remaining:
+        raise RuntimeError(
+            f"{remaining} chunk(s) for source {source!r} still present after delete"
+        )
+    return deleted
+
+
+__all__ = [
+    "hybrid_search_knowledge",
+    "iter_knowledge_chunks",
+    "list_knowledge_chunk_ids",
+    "count_knowledge_chunks",
+    "delete_knowledge_by_source",
+]
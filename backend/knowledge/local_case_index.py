@@ -0,0 +1,326 @@
+"""In-process vector replica of the closed cases in the case index.
+
+Closed cases are immutable once ingested, so their embeddings and the few
+fields similarity results need are mirrored to local disk and memory-mapped.
+Queries then cost one matrix-vector product (or a graph lookup for large
+fleets) instead of a network round trip.
+
+Layout under ``directory``:
+    records.json        {"state": {...}, "generation": ..., "records": [...]}
+    vectors-<gen>.npy   float32 (n, dim), L2-normalised so dot == cosine
+    ann-<gen>.bin       optional hnswlib graph, built when n >= ann_threshold
+
+Each write produces a new generation of vector files and then atomically
+replaces records.json, so a mapped file is never overwritten in place (which
+Windows refuses) and readers never see a half-written index. Temporary files
+and generation names are unique per write, and a write only deletes the
+generation it replaced, so processes sharing the directory (a rebuild script
+next to the API) never remove each other's files. The in-memory
+snapshot is swapped as a whole. The hnswlib graph is optional: without the
+package every fleet size uses the NumPy brute-force path.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger("local_case_index")
+
+META_FIELDS = (
+    "case_id",
+    "organization_country",
+    "organization_site",
+    "opening_date",
+    "closure_date",
+    "problem_description",
+    "five_whys_text",
+    "permanent_actions_text",
+    "ai_summary",
+)
+
+_RECORDS_FILE = "records.json"
+
+# The graph is queried for this many times top_k so that country / exclusion
+# filters applied afterwards still leave enough hits.
+_ANN_OVERSAMPLE = 8
+
+
+class _Snapshot:
+    __slots__ = ("generation", "vectors", "records", "case_ids", "countries", "ann")
+
+    def __init__(
+        self, generation: str, vectors: np.ndarray, records: list[dict], ann=None
+    ) -> None:
+        self.generation = generation
+        self.vectors = vectors
+        self.records = records
+        self.case_ids = np.array([r["case_id"] for r in records], dtype=object)
+        self.countries = np.array(
+            [r.get("organization_country") for r in records], dtype=object
+        )
+        self.ann = ann
+
+
+class LocalCaseIndex:
+    """Memory-mapped closed-case vectors with filtered top-k search."""
+
+    def __init__(self, directory: str, ann_threshold: int = 20000) -> None:
+        self._dir = directory
+        self._ann_threshold = ann_threshold
+        self._write_lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self._state: dict = {}
+
+    @property
+    def size(self) -> int:
+        snap = self._snapshot
+        return len(snap.records) if snap is not None else 0
+
+    @property
+    def state(self) -> dict:
+        """``{"source": index name, "watermark": max updated_at}`` of the replica."""
+        return dict(self._state)
+
+    def load(self) -> bool:
+        """Map the on-disk replica, if any. Returns True when one was loaded."""
+        records_path = os.path.join(self._dir, _RECORDS_FILE)
+        if not os.path.exists(records_path):
+            return False
+        with open(records_path, encoding="utf-8") as fh:
+            payload = json.load(fh)
+        generation = payload.get("generation", "")
+        vectors_path = self._vectors_path(generation)
+        if not os.path.exists(vectors_path):
+            logger.warning("[LOCAL_INDEX] %s is missing — ignoring replica", vectors_path)
+            return False
+        vectors = np.load(vectors_path, mmap_mode="r")
+        records = payload.get("records", [])
+        if len(records) != vectors.shape[0]:
+            logger.warning("[LOCAL_INDEX] %s is inconsistent — ignoring", self._dir)
+            return False
+        self._snapshot = _Snapshot(
+            generation, vectors, records, self._load_ann(generation, vectors)
+        )
+        self._state = payload.get("state", {})
+        logger.info("[LOCAL_INDEX] loaded %d closed cases from %s", len(records), self._dir)
+        return True
+
+    def upsert(self, docs: Iterable[dict], state: Optional[dict] = None, replace: bool = False) -> int:
+        """Add or replace cases (keyed by case_id) and persist the replica.
+
+        ``docs`` carry the META_FIELDS plus ``embedding``; documents without
+        an embedding cannot be vector-searched and are skipped. With
+        ``replace`` the existing replica is discarded first.
+        """
+        incoming: dict[str, tuple[dict, list[float]]] = {}
+        for doc in docs:
+            vector = doc.get("embedding")
+            case_id = doc.get("case_id")
+            if not vector or not case_id:
+                continue
+            incoming[str(case_id)] = (
+                {f: doc.get(f) for f in META_FIELDS} | {"case_id": str(case_id)},
+                vector,
+            )
+
+        with self._write_lock:
+            snap = None if replace else self._snapshot
+            records: list[dict] = []
+            rows: list[np.ndarray] = []
+            if snap is not None:
+                keep = [i for i, cid in enumerate(snap.case_ids) if cid not in incoming]
+                records = [snap.records[i] for i in keep]
+                if keep:
+                    rows.append(np.asarray(snap.vectors[keep], dtype=np.float32))
+            if incoming:
+                new_records = [rec for rec, _ in incoming.values()]
+                new_vectors = np.asarray([vec for _, vec in incoming.values()], dtype=np.float32)
+                if rows and rows[0].shape[1] != new_vectors.shape[1]:
+                    raise ValueError(
+                        f"Embedding dimension changed ({rows[0].shape[1]} → "
+                        f"{new_vectors.shape[1]}); resync with replace=True"
+                    )
+                norms = np.linalg.norm(new_vectors, axis=1, keepdims=True)
+                rows.append(new_vectors / np.where(norms == 0, 1, norms))
+                records.extend(new_records)
+            vectors = np.concatenate(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+            new_state = dict(state) if state is not None else dict(self._state)
+            generation = self._persist(vectors, records, new_state)
+            self._state = new_state
+            mapped = np.load(self._vectors_path(generation), mmap_mode="r")
+            replaced = self._snapshot.generation if self._snapshot is not None else None
+            self._snapshot = _Snapshot(
+                generation, mapped, records, self._build_ann(generation, mapped)
+            )
+            if replaced and replaced != generation:
+                self._remove_generation(replaced)
+        logger.info(
+            "[LOCAL_INDEX] upserted %d case(s) — replica now holds %d",
+            len(incoming),
+            len(records),
+        )
+        return len(incoming)
+
+    def sync(
+        self,
+        fetch: Callable[[Optional[str]], Iterable[dict]],
+        source: str,
+    ) -> int:
+        """Pull closed cases changed since the watermark from ``fetch``.
+
+        ``fetch(since)`` yields index documents with ``updated_at`` whose
+        ``updated_at`` is at or after ``since`` (all of them when None).
+        The boundary is inclusive so cases sharing the watermark timestamp
+        are not missed; those already in the replica are dropped here, so a
+        sync with no changes writes nothing. When ``source`` (the physical
+        index) differs from the replica's, the replica is rebuilt from
+        scratch — e.g. after an index swap.
+        """
+        full = self._state.get("source") != source
+        since = None if full else self._state.get("watermark")
+        docs = list(fetch(since))
+        if since and self._snapshot is not None:
+            known = set(self._snapshot.case_ids)
+            docs = [
+                d for d in docs
+                if not (d.get("updated_at") and d["updated_at"] <= since and d.get("case_id") in known)
+            ]
+        watermark = max(
+            [d["updated_at"] for d in docs if d.get("updated_at")] + ([since] if since else []),
+            default=None,
+        )
+        if not docs and not full:
+            return 0
+        return self.upsert(docs, state={"source": source, "watermark": watermark}, replace=full)
+
+    def search(
+        self,
+        vector: list[float],
+        top_k: int,
+        country: Optional[str] = None,
+        exclude_case_id: Optional[str] = None,
+    ) -> list[dict]:
+        """Top-k closed cases by cosine similarity, with optional filters.
+
+        Results mirror the hybrid search hit shape: META_FIELDS plus
+        ``@search.score``.
+        """
+        snap = self._snapshot
+        if snap is None or not snap.records or top_k <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm:
+            query = query / norm
+
+        if snap.ann is not None:
+            hits = self._search_ann(snap, query, top_k, country, exclude_case_id)
+            if len(hits) >= min(top_k, len(snap.records)):
+                return hits
+
+        # Score every row straight off the mapping and mask the scores:
+        # indexing the rows first would copy the selected part of the matrix.
+        scores = snap.vectors @ query
+        n = len(snap.records)
+        if country or exclude_case_id:
+            mask = np.ones(n, dtype=bool)
+            if country:
+                mask &= snap.countries == country
+            if exclude_case_id:
+                mask &= snap.case_ids != exclude_case_id
+            n = int(mask.sum())
+            if n == 0:
+                return []
+            scores[~mask] = -np.inf
+        k = min(top_k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self._hit(snap, int(i), float(scores[i])) for i in top]
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hit(snap: _Snapshot, row: int, score: float) -> dict:
+        item = dict(snap.records[row])
+        item["@search.score"] = score
+        return item
+
+    def _search_ann(self, snap, query, top_k, country, exclude_case_id) -> list[dict]:
+        k = min(len(snap.records), top_k * _ANN_OVERSAMPLE)
+        snap.ann.set_ef(max(k, 64))
+        labels, distances = snap.ann.knn_query(query, k=k)
+        hits = []
+        for row, dist in zip(labels[0], distances[0]):
+            row = int(row)
+            if country and snap.countries[row] != country:
+                continue
+            if exclude_case_id and snap.case_ids[row] == exclude_case_id:
+                continue
+            hits.append(self._hit(snap, row, 1.0 - float(dist)))
+            if len(hits) == top_k:
+                break
+        return hits
+
+    def _vectors_path(self, generation: str) -> str:
+        return os.path.join(self._dir, f"vectors-{generation}.npy")
+
+    def _ann_path(self, generation: str) -> str:
+        return os.path.join(self._dir, f"ann-{generation}.bin")
+
+    def _persist(self, vectors: np.ndarray, records: list[dict], state: dict) -> str:
+        os.makedirs(self._dir, exist_ok=True)
+        generation = f"{time.time_ns()}-{os.getpid()}"
+        with open(self._vectors_path(generation), "wb") as fh:
+            np.save(fh, vectors)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self._dir, prefix=_RECORDS_FILE, suffix=".tmp", delete=False
+        ) as fh:
+            json.dump({"state": state, "generation": generation, "records": records}, fh)
+        os.replace(fh.name, os.path.join(self._dir, _RECORDS_FILE))
+        return generation
+
+    def _remove_generation(self, generation: str) -> None:
+        """Best-effort removal of a replaced generation (may still be mapped)."""
+        for path in (self._vectors_path(generation), self._ann_path(generation)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _build_ann(self, generation: str, vectors: np.ndarray):
+        if vectors.shape[0] < self._ann_threshold:
+            return None
+        try:
+            import hnswlib
+        except ImportError:
+            logger.info("[LOCAL_INDEX] hnswlib not installed — using brute force")
+            return None
+        ann = hnswlib.Index(space="ip", dim=vectors.shape[1])
+        ann.init_index(max_elements=vectors.shape[0], ef_construction=200, M=16)
+        ann.add_items(np.asarray(vectors), np.arange(vectors.shape[0]))
+        ann.save_index(self._ann_path(generation))
+        return ann
+
+    def _load_ann(self, generation: str, vectors: np.ndarray):
+        path = self._ann_path(generation)
+        if vectors.shape[0] < self._ann_threshold or not os.path.exists(path):
+            return self._build_ann(generation, vectors)
+        try:
+            import hnswlib
+        except ImportError:
+            return None
+        ann = hnswlib.Index(space="ip", dim=vectors.shape[1])
+        ann.load_index(path, max_elements=vectors.shape[0])
+        return ann
+
+
+__all__ = ["META_FIELDS", "LocalCaseIndex"]
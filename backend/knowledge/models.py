@@ -22,6 +22,9 @@ class CaseSummary(BaseModel):
     responsible_leader: Optional[str] = None
     department: Optional[str] = None
     discipline_completed: Optional[list] = None
+    # Retrieval relevance (@search.score / cosine) when the case came from a
+    # similarity search; used by the prompt re-ranker.
+    score: Optional[float] = None
 
 
 class KnowledgeSummary(BaseModel):
@@ -29,6 +32,8 @@ class KnowledgeSummary(BaseModel):
     title: Optional[str] = None
     source: Optional[str] = None
     content_text: Optional[str] = None
+    # Query-relevant window of content_text, used in prompts.
+    passage: Optional[str] = None
     created_at: Optional[datetime] = None
     chunk_type: Optional[str] = None
     section_title: Optional[str] = None
@@ -0,0 +1,102 @@
+"""Query-relevant passage extraction for long knowledge sections.
+
+Sections are stored whole (up to a few thousand characters) but prompts only
+have room for a few hundred per hit. ``best_passage`` picks the run of
+consecutive sentences, within the character budget, that covers the most
+distinct query terms — instead of always taking the head of the section.
+"""
+from __future__ import annotations
+
+import re
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Sentence ends, or blank lines / bullet breaks in extracted PDF text.
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?;:])\s+|\n\s*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how in is it its "
+    "of on or should that the their there this to was what when where which "
+    "who why will with".split()
+)
+
+# Weight of repeated hits relative to a newly covered query term.
+_REPEAT_WEIGHT = 0.1
+
+
+def content_words(text: str) -> list[str]:
+    """Lowercased content words of ``text`` (stopwords and 1-char tokens dropped)."""
+    return [
+        w for w in _WORD_RE.findall(text.lower()) if len(w) > 1 and w not in _STOPWORDS
+    ]
+
+
+def query_terms(text: str) -> set[str]:
+    """Distinct content words of ``text``."""
+    return set(content_words(text))
+
+
+def _sentence_spans(text: str) -> list[tuple[int, int]]:
+    spans = []
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        if match.start() > start:
+            spans.append((start, match.start()))
+        start = match.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+def _clip(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    clipped = text[:max_chars].rsplit(" ", 1)[0]
+    return clipped or text[:max_chars]
+
+
+def best_passage(text: str, query: str, max_chars: int = 600) -> str:
+    """Most query-relevant window of ``text`` that fits in ``max_chars``.
+
+    Windows are runs of whole sentences, scored by the number of distinct
+    query terms they contain plus a small bonus per repeated hit; the
+    earliest best window wins. Falls back to the head of ``text`` when no
+    query term occurs (or the text already fits).
+    """
+    text = (text or "").strip()
+    if len(text) <= max_chars:
+        return text
+    terms = query_terms(query)
+    spans = _sentence_spans(text)
+    if not terms or not spans:
+        return _clip(text, max_chars)
+
+    hits = [
+        [w for w in _WORD_RE.findall(text[s:e].lower()) if w in terms] for s, e in spans
+    ]
+    best_score, best = 0.0, None
+    for i, (start, _) in enumerate(spans):
+        if not hits[i]:
+            continue  # windows start on a matching sentence
+        covered: set[str] = set()
+        repeats = 0
+        j = i
+        while j < len(spans) and (j == i or spans[j][1] - start <= max_chars):
+            for w in hits[j]:
+                if w in covered:
+                    repeats += 1
+                else:
+                    covered.add(w)
+            j += 1
+        score = len(covered) + _REPEAT_WEIGHT * repeats
+        if score > best_score:
+            best_score, best = score, (start, spans[j - 1][1])
+    if best is None:
+        return _clip(text, max_chars)
+
+    start, end = best
+    if start == 0:
+        return _clip(text[:end], max_chars)
+    return "…" + _clip(text[start:end], max_chars - 1)
+
+
+__all__ = ["content_words", "query_terms", "best_passage"]
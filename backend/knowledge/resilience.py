@@ -0,0 +1,367 @@
+"""Deadlines, hedging and circuit breaking for search calls.
+
+``resilient_search(name)`` wraps a read-only search function so that:
+
+- every call has a deadline (SEARCH_DEADLINE_SECONDS), which also caps the
+  SDK's connect / read timeouts, so a timed-out call releases its worker
+  instead of holding it until the transport's own read timeout;
+- when a call is still running after the function's observed p95 latency and
+  a worker is idle, an identical hedge request is sent and whichever answers
+  first wins (the queries are idempotent, so the loser is simply discarded).
+  A call still queued for a worker is never hedged — that would only add to
+  the queue;
+- repeated outages (timeouts, 429 / 5xx, connection failures) open a circuit
+  breaker that fails fast for SEARCH_BREAKER_RESET_SECONDS, then lets a single
+  trial call through.
+
+A call that times out, fails with an outage or hits an open breaker returns a
+*degraded* result instead of raising: the last good result for the same
+arguments if one is known, else an empty list. Degraded results are
+``DegradedList`` instances, which ``cached_retrieval`` does not cache. Other
+errors (bad filters, auth) propagate unchanged. Callers that reshape results
+(the tools map hits into plain lists) collect degradation with
+``track_degraded`` instead.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import copy
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, Optional, TypeVar
+
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+
+from backend.core.config import settings
+from backend.core.http_transport import request_deadline
+from backend.core.llm_scheduler import is_retryable
+from backend.utils.ttl_cache import MISSING, TTLCache
+
+logger = logging.getLogger("search_resilience")
+
+_F = TypeVar("_F", bound=Callable)
+
+# Latency samples kept per function, and how many are needed before hedging.
+_LATENCY_SAMPLES = 200
+_MIN_SAMPLES_FOR_HEDGE = 20
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_in_flight = 0  # submitted and not yet finished (queued or running)
+_guards: dict[str, "_Guard"] = {}
+# Names of the searches degraded inside the innermost ``track_degraded`` block.
+_degraded_searches: contextvars.ContextVar[Optional[list[str]]] = contextvars.ContextVar(
+    "degraded_searches", default=None
+)
+
+
+class DegradedList(list):
+    """Fallback search result returned instead of raising on an outage."""
+
+    degraded = True
+
+
+class SearchDeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextlib.contextmanager
+def track_degraded() -> Iterator[list[str]]:
+    """Collect the names of the searches that return a degraded result in this block."""
+    names: list[str] = []
+    token = _degraded_searches.set(names)
+    try:
+        yield names
+    finally:
+        _degraded_searches.reset(token)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.SEARCH_RESILIENCE_WORKERS,
+                thread_name_prefix="search",
+            )
+        return _executor
+
+
+def _task_done(_future: Future) -> None:
+    global _in_flight
+    with _executor_lock:
+        _in_flight -= 1
+
+
+def _submit(call: Callable[[], tuple]) -> Future:
+    global _in_flight
+    executor = _get_executor()
+    with _executor_lock:
+        _in_flight += 1
+    future = executor.submit(call)
+    future.add_done_callback(_task_done)
+    return future
+
+
+def _has_idle_worker() -> bool:
+    with _executor_lock:
+        return _in_flight < settings.SEARCH_RESILIENCE_WORKERS
+
+
+def is_outage(exc: BaseException) -> bool:
+    """Timeouts, throttling, server errors and connection failures."""
+    return isinstance(
+        exc, (SearchDeadlineExceeded, ServiceRequestError, ServiceResponseError)
+    ) or is_retryable(exc)
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed → open → half-open (one trial) → closed."""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._threshold = failure_threshold
+        self._reset = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self._reset:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now (claims the trial slot when half-open)."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self._reset or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self._threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def record_ignored(self) -> None:
+        """Release a trial slot for a call that neither proved nor disproved health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class _Guard:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.breaker = CircuitBreaker(
+            settings.SEARCH_BREAKER_FAILURES, settings.SEARCH_BREAKER_RESET_SECONDS
+        )
+        self.last_good = TTLCache(maxsize=256, ttl_seconds=settings.SEARCH_STALE_TTL_SECONDS)
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.short_circuits = 0
+        self.degraded = 0
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < _MIN_SAMPLES_FOR_HEDGE:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def stats(self) -> dict:
+        p95 = self.p95()
+        return {
+            "breaker": self.breaker.state,
+            "p95_ms": round(1000 * p95, 1) if p95 is not None else None,
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedges_skipped": self.hedges_skipped,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+            "degraded": self.degraded,
+        }
+
+
+def _timed(
+    fn: Callable, args: tuple, kwargs: dict, deadline: float
+) -> tuple[Callable[[], tuple], threading.Event]:
+    """``fn`` bound to the caller's context and deadline, and its started flag."""
+    context = contextvars.copy_context()
+    started = threading.Event()
+
+    def call():
+        with request_deadline(deadline):
+            return fn(*args, **kwargs)
+
+    def run() -> tuple:
+        started.set()
+        start = time.monotonic()
+        result = context.copy().run(call)
+        return result, time.monotonic() - start
+
+    return run, started
+
+
+def _call_with_hedge(guard: _Guard, fn: Callable, args: tuple, kwargs: dict, hedge: bool):
+    deadline = time.monotonic() + settings.SEARCH_DEADLINE_SECONDS
+    call, started = _timed(fn, args, kwargs, deadline)
+    primary = _submit(call)
+    pending: set[Future] = {primary}
+
+    p95 = guard.p95() if hedge and settings.SEARCH_HEDGING_ENABLED else None
+    if p95 is not None:
+        hedge_delay = max(p95, settings.SEARCH_HEDGE_MIN_SECONDS)
+        done, _ = wait(pending, timeout=min(hedge_delay, deadline - time.monotonic()))
+        if not done and time.monotonic() < deadline:
+            # A queued primary is not slow, just waiting; and a hedge that has
+            # to queue too would only make that worse.
+            if started.is_set() and _has_idle_worker():
+                guard.hedges += 1
+                pending.add(_submit(_timed(fn, args, kwargs, deadline)[0]))
+            else:
+                guard.hedges_skipped += 1
+
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(
+            pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED
+        )
+        if not done:
+            break
+        for future in done:
+            exc = future.exception()
+            if exc is None:
+                result, latency = future.result()
+                guard.observe(latency)
+                if future is not primary:
+                    guard.hedge_wins += 1
+                return result
+            error = exc
+    if error is not None and not pending:
+        raise error
+    for future in pending:
+        future.cancel()  # drops calls still queued; running ones end at the deadline
+    raise SearchDeadlineExceeded(
+        f"{guard.name} exceeded {settings.SEARCH_DEADLINE_SECONDS:.1f}s deadline"
+    )
+
+
+def resilient_search(
+    name: str,
+    hedge: bool = True,
+    fallback: Callable[[], list] = list,
+) -> Callable[[_F], _F]:
+    """Guard a read-only, list-returning search function (see module docstring).
+
+    Apply it *inside* ``cached_retrieval`` so degraded results are not cached.
+    """
+
+    def decorator(fn: _F) -> _F:
+        signature = inspect.signature(fn)
+        guard = _guards[name] = _Guard(name)
+
+        def degrade(key, reason: str) -> DegradedList:
+            guard.degraded += 1
+            tracked = _degraded_searches.get()
+            if tracked is not None:
+                tracked.append(name)
+            stale = MISSING
+            if key is not None:
+                try:
+                    stale = guard.last_good.get(key)
+                except TypeError:
+                    pass
+            logger.warning(
+                "[SEARCH] %s degraded (%s), serving %s",
+                name, reason, "stale result" if stale is not MISSING else "fallback",
+            )
+            return DegradedList(copy.deepcopy(stale) if stale is not MISSING else fallback())
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not settings.SEARCH_RESILIENCE_ENABLED:
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.items())
+            guard.calls += 1
+            if not guard.breaker.allow():
+                guard.short_circuits += 1
+                return degrade(key, "circuit open")
+            try:
+                result = _call_with_hedge(guard, fn, args, kwargs, hedge)
+            except Exception as exc:
+                if not is_outage(exc):
+                    guard.breaker.record_ignored()
+                    raise
+                if isinstance(exc, SearchDeadlineExceeded):
+                    guard.timeouts += 1
+                else:
+                    guard.failures += 1
+                guard.breaker.record_failure()
+                return degrade(key, type(exc).__name__)
+            guard.breaker.record_success()
+            try:
+                guard.last_good.put(key, copy.deepcopy(result))
+            except TypeError:  # unhashable argument — no stale fallback
+                pass
+            return result
+
+        wrapper.guard = guard
+        return wrapper
+
+    return decorator
+
+
+def resilience_stats() -> dict[str, dict]:
+    return {name: guard.stats() for name, guard in sorted(_guards.items())}
+
+
+__all__ = [
+    "DegradedList",
+    "SearchDeadlineExceeded",
+    "CircuitBreaker",
+    "is_outage",
+    "resilient_search",
+    "resilience_stats",
+    "track_degraded",
+]
@@ -0,0 +1,153 @@
+"""Retrieval result cache with write-driven invalidation.
+
+Search functions decorated with ``cached_retrieval(domain)`` memoise their
+results per normalised call arguments in a TTL + LRU cache. Every key also
+carries the current *generation* of its domain ("case", "evidence",
+"knowledge"); the ingestion services call ``bump_generation`` after each
+write, so all earlier entries of that domain stop matching at once and age
+out of the LRU. The TTL bounds staleness for writes made by other processes
+(rebuild scripts, seeders), which cannot bump this process's counters.
+
+Each bump is also recorded in the shared counters of ``index_generations``
+(when blob storage is configured). ``shared_generations`` returns those for
+caches that outlive the process or are shared between workers, such as the
+answer cache.
+"""
+from __future__ import annotations
+
+import copy
+import functools
+import inspect
+import logging
+import threading
+import uuid
+from typing import Callable, TypeVar
+
+from backend.core.config import settings
+from backend.storage.index_generations import get_index_generations
+from backend.utils.ttl_cache import MISSING, TTLCache
+
+logger = logging.getLogger("retrieval_cache")
+
+DOMAINS = ("case", "evidence", "knowledge")
+
+_F = TypeVar("_F", bound=Callable)
+
+_generation_lock = threading.Lock()
+_generations: dict[str, int] = {domain: 0 for domain in DOMAINS}
+_caches: dict[str, TTLCache] = {}
+# Tags local generations, which restart at 0 with every process.
+_BOOT_ID = uuid.uuid4().hex
+# Domains whose latest write this process could not record in the shared
+# counters; until a later shared bump succeeds, keys also carry the local ones.
+_unshared: set[str] = set()
+
+
+def bump_generation(domain: str) -> int:
+    """Invalidate every cached result of ``domain``; returns the new generation."""
+    if domain not in _generations:
+        raise ValueError(f"Unknown retrieval domain {domain!r}")
+    with _generation_lock:
+        _generations[domain] += 1
+        bumped = _generations[domain]
+    try:
+        shared = get_index_generations()
+        if shared is not None:
+            shared.bump(domain)
+    except Exception as exc:
+        with _generation_lock:
+            _unshared.add(domain)
+        logger.warning("[RETRIEVAL_CACHE] shared generation bump failed for %s: %s", domain, exc)
+    else:
+        with _generation_lock:
+            _unshared.discard(domain)
+    return bumped
+
+
+def generation(domain: str) -> int:
+    return _generations[domain]
+
+
+def shared_generations() -> tuple:
+    """Generations of all domains that hold across processes and restarts.
+
+    Without blob storage (or before its counters could first be read) this
+    is the local generations tagged with a per-process id, so nothing keyed
+    on it is ever reused by another process. The same tag is appended while
+    a write of this process is missing from the shared counters, so its own
+    cached answers still stop matching at once.
+    """
+    local = (_BOOT_ID, tuple(generation(d) for d in DOMAINS))
+    try:
+        shared = get_index_generations()
+        if shared is not None:
+            counters = shared.current()
+            generations = tuple(int(counters.get(d, 0)) for d in DOMAINS)
+            return generations + (local,) if _unshared else generations
+    except Exception as exc:
+        logger.warning("[RETRIEVAL_CACHE] shared generations unavailable: %s", exc)
+    return local
+
+
+def cached_retrieval(domain: str) -> Callable[[_F], _F]:
+    """Cache a search function's results, keyed by its bound arguments."""
+    if domain not in _generations:
+        raise ValueError(f"Unknown retrieval domain {domain!r}")
+
+    def decorator(fn: _F) -> _F:
+        signature = inspect.signature(fn)
+        cache = TTLCache(
+            maxsize=settings.RETRIEVAL_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.RETRIEVAL_CACHE_TTL_SECONDS,
+        )
+        _caches[f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"] = cache
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not settings.RETRIEVAL_CACHE_ENABLED:
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (generation(domain), tuple(bound.arguments.items()))
+            try:
+                cached = cache.get(key)
+            except TypeError:  # unhashable argument — do not cache
+                return fn(*args, **kwargs)
+            if cached is not MISSING:
+                return copy.deepcopy(cached)
+            result = fn(*args, **kwargs)
+            if getattr(result, "degraded", False):
+                return result  # outage fallback (see resilience.py): do not cache
+            cache.put(key, result)
+            return copy.deepcopy(result)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> dict:
+    """Per-function hit ratios plus the current domain generations."""
+    return {
+        "enabled": settings.RETRIEVAL_CACHE_ENABLED,
+        "generations": dict(_generations),
+        "caches": {name: cache.stats() for name, cache in sorted(_caches.items())},
+    }
+
+
+def clear_retrieval_caches() -> None:
+    for cache in _caches.values():
+        cache.clear()
+    logger.info("[RETRIEVAL_CACHE] cleared %d cache(s)", len(_caches))
+
+
+__all__ = [
+    "DOMAINS",
+    "bump_generation",
+    "generation",
+    "shared_generations",
+    "cached_retrieval",
+    "cache_stats",
+    "clear_retrieval_caches",
+]
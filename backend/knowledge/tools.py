@@ -5,10 +5,11 @@ KPITool class dissolved — get_kpis() is the public API.
 """
 from __future__ import annotations
 
+import functools
 import logging
 from datetime import datetime, timedelta, timezone
 from functools import lru_cache
-from typing import Any, List, Literal, Optional
+from typing import Any, Callable, List, Literal, Optional
 
 from langchain_core.tools import tool
 
@@ -16,12 +17,16 @@ from backend.core.config import Settings
 from backend.core.models import KPIResult
 from backend.knowledge.case_search_client import (
     filtered_search_cases,
+    get_case_document,
     hybrid_search_cases,
+    local_similar_cases,
 )
 from backend.knowledge.evidence_search_client import search_evidence as _search_evidence_fn
 from backend.knowledge.knowledge_search_client import hybrid_search_knowledge
 from backend.knowledge.models import CaseSummary, EvidenceSummary, KnowledgeSummary
-from backend.storage.blob_storage import CaseReadRepository
+from backend.knowledge.resilience import track_degraded
+from backend.storage.blob_storage import BlobStorageClient, CaseReadRepository
+from backend.storage.case_neighbours import CaseNeighbourStore
 
 _logger = logging.getLogger("tools")
 
@@ -41,6 +46,59 @@ def _get_settings() -> Settings:
 KNOWLEDGE_MIN_SCORE = 0.5
 
 
+# Index fields each tool maps into CaseSummary. Passed as ``select`` so the
+# search service only returns (and we only deserialise) what is used.
+SIMILAR_CASE_FIELDS = (
+    "case_id",
+    "organization_country",
+    "organization_site",
+    "opening_date",
+    "closure_date",
+    "problem_description",
+    "five_whys_text",
+    "permanent_actions_text",
+    "ai_summary",
+)
+KPI_CASE_FIELDS = (
+    "case_id",
+    "status",
+    "current_stage",
+    "opening_date",
+    "closure_date",
+    "problem_description",
+    "organization_country",
+    "organization_site",
+    "organization_unit",
+    "ai_summary",
+    "team_members",
+    "discipline_completed",
+)
+
+
+# ---------------------------------------------------------------------------
+# Node decorator — NOT a @tool
+# ---------------------------------------------------------------------------
+
+def flags_degraded_retrieval(node: Callable[..., dict]) -> Callable[..., dict]:
+    """Mark a node's state update when any search it ran served a degraded result.
+
+    The tools map search hits into plain lists, which drops the
+    ``DegradedList`` marker, so the node records ``retrieval_degraded`` in the
+    graph state instead; the answer cache does not store such results.
+    """
+
+    @functools.wraps(node)
+    def wrapper(*args, **kwargs) -> dict:
+        with track_degraded() as degraded:
+            update = node(*args, **kwargs)
+        if degraded:
+            _logger.warning("Retrieval degraded in %s: %s", node.__name__, ", ".join(degraded))
+            update = {**update, "retrieval_degraded": True}
+        return update
+
+    return wrapper
+
+
 # ---------------------------------------------------------------------------
 # Private helper — NOT a @tool
 # ---------------------------------------------------------------------------
@@ -105,11 +163,24 @@ def search_similar_cases(
             "top_k": effective_top_k,
         },
     )
-    raw_results = hybrid_search_cases(
-        query=query,
-        filter_expression=filter_expression,
-        top_k=effective_top_k,
-    )
+    raw_results = None
+    try:
+        # Closed cases are immutable — answer from the local replica when ready.
+        raw_results = local_similar_cases(
+            query,
+            top_k=effective_top_k,
+            country=country,
+            exclude_case_id=current_case_id,
+        )
+    except Exception as exc:
+        _logger.warning("Local similar-case search failed, using index: %s", exc)
+    if raw_results is None:
+        raw_results = hybrid_search_cases(
+            query=query,
+            filter_expression=filter_expression,
+            top_k=effective_top_k,
+            select=SIMILAR_CASE_FIELDS,
+        )
 
     mapped: list[CaseSummary] = []
     for item in raw_results:
@@ -127,11 +198,64 @@ def search_similar_cases(
                 five_whys_text=item.get("five_whys_text"),
                 permanent_actions_text=item.get("permanent_actions_text"),
                 ai_summary=item.get("ai_summary"),
+                score=item.get("@search.score"),
             )
         )
     return mapped
 
 
+@lru_cache(maxsize=1)
+def _get_neighbour_store() -> CaseNeighbourStore:
+    s = _get_settings()
+    return CaseNeighbourStore(
+        BlobStorageClient(s.AZURE_STORAGE_CONNECTION_STRING, s.AZURE_STORAGE_CONTAINER),
+        top_n=s.CASE_NEIGHBOURS_TOP_N,
+    )
+
+
+def get_case_neighbours(
+    case_id: str,
+    country: Optional[str] = None,
+    top_k: Optional[int] = None,
+) -> Optional[list[CaseSummary]]:
+    """Precomputed similar closed cases for a closed case — one blob read.
+
+    Returns None when no list has been computed for ``case_id`` (open case,
+    not yet backfilled, or read failure) so callers fall back to
+    ``search_similar_cases``.
+    """
+    effective_top_k = (
+        top_k if top_k is not None else _get_settings().RETRIEVAL_SIMILAR_CASES_TOP_K
+    )
+    try:
+        entries = _get_neighbour_store().neighbours(case_id, country, effective_top_k)
+    except Exception as exc:
+        _logger.warning("Neighbour lookup failed for %s: %s", case_id, exc)
+        return None
+    if entries is None:
+        return None
+    _logger.info(
+        "Loaded precomputed neighbours",
+        extra={"case_id": case_id, "country": country, "count": len(entries)},
+    )
+    return [
+        CaseSummary(
+            case_id=str(e.get("case_id")),
+            organization_country=e.get("organization_country"),
+            organization_site=e.get("organization_site"),
+            opening_date=e.get("opening_date"),
+            closure_date=e.get("closure_date"),
+            problem_description=e.get("problem_description"),
+            five_whys_text=e.get("five_whys_text"),
+            permanent_actions_text=e.get("permanent_actions_text"),
+            ai_summary=e.get("ai_summary"),
+            score=e.get("score"),
+        )
+        for e in entries
+        if e.get("case_id")
+    ]
+
+
 @tool
 def search_cases_for_pattern_analysis(
     query: str,
@@ -165,6 +289,7 @@ def search_cases_for_pattern_analysis(
         query=query,
         filter_expression=filter_expression,
         top_k=effective_top_k,
+        select=SIMILAR_CASE_FIELDS,
     )
 
     mapped: list[CaseSummary] = []
@@ -183,6 +308,7 @@ def search_cases_for_pattern_analysis(
                 five_whys_text=item.get("five_whys_text"),
                 permanent_actions_text=item.get("permanent_actions_text"),
                 ai_summary=item.get("ai_summary"),
+                score=item.get("@search.score"),
             )
         )
     _logger.info(
@@ -215,6 +341,7 @@ def search_cases_for_kpi(
     raw_results = filtered_search_cases(
         filter_expression=filter_expression,
         top_k=effective_top_k,
+        select=KPI_CASE_FIELDS,
     )
 
     return [
@@ -244,6 +371,7 @@ def search_active_cases_for_kpi(
     raw_results = filtered_search_cases(
         filter_expression=filter_expression,
         top_k=top_k,
+        select=KPI_CASE_FIELDS,
     )
     return [
         _map_case_summary(item) for item in raw_results if item.get("case_id")
@@ -257,14 +385,10 @@ def search_case_by_id(
     """Retrieve a single case by case_id for case-scope KPI analysis.
     Use when the question targets a specific known case ID.
     Returns a single CaseSummary or None if not found."""
-    safe_id = case_id.replace("'", "''")
-    raw_results = filtered_search_cases(
-        filter_expression=f"case_id eq '{safe_id}'",
-        top_k=1,
-    )
-    if not raw_results:
+    document = get_case_document(case_id, select=KPI_CASE_FIELDS)
+    if document is None:
         return None
-    return _map_case_summary(raw_results[0])
+    return _map_case_summary(document)
 
 
 @tool
@@ -303,6 +427,7 @@ def search_knowledge_base(
                 title=item.get("title"),
                 source=item.get("source"),
                 content_text=item.get("content_text"),
+                passage=item.get("passage"),
                 created_at=item.get("created_at"),
                 chunk_type=item.get("chunk_type"),
                 section_title=item.get("section_title"),
@@ -448,6 +573,7 @@ def _retrieve_cases_for_kpi(country: Optional[str]) -> list[CaseSummary]:
     raw_results = filtered_search_cases(
         filter_expression=filter_expression,
         top_k=effective_top_k,
+        select=KPI_CASE_FIELDS,
     )
     return [_map_case_summary(item) for item in raw_results if item.get("case_id")]
 
@@ -461,19 +587,16 @@ def _retrieve_active_cases_for_kpi(country: Optional[str], top_k: int = 200) ->
     raw_results = filtered_search_cases(
         filter_expression=filter_expression,
         top_k=top_k,
+        select=KPI_CASE_FIELDS,
     )
     return [_map_case_summary(item) for item in raw_results if item.get("case_id")]
 
 
 def _retrieve_case_by_id(case_id: str) -> Optional[CaseSummary]:
-    safe_id = case_id.replace("'", "''")
-    raw_results = filtered_search_cases(
-        filter_expression=f"case_id eq '{safe_id}'",
-        top_k=1,
-    )
-    if not raw_results:
+    document = get_case_document(case_id, select=KPI_CASE_FIELDS)
+    if document is None:
         return None
-    return _map_case_summary(raw_results[0])
+    return _map_case_summary(document)
 
 
 # ── Pure metric helpers ───────────────────────────────────────────────────
@@ -913,7 +1036,10 @@ def get_kpis(
 
 
 __all__ = [
+    "SIMILAR_CASE_FIELDS",
+    "KPI_CASE_FIELDS",
     "search_similar_cases",
+    "get_case_neighbours",
     "search_cases_for_pattern_analysis",
     "search_cases_for_kpi",
     "search_active_cases_for_kpi",
@@ -922,4 +1048,5 @@ __all__ = [
     "search_evidence",
     "KNOWLEDGE_MIN_SCORE",
     "get_kpis",
+    "flags_degraded_retrieval",
 ]
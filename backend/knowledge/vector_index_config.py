@@ -0,0 +1,129 @@
+"""HNSW and vector-compression configuration for the search index schemas.
+
+Both rebuild scripts build their ``VectorSearch`` section here so that m,
+efConstruction, efSearch, the similarity metric and optional scalar
+quantization can be tuned per index (CASE_* / KNOWLEDGE_* settings) and
+compared with ``scripts/bench_vector_index.py`` before a swap.
+"""
+from __future__ import annotations
+
+from azure.search.documents.indexes.models import (
+    HnswAlgorithmConfiguration,
+    HnswParameters,
+    RescoringOptions,
+    ScalarQuantizationCompression,
+    ScalarQuantizationParameters,
+    VectorSearch,
+    VectorSearchProfile,
+)
+
+from backend.core.config import settings
+
+METRICS = ("cosine", "euclidean", "dotProduct")
+QUANTIZATIONS = ("none", "scalar")
+
+# Candidates fetched from the int8 graph per requested neighbour before the
+# full-precision rescoring pass (only used with scalar quantization).
+_RESCORE_OVERSAMPLING = 4.0
+
+
+def hnsw_params(kind: str) -> dict:
+    """Configured vector parameters for ``kind`` ('case' or 'knowledge')."""
+    prefix = kind.upper()
+    return {
+        "m": getattr(settings, f"{prefix}_HNSW_M"),
+        "ef_construction": getattr(settings, f"{prefix}_HNSW_EF_CONSTRUCTION"),
+        "ef_search": getattr(settings, f"{prefix}_HNSW_EF_SEARCH"),
+        "metric": getattr(settings, f"{prefix}_VECTOR_METRIC"),
+        "quantization": getattr(settings, f"{prefix}_VECTOR_QUANTIZATION"),
+    }
+
+
+def add_vector_arguments(parser) -> None:
+    """Add per-run overrides of the configured vector parameters to a CLI."""
+    group = parser.add_argument_group("vector index (defaults from settings)")
+    group.add_argument("--hnsw-m", dest="m", type=int)
+    group.add_argument("--ef-construction", type=int)
+    group.add_argument("--ef-search", type=int)
+    group.add_argument("--metric", choices=METRICS)
+    group.add_argument("--quantization", choices=QUANTIZATIONS)
+
+
+def vector_params_from_args(args, kind: str) -> dict:
+    """Configured parameters for ``kind`` with any CLI overrides applied."""
+    params = hnsw_params(kind)
+    for key in params:
+        value = getattr(args, key, None)
+        if value is not None:
+            params[key] = value
+    return params
+
+
+def build_vector_search(
+    algorithm_name: str,
+    profile_name: str,
+    m: int = 4,
+    ef_construction: int = 400,
+    ef_search: int = 500,
+    metric: str = "cosine",
+    quantization: str = "none",
+) -> VectorSearch:
+    """One HNSW algorithm + profile, with int8 scalar quantization on request.
+
+    Defaults are the service defaults, so an untuned index is unchanged.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unsupported vector metric {metric!r}; expected one of {METRICS}")
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(
+            f"Unsupported quantization {quantization!r}; expected one of {QUANTIZATIONS}"
+        )
+    if not 4 <= m <= 10:
+        raise ValueError("HNSW m must be between 4 and 10")
+    if not 100 <= ef_construction <= 1000 or not 100 <= ef_search <= 1000:
+        raise ValueError("HNSW efConstruction/efSearch must be between 100 and 1000")
+
+    algorithm = HnswAlgorithmConfiguration(
+        name=algorithm_name,
+        parameters=HnswParameters(
+            m=m,
+            ef_construction=ef_construction,
+            ef_search=ef_search,
+            metric=metric,
+        ),
+    )
+    compressions = []
+    compression_name = None
+    if quantization == "scalar":
+        compression_name = f"{algorithm_name}-sq8"
+        compressions.append(
+            ScalarQuantizationCompression(
+                compression_name=compression_name,
+                parameters=ScalarQuantizationParameters(quantized_data_type="int8"),
+                rescoring_options=RescoringOptions(
+                    enable_rescoring=True,
+                    default_oversampling=_RESCORE_OVERSAMPLING,
+                ),
+            )
+        )
+    return VectorSearch(
+        algorithms=[algorithm],
+        profiles=[
+            VectorSearchProfile(
+                name=profile_name,
+                algorithm_configuration_name=algorithm_name,
+                compression_name=compression_name,
+            )
+        ],
+        compressions=compressions or None,
+    )
+
+
+__all__ = [
+    "METRICS",
+    "QUANTIZATIONS",
+    "hnsw_params",
+    "add_vector_arguments",
+    "vector_params_from_args",
+    "build_vector_search",
+]
@@ -23,6 +23,14 @@ def _get_case_entry_service() -> CaseEntryService:
     return CaseEntryService(repo)
 
 
+def load_case_document(case_id: str) -> dict | None:
+    """The stored case document, or None if the case does not exist."""
+    try:
+        return _get_case_entry_service().get_case(case_id)
+    except FileNotFoundError:
+        return None
+
+
 def context_node(state: IncidentGraphState) -> dict:
     """Load case context from blob storage if a case_id is present."""
     case_id = state.get("case_id")
@@ -36,9 +44,9 @@ def context_node(state: IncidentGraphState) -> dict:
             "_last_node": "context_node",
         }
 
-    try:
-        case_doc = _get_case_entry_service().get_case(case_id)
-    except FileNotFoundError:
+    # The gateway may already have loaded the case (answer-cache version check).
+    case_doc = state.get("case_context") or load_case_document(case_id)
+    if case_doc is None:
         return {
             "case_context": None,
             "current_d_state": None,
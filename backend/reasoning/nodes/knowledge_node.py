@@ -6,8 +6,8 @@ from langchain_core.messages import HumanMessage, SystemMessage
 
 from backend.core.state import IncidentGraphState
 from backend.core.llm import get_llm
-from backend.knowledge.tools import search_knowledge_base
-from backend.reasoning.services.knowledge_formatter import build_refs_block
+from backend.knowledge.tools import flags_degraded_retrieval, search_knowledge_base
+from backend.reasoning.services.knowledge_formatter import build_knowledge_block, build_refs_block
 
 _logger = logging.getLogger("knowledge_node")
 
@@ -24,6 +24,7 @@ _KNOWLEDGE_SYSTEM_PROMPT = (
 )
 
 
+@flags_degraded_retrieval
 def knowledge_node(state: IncidentGraphState) -> dict:
     """Answer document/manual/spec questions from the knowledge index."""
     question = (state.get("question") or "").strip()
@@ -41,12 +42,7 @@ def knowledge_node(state: IncidentGraphState) -> dict:
             "_last_node": "knowledge_node",
         }
 
-    knowledge_block = "\n".join(
-        f"Per {(getattr(item, 'source', None) or getattr(item, 'doc_id', ''))}"
-        f"{(' [' + getattr(item, 'section_title', '') + ']') if getattr(item, 'section_title', None) else ''}: "
-        f"{(getattr(item, 'content_text', '') or '')[:600]}"
-        for item in knowledge_docs
-    )
+    knowledge_block = build_knowledge_block(knowledge_docs)
 
     user_prompt = (
         f"USER QUESTION: {question}\n\n"
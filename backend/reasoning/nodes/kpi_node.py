@@ -4,9 +4,10 @@ from typing import Literal, Optional
 
 from backend.core.state import IncidentGraphState
 from backend.core.models import KPIResult
-from backend.knowledge.tools import get_kpis
+from backend.knowledge.tools import flags_degraded_retrieval, get_kpis
 
 
+@flags_degraded_retrieval
 def kpi_node(state: IncidentGraphState) -> dict:
     """Compute KPI metrics for the scope implied by the intent classification."""
     question = state.get("question", "")
@@ -9,6 +9,8 @@ from backend.core.llm import get_llm
 from langchain_openai import AzureChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from backend.knowledge.tools import (
+    flags_degraded_retrieval,
+    get_case_neighbours,
     search_evidence,
     search_knowledge_base,
     search_similar_cases,
@@ -20,7 +22,8 @@ from backend.reasoning.nodes.node_parsing_utils import (
     is_new_problem_question,
     normalize_d_states,
 )
-from backend.reasoning.services.knowledge_formatter import build_refs_block
+from backend.reasoning.services.case_reranker import select_cases_for_prompt
+from backend.reasoning.services.knowledge_formatter import build_knowledge_block, build_refs_block
 from backend.core.prompts import (
     OPERATIONAL_NEW_PROBLEM_SYSTEM_PROMPT,
     OPERATIONAL_SYSTEM_PROMPT,
@@ -33,6 +36,7 @@ def operational_node(state: IncidentGraphState) -> dict:
     return _run_operational(state, model_name=None)
 
 
+@flags_degraded_retrieval
 def _run_operational(state: IncidentGraphState, model_name: str | None = None) -> dict:
     """Core operational logic shared by operational_node and operational_escalation_node."""
     question = state.get("question", "")
@@ -48,12 +52,7 @@ def _run_operational(state: IncidentGraphState, model_name: str | None = None) -
         {"query": question, "top_k": 4, "cosolve_phase": op_phase}
     )
     if knowledge_docs:
-        knowledge_block = "\n".join(
-            f"Per {(getattr(item, 'source', None) or getattr(item, 'doc_id', ''))}"
-            f"{(' [' + getattr(item, 'section_title', '') + ']') if getattr(item, 'section_title', None) else ''}: "
-            f"{(getattr(item, 'content_text', '') or '')[:600]}"
-            for item in knowledge_docs
-        )
+        knowledge_block = build_knowledge_block(knowledge_docs)
     else:
         knowledge_block = "No relevant knowledge documents found for this case."
 
@@ -102,9 +101,13 @@ def _run_operational(state: IncidentGraphState, model_name: str | None = None) -
 
     # -- Closed-case path --
     if case_status == "closed":
-        supporting_cases = search_similar_cases.invoke(
-            {"query": question, "current_case_id": case_id, "country": _extract_country(case_context)}
-        )
+        country = _extract_country(case_context)
+        supporting_cases = get_case_neighbours(case_id, country)
+        if supporting_cases is None:
+            supporting_cases = search_similar_cases.invoke(
+                {"query": question, "current_case_id": case_id, "country": country}
+            )
+        supporting_cases = select_cases_for_prompt(question, supporting_cases)
         referenced_evidence = search_evidence.invoke({
             "query": state.get("question", ""),
             "case_id": case_id,
@@ -147,6 +150,7 @@ def _run_operational(state: IncidentGraphState, model_name: str | None = None) -
     supporting_cases = search_similar_cases.invoke(
         {"query": question, "current_case_id": case_id, "country": country}
     )
+    supporting_cases = select_cases_for_prompt(question, supporting_cases)
     referenced_evidence = search_evidence.invoke({
         "query": state.get("question", ""),
         "case_id": case_id,
@@ -8,15 +8,22 @@ from backend.core.config import Settings
 from backend.core.llm import get_llm
 from langchain_openai import AzureChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
-from backend.knowledge.tools import search_similar_cases, search_knowledge_base
+from backend.knowledge.tools import (
+    flags_degraded_retrieval,
+    get_case_neighbours,
+    search_knowledge_base,
+    search_similar_cases,
+)
 from backend.reasoning.nodes.node_parsing_utils import (
     extract_similarity_suggestions,
     format_d_states,
 )
-from backend.reasoning.services.knowledge_formatter import build_refs_block
+from backend.reasoning.services.case_reranker import select_cases_for_prompt
+from backend.reasoning.services.knowledge_formatter import build_knowledge_block, build_refs_block
 from backend.core.prompts import SIMILARITY_SYSTEM_PROMPT
 
 
+@flags_degraded_retrieval
 def similarity_node(state: IncidentGraphState) -> dict:
     """Find similar historical cases and extract patterns."""
     question = state.get("question", "")
@@ -26,9 +33,16 @@ def similarity_node(state: IncidentGraphState) -> dict:
 
     llm = get_llm("reasoning", 0.2)
 
-    cases = search_similar_cases.invoke(
-        {"query": question, "current_case_id": case_id, "country": _resolve_country(state)}
-    )
+    country = _resolve_country(state)
+    cases = None
+    if case_id and (case_status or "").lower() == "closed":
+        # Closed cases have their neighbours precomputed at ingest time.
+        cases = get_case_neighbours(case_id, country)
+    if cases is None:
+        cases = search_similar_cases.invoke(
+            {"query": question, "current_case_id": case_id, "country": country}
+        )
+    cases = select_cases_for_prompt(question, cases)
     knowledge_docs = search_knowledge_base.invoke(
         {"query": question, "top_k": 4, "cosolve_phase": "root_cause"}
     )
@@ -49,12 +63,7 @@ def similarity_node(state: IncidentGraphState) -> dict:
         formatted_cases = "No cases retrieved from the knowledge base."
 
     if knowledge_docs:
-        knowledge_block = "\n".join(
-            f"Per {(getattr(item, 'source', None) or getattr(item, 'doc_id', ''))}"
-            f"{(' [' + getattr(item, 'section_title', '') + ']') if getattr(item, 'section_title', None) else ''}: "
-            f"{(getattr(item, 'content_text', '') or '')[:600]}"
-            for item in knowledge_docs
-        )
+        knowledge_block = build_knowledge_block(knowledge_docs)
     else:
         knowledge_block = "No relevant knowledge documents found for this case."
 
@@ -9,8 +9,13 @@ from backend.core.config import Settings
 from backend.core.llm import get_llm
 from langchain_openai import AzureChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
-from backend.knowledge.tools import search_cases_for_pattern_analysis, search_knowledge_base
-from backend.reasoning.services.knowledge_formatter import build_refs_block
+from backend.knowledge.tools import (
+    flags_degraded_retrieval,
+    search_cases_for_pattern_analysis,
+    search_knowledge_base,
+)
+from backend.reasoning.services.case_reranker import select_cases_for_prompt
+from backend.reasoning.services.knowledge_formatter import build_knowledge_block, build_refs_block
 from backend.core.prompts import (
     STRATEGY_SYSTEM_PROMPT,
     STRATEGY_ESCALATION_SYSTEM_PROMPT,
@@ -30,6 +35,7 @@ def strategy_node(state: IncidentGraphState) -> dict:
     return _run_strategy(state, model_name=None)
 
 
+@flags_degraded_retrieval
 def _run_strategy(state: IncidentGraphState, model_name: str | None = None) -> dict:
     """Core strategy logic shared by strategy_node and strategy_escalation_node."""
     question = state.get("question", "")
@@ -64,6 +70,12 @@ def _run_strategy(state: IncidentGraphState, model_name: str | None = None) -> d
     )
     _logger.info("[strategy_node] knowledge retrieval \u2192 %d results", len(knowledge_docs))
 
+    # Rerank only the question's own hits: anchor scores come from other
+    # queries and are not comparable, and anchor cases are there for breadth,
+    # not for matching the question.
+    semantic_cases = select_cases_for_prompt(question, list(semantic_cases))
+    _logger.info("[strategy_node] semantic cases kept for prompt: %d", len(semantic_cases))
+
     # Deduplicate cases by case_id
     seen_ids: set[str] = set()
     all_cases: list = []
@@ -80,12 +92,7 @@ def _run_strategy(state: IncidentGraphState, model_name: str | None = None) -> d
     formatted_cases = json.dumps(
         [_to_dict(c) for c in all_cases], indent=2, default=str,
     )
-    formatted_knowledge = "\n".join(
-        f"Per {(getattr(item, 'source', None) or getattr(item, 'doc_id', ''))}"
-        f"{(' [' + getattr(item, 'section_title', '') + ']') if getattr(item, 'section_title', None) else ''}: "
-        f"{(getattr(item, 'content_text', '') or '')[:600]}"
-        for item in knowledge_docs
-    )
+    formatted_knowledge = build_knowledge_block(knowledge_docs)
 
     # If escalated and a specific section failed, use targeted regeneration prompt
     if strategy_escalated and strategy_fail_section and strategy_response:
@@ -0,0 +1,137 @@
+"""Re-rank retrieved cases before they are serialised into a prompt.
+
+Retrieval returns whatever the index ranked highest, including weakly related
+and near-duplicate cases. ``select_cases_for_prompt`` scores the candidates
+locally (BM25 over the case text, blended with the retrieval score), removes
+redundancy with maximal marginal relevance, and keeps only as many cases as
+fit in a token budget.
+"""
+from __future__ import annotations
+
+import json
+import math
+from collections import Counter
+from typing import Any, Callable, Optional, Sequence
+
+from backend.core.config import settings
+from backend.knowledge.passages import content_words
+from backend.utils.tokens import count_tokens
+
+_TEXT_FIELDS = (
+    "problem_description",
+    "five_whys_text",
+    "permanent_actions_text",
+    "ai_summary",
+)
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+def _field(case: Any, name: str) -> Any:
+    if isinstance(case, dict):
+        return case.get(name)
+    return getattr(case, name, None)
+
+
+def _as_dict(case: Any) -> dict:
+    if isinstance(case, dict):
+        return case
+    try:
+        return dict(case)
+    except Exception:
+        return vars(case)
+
+
+def bm25_scores(query: str, documents: Sequence[list[str]]) -> list[float]:
+    """Okapi BM25 of ``query`` against tokenised ``documents`` (IDF over the set)."""
+    terms = set(content_words(query))
+    n = len(documents)
+    if not terms or not n:
+        return [0.0] * n
+    avg_len = sum(len(d) for d in documents) / n or 1.0
+    df = Counter(t for d in documents for t in set(d) if t in terms)
+    idf = {t: math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5)) for t in df}
+    scores = []
+    for doc in documents:
+        tf = Counter(t for t in doc if t in idf)
+        norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * len(doc) / avg_len)
+        scores.append(
+            sum(idf[t] * f * (_BM25_K1 + 1) / (f + norm) for t, f in tf.items())
+        )
+    return scores
+
+
+def _normalise(values: list[float]) -> list[float]:
+    lo, hi = min(values), max(values)
+    if hi == lo:
+        return [1.0 if hi > 0 else 0.0] * len(values)
+    return [(v - lo) / (hi - lo) for v in values]
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def select_cases_for_prompt(
+    query: str,
+    cases: Sequence[Any],
+    token_budget: Optional[int] = None,
+    max_cases: Optional[int] = None,
+    mmr_lambda: Optional[float] = None,
+    vector_weight: Optional[float] = None,
+    token_counter: Callable[[str], int] = count_tokens,
+) -> list:
+    """Most relevant, mutually diverse ``cases`` that fit in ``token_budget``.
+
+    Relevance is BM25 over the case text, min-max normalised and blended with
+    the normalised retrieval ``score`` (``vector_weight``; ignored when no case
+    has one). Selection is greedy MMR: ``mmr_lambda * relevance - (1 -
+    mmr_lambda) * max Jaccard similarity to already selected cases``. A case is
+    skipped when its JSON would exceed the remaining budget; the first pick is
+    always kept. Returns the selected cases in selection order. Unset knobs
+    default to the PROMPT_CASES_* settings.
+    """
+    if not cases:
+        return []
+    token_budget = settings.PROMPT_CASES_TOKEN_BUDGET if token_budget is None else token_budget
+    mmr_lambda = settings.PROMPT_CASES_MMR_LAMBDA if mmr_lambda is None else mmr_lambda
+    vector_weight = (
+        settings.PROMPT_CASES_VECTOR_WEIGHT if vector_weight is None else vector_weight
+    )
+    tokens = [
+        content_words(" ".join(str(_field(c, f) or "") for f in _TEXT_FIELDS))
+        for c in cases
+    ]
+    relevance = _normalise(bm25_scores(query, tokens))
+    retrieval = [_field(c, "score") for c in cases]
+    if any(s is not None for s in retrieval):
+        vector = _normalise([float(s or 0.0) for s in retrieval])
+        relevance = [
+            (1 - vector_weight) * r + vector_weight * v for r, v in zip(relevance, vector)
+        ]
+    term_sets = [set(t) for t in tokens]
+
+    remaining = list(range(len(cases)))
+    selected: list[int] = []
+    budget = token_budget
+    limit = max_cases or len(cases)
+    while remaining and len(selected) < limit:
+        best = max(
+            remaining,
+            key=lambda i: mmr_lambda * relevance[i]
+            - (1 - mmr_lambda)
+            * max((_jaccard(term_sets[i], term_sets[j]) for j in selected), default=0.0),
+        )
+        remaining.remove(best)
+        cost = token_counter(json.dumps(_as_dict(cases[best]), indent=2, default=str))
+        if selected and cost > budget:
+            continue
+        selected.append(best)
+        budget -= cost
+    return [cases[i] for i in selected]
+
+
+__all__ = ["bm25_scores", "select_cases_for_prompt"]
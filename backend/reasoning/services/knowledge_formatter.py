@@ -6,6 +6,21 @@ from typing import List
 from backend.knowledge.models import KnowledgeSummary
 
 
+def build_knowledge_block(knowledge_docs: List[KnowledgeSummary], max_chars: int = 600) -> str:
+    """Build the "Per <source> [<section>]: <passage>" lines for LLM prompts.
+
+    Uses the query-relevant ``passage`` from the search layer, falling back
+    to the head of ``content_text`` for hits that carry none.
+    """
+    lines = []
+    for item in knowledge_docs:
+        source = getattr(item, "source", None) or getattr(item, "doc_id", "")
+        section = getattr(item, "section_title", None)
+        text = getattr(item, "passage", None) or (getattr(item, "content_text", "") or "")[:max_chars]
+        lines.append(f"Per {source}{f' [{section}]' if section else ''}: {text}")
+    return "\n".join(lines)
+
+
 def build_refs_block(knowledge_docs: List[KnowledgeSummary]) -> str:
     """Build the [KNOWLEDGE REFERENCES] block as pipe-delimited KNOWLEDGEREF lines.
 
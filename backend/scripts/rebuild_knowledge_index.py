@@ -1,6 +1,6 @@
 """
 rebuild_knowledge_index.py — Creates (or updates) knowledge_index_v2 with the
-hierarchical chunking schema.
+hierarchical chunking schema, or rebuilds it with zero downtime.
 
 New fields vs knowledge_index_v1:
   chunk_type         — document_summary | section | small_chunk
@@ -11,15 +11,33 @@ New fields vs knowledge_index_v1:
   cosolve_phase      — diagnose | root_cause | correct | prevent | general
   char_count         — character count of content_text
 
-Run once from project root:
-    python -m backend.scripts.rebuild_knowledge_index
+Zero-downtime rebuild (``--rebuild``): every document under ``knowledge/`` is
+re-ingested in parallel into a versioned shadow index
+(``<KNOWLEDGE_INDEX_NAME>-<UTC timestamp>``); documents uploaded or deleted
+meanwhile are reconciled in a catch-up pass, chunk counts are validated and
+the active-index pointer is swapped. A second catch-up runs once the pointer
+TTL has passed, for changes handled by processes still on the old index. The
+previous index is kept for ``--rollback``.
+
+Run from project root:
+    python -m backend.scripts.rebuild_knowledge_index             # create/update in place
+    python -m backend.scripts.rebuild_knowledge_index --rebuild [--workers 4]
+    python -m backend.scripts.rebuild_knowledge_index --rebuild --no-swap --quantization scalar
+    python -m backend.scripts.rebuild_knowledge_index --activate <index>
+    python -m backend.scripts.rebuild_knowledge_index --rollback
+
+HNSW / quantization parameters default to the KNOWLEDGE_* settings.
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 
 from dotenv import load_dotenv
 
@@ -36,17 +54,25 @@ from azure.core.credentials import AzureKeyCredential
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import (
-    HnswAlgorithmConfiguration,
     SearchField,
     SearchFieldDataType,
     SearchIndex,
     SearchableField,
     SimpleField,
-    VectorSearch,
-    VectorSearchProfile,
 )
 
 from backend.core.config import settings
+from backend.knowledge.vector_index_config import (
+    add_vector_arguments,
+    build_vector_search,
+    hnsw_params,
+    vector_params_from_args,
+)
+from backend.knowledge.knowledge_search_client import delete_knowledge_by_source
+from backend.storage.blob_storage import BlobStorageClient
+from backend.storage.index_pointer import get_index_pointer
+from backend.storage.ingestion.knowledge_ingestion import KnowledgeIngestionService
+from backend.storage.knowledge_catalog import KnowledgeCatalog
 
 logging.basicConfig(
     level=logging.INFO,
@@ -55,7 +81,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-INDEX_NAME = "knowledge_index_v2"
+INDEX_NAME = settings.KNOWLEDGE_INDEX_NAME or "knowledge_index_v2"
+KNOWLEDGE_PREFIX = "knowledge/"
 VECTOR_PROFILE = "knowledge-vector-profile"
 VECTOR_ALGO = "knowledge-hnsw"
 EMBEDDING_DIM = 3072  # text-embedding-3-large
@@ -71,9 +98,11 @@ class KnowledgeIndexBuilder:
             credential=self._credential,
         )
 
-    def build_index(self) -> None:
-        print(f"[knowledge_index] target index: {INDEX_NAME}")
-        logger.info("Target index: %s", INDEX_NAME)
+    def build_index(
+        self, index_name: str = INDEX_NAME, vector_params: dict | None = None
+    ) -> None:
+        print(f"[knowledge_index] target index: {index_name}")
+        logger.info("Target index: %s", index_name)
 
         # ── Collection helper ─────────────────────────────────────────────────
         Coll = SearchFieldDataType.Collection
@@ -160,34 +189,205 @@ class KnowledgeIndexBuilder:
             ),
         ]
 
-        vector_search = VectorSearch(
-            algorithms=[HnswAlgorithmConfiguration(name=VECTOR_ALGO)],
-            profiles=[
-                VectorSearchProfile(
-                    name=VECTOR_PROFILE,
-                    algorithm_configuration_name=VECTOR_ALGO,
-                )
-            ],
+        vector_search = build_vector_search(
+            VECTOR_ALGO, VECTOR_PROFILE, **(vector_params or hnsw_params("knowledge"))
         )
 
         schema = SearchIndex(
-            name=INDEX_NAME, fields=fields, vector_search=vector_search
+            name=index_name, fields=fields, vector_search=vector_search
         )
         self._index_client.create_or_update_index(schema)
-        logger.info("Created / updated index: %s", INDEX_NAME)
+        logger.info("Created / updated index: %s", index_name)
 
-        search_client = SearchClient(
-            endpoint=settings.AZURE_SEARCH_ENDPOINT,
-            index_name=INDEX_NAME,
-            credential=self._credential,
-        )
-        doc_count = search_client.get_document_count()
+        doc_count = self._search_client(index_name).get_document_count()
         print(
-            f"[knowledge_index] SUCCESS — index '{INDEX_NAME}' ready. "
+            f"[knowledge_index] SUCCESS — index '{index_name}' ready. "
             f"Document count: {doc_count}"
         )
-        logger.info("Index '%s' is ready. Document count: %d", INDEX_NAME, doc_count)
+        logger.info("Index '%s' is ready. Document count: %d", index_name, doc_count)
+
+    def rebuild(
+        self,
+        workers: int = 4,
+        min_ratio: float = 0.95,
+        count_timeout_s: float = 60.0,
+        vector_params: dict | None = None,
+        swap: bool = True,
+    ) -> None:
+        """Populate a shadow index from the knowledge blobs and swap it in."""
+        pointer = get_index_pointer()
+        if pointer is None:
+            raise SystemExit("AZURE_STORAGE_CONNECTION_STRING is required for the index pointer.")
+
+        # ── Step 1: shadow index ──────────────────────────────────────────────
+        live_name = pointer.resolve(INDEX_NAME)
+        shadow_name = f"{INDEX_NAME}-{datetime.now(timezone.utc):%Y%m%d%H%M%S}"
+        self.build_index(shadow_name, vector_params)
+        logger.info("Shadow index %s (live: %s)", shadow_name, live_name)
+
+        # ── Step 2: re-ingest every source document in parallel ──────────────
+        blob_client = BlobStorageClient(
+            settings.AZURE_STORAGE_CONNECTION_STRING,
+            settings.AZURE_STORAGE_CONTAINER,
+        )
+        service = KnowledgeIngestionService(
+            blob_client,
+            prefix=KNOWLEDGE_PREFIX,
+            catalog=KnowledgeCatalog(blob_client, knowledge_prefix=KNOWLEDGE_PREFIX),
+            index_name=shadow_name,
+        )
+        shadow_client = self._search_client(shadow_name)
+
+        started_at = datetime.now(timezone.utc)
+        sources = self._list_sources(blob_client)
+        logger.info("Found %d knowledge document(s) to index", len(sources))
+        chunks: dict[str, int] = {}
+        failed = self._populate(service, sources, workers, chunks)
+
+        # ── Step 3: catch up with uploads / deletions made meanwhile ─────────
+        catch_up_at = datetime.now(timezone.utc)
+        current, bad = self._catch_up(blob_client, service, shadow_client, started_at, workers, chunks)
+        failed = (failed | bad) - set(chunks)
+
+        # ── Step 4: validate ─────────────────────────────────────────────────
+        expected = sum(chunks.values())
+        deadline = time.monotonic() + count_timeout_s
+        shadow_count = shadow_client.get_document_count()
+        while shadow_count < expected and time.monotonic() < deadline:
+            time.sleep(2)
+            shadow_count = shadow_client.get_document_count()
+        logger.info(
+            "Shadow %s: %d chunks (expected %d) from %d document(s), %d failed",
+            shadow_name, shadow_count, expected, len(chunks), len(failed),
+        )
+        if shadow_count != expected:
+            raise SystemExit(
+                f"Validation failed: {shadow_count} chunks in {shadow_name}, "
+                f"expected {expected}. Pointer NOT swapped."
+            )
+        if failed and len(chunks) < len(current) * min_ratio:
+            raise SystemExit(
+                f"Validation failed: only {len(chunks)}/{len(current)} documents "
+                f"indexed (min ratio {min_ratio}). Pointer NOT swapped."
+            )
+
+        # ── Step 5: swap — previous index is kept for rollback ───────────────
+        if not swap:
+            print(
+                f"[knowledge_index] '{shadow_name}' validated; pointer left on "
+                f"'{live_name}'. Use --activate {shadow_name} to serve it."
+            )
+            return
+        previous = pointer.swap(INDEX_NAME, shadow_name)
+
+        # ── Step 6: second catch-up once every process sees the new pointer ──
+        # Uploads and deletions handled before the pointer TTL ran out went
+        # to the previous index only.
+        logger.info(
+            "Waiting %.0fs for the pointer to propagate before the final catch-up",
+            settings.INDEX_POINTER_TTL_SECONDS,
+        )
+        time.sleep(settings.INDEX_POINTER_TTL_SECONDS)
+        _, bad = self._catch_up(blob_client, service, shadow_client, catch_up_at, workers, chunks)
+        failed = (failed | bad) - set(chunks)
+        print(
+            f"[knowledge_index] SUCCESS — '{shadow_name}' now serves {INDEX_NAME} "
+            f"(previous: '{previous}', kept for --rollback)"
+        )
+
+    def activate(self, physical_name: str) -> None:
+        pointer = get_index_pointer()
+        if pointer is None:
+            raise SystemExit("AZURE_STORAGE_CONNECTION_STRING is required for the index pointer.")
+        previous = pointer.swap(INDEX_NAME, physical_name)
+        print(f"[knowledge_index] '{physical_name}' now serves {INDEX_NAME} (previous: '{previous}')")
+
+    def rollback(self) -> None:
+        pointer = get_index_pointer()
+        if pointer is None:
+            raise SystemExit("AZURE_STORAGE_CONNECTION_STRING is required for the index pointer.")
+        restored = pointer.rollback(INDEX_NAME)
+        print(f"[knowledge_index] rolled back — '{restored}' now serves {INDEX_NAME}")
+
+    def _search_client(self, index_name: str) -> SearchClient:
+        return SearchClient(
+            endpoint=settings.AZURE_SEARCH_ENDPOINT,
+            index_name=index_name,
+            credential=self._credential,
+        )
+
+    @staticmethod
+    def _list_sources(
+        blob_client: BlobStorageClient, modified_since: datetime | None = None
+    ) -> list[str]:
+        sources = []
+        for f in blob_client.list_files(KNOWLEDGE_PREFIX):
+            if modified_since and datetime.fromisoformat(f["last_modified"]) < modified_since:
+                continue
+            sources.append(f["name"][len(KNOWLEDGE_PREFIX):])
+        return sources
+
+    def _catch_up(
+        self,
+        blob_client: BlobStorageClient,
+        service: KnowledgeIngestionService,
+        shadow_client: SearchClient,
+        since: datetime,
+        workers: int,
+        chunks: dict[str, int],
+    ) -> tuple[list[str], set[str]]:
+        """Re-index sources changed since ``since`` and drop removed ones.
+
+        Returns the current source list and the sources that failed.
+        """
+        current = self._list_sources(blob_client)
+        changed = self._list_sources(blob_client, modified_since=since)
+        removed = [src for src in chunks if src not in current]
+        for source in set(changed) | set(removed):
+            delete_knowledge_by_source(source, shadow_client)
+            chunks.pop(source, None)
+        if not (changed or removed):
+            return current, set()
+        logger.info("Catch-up: %d changed, %d removed since %s", len(changed), len(removed), since)
+        return current, self._populate(service, changed, workers, chunks)
+
+    @staticmethod
+    def _populate(
+        service: KnowledgeIngestionService,
+        sources: list[str],
+        workers: int,
+        chunks: dict[str, int],
+    ) -> set[str]:
+        """Index ``sources`` in parallel, recording chunk counts; returns failures."""
+        failed: set[str] = set()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(service.index_existing_blob, src): src for src in sources}
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    chunks[source] = future.result()
+                except Exception as exc:
+                    logger.error("  ✗ Failed %s: %s", source, exc)
+                    failed.add(source)
+        return failed
 
 
 if __name__ == "__main__":
-    KnowledgeIndexBuilder().build_index()
+    parser = argparse.ArgumentParser(description="Build or rebuild the knowledge index.")
+    parser.add_argument("--rebuild", action="store_true", help="Zero-downtime shadow rebuild + swap.")
+    parser.add_argument("--rollback", action="store_true", help="Re-activate the previous index.")
+    parser.add_argument("--no-swap", action="store_true", help="With --rebuild: build and validate only.")
+    parser.add_argument("--activate", metavar="INDEX", help="Swap the pointer to INDEX.")
+    parser.add_argument("--workers", type=int, default=4)
+    add_vector_arguments(parser)
+    args = parser.parse_args()
+    builder = KnowledgeIndexBuilder()
+    params = vector_params_from_args(args, "knowledge")
+    if args.rollback:
+        builder.rollback()
+    elif args.activate:
+        builder.activate(args.activate)
+    elif args.rebuild:
+        builder.rebuild(workers=args.workers, vector_params=params, swap=not args.no_swap)
+    else:
+        builder.build_index(vector_params=params)
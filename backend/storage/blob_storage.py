@@ -1,17 +1,40 @@
 from __future__ import annotations
 
+import random
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from azure.core import MatchConditions
 from azure.storage.blob import BlobServiceClient
 from azure.storage.blob import ContentSettings
-from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.core.exceptions import (
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+)
 import json
 
+from backend.core.http_transport import blob_host, get_azure_transport
+
+_MAX_WRITE_ATTEMPTS = 8
+# Jittered exponential backoff between conflicting conditional writes.
+_WRITE_BACKOFF_SECONDS = 0.05
+_WRITE_BACKOFF_MAX_SECONDS = 1.0
+
+
+class BlobWriteConflict(RuntimeError):
+    """A read-modify-write lost to other writers on every attempt."""
+
 
 class BlobStorageClient:
 
     def __init__(self, connection_string: str, container: str):
         if not connection_string:
             raise RuntimeError("AZURE_STORAGE_CONNECTION_STRING not configured")
-        self.service = BlobServiceClient.from_connection_string(connection_string)
+        self.service = BlobServiceClient.from_connection_string(
+            connection_string, transport=get_azure_transport(blob_host(connection_string))
+        )
         self.container = self.service.get_container_client(container)
 
     def upload_json(self, path: str, data: str, overwrite: bool = False):
@@ -22,6 +45,69 @@ class BlobStorageClient:
         data: bytes = blob.download_blob().readall()
         return data.decode("utf-8")
 
+    def download_json_with_etag(self, path: str) -> tuple[str, str]:
+        """Return (text, etag) for a JSON blob; raises FileNotFoundError if absent."""
+        try:
+            downloader = self.container.get_blob_client(path).download_blob()
+            data: bytes = downloader.readall()
+        except ResourceNotFoundError:
+            raise FileNotFoundError(f"Blob not found: {path}")
+        return data.decode("utf-8"), downloader.properties.etag
+
+    def upload_json_if_match(self, path: str, data: str, etag: Optional[str]) -> bool:
+        """Optimistic-concurrency write of a JSON blob.
+
+        With an etag the write only succeeds if the blob is unchanged since it
+        was read; with etag=None it only succeeds if the blob does not exist yet.
+        Returns False when another writer got there first.
+        """
+        try:
+            if etag is None:
+                self.container.upload_blob(path, data, overwrite=False)
+            else:
+                self.container.upload_blob(
+                    path,
+                    data,
+                    overwrite=True,
+                    etag=etag,
+                    match_condition=MatchConditions.IfNotModified,
+                )
+        except (ResourceExistsError, ResourceModifiedError):
+            return False
+        return True
+
+    def update_json(
+        self,
+        path: str,
+        apply: Callable[[dict], Optional[bool]],
+        create: bool = True,
+        attempts: int = _MAX_WRITE_ATTEMPTS,
+    ) -> Optional[dict]:
+        """Read-modify-write a JSON blob with ETag concurrency.
+
+        ``apply`` edits the parsed document in place (``{}`` if the blob does
+        not exist yet; with create=False a missing blob is left alone) and may
+        return False to leave the blob unchanged. When another writer got there
+        first, the read and ``apply`` are retried after a jittered backoff.
+        Returns the document written, or None if nothing was written.
+        """
+        for attempt in range(attempts):
+            if attempt:
+                ceiling = min(_WRITE_BACKOFF_MAX_SECONDS, _WRITE_BACKOFF_SECONDS * 2 ** attempt)
+                time.sleep(random.uniform(0, ceiling))
+            try:
+                raw, etag = self.download_json_with_etag(path)
+                doc = json.loads(raw)
+            except FileNotFoundError:
+                if not create:
+                    return None
+                doc, etag = {}, None
+            if apply(doc) is False:
+                return None
+            if self.upload_json_if_match(path, json.dumps(doc, indent=2), etag):
+                return doc
+        raise BlobWriteConflict(f"Update of {path} conflicted {attempts} times")
+
     def exists(self, path: str) -> bool:
         blob = self.container.get_blob_client(path)
         return blob.exists()
@@ -139,6 +225,22 @@ class CaseRepository:
         path = f"{self._case_prefix(case_id)}{filename}"
         return self.blob.download_file(path)
 
+    def _evidence_text_path(self, case_id: str, filename: str) -> str:
+        return f"{case_id}/evidence_text/{filename.strip()}.json"
+
+    def save_evidence_text(self, case_id: str, filename: str, payload: dict) -> None:
+        """Store the extracted-text sidecar for an evidence file."""
+        path = self._evidence_text_path(case_id, filename)
+        self.blob.upload_json(path, json.dumps(payload), overwrite=True)
+
+    def load_evidence_text(self, case_id: str, filename: str) -> Optional[dict]:
+        """Return the extracted-text sidecar, or None if it was never written."""
+        path = self._evidence_text_path(case_id, filename)
+        try:
+            return json.loads(self.blob.download_json(path))
+        except ResourceNotFoundError:
+            return None
+
 
 class CaseReadRepository:
     """Infrastructure repository for reading case JSON documents."""
@@ -149,13 +251,22 @@ class CaseReadRepository:
     def __init__(self, connection_string: str, container_name: str) -> None:
         self._blob_client = BlobStorageClient(connection_string, container_name)
 
-    def list_case_paths(self) -> list[str]:
+    def list_case_paths(self, modified_since: datetime | None = None) -> list[str]:
+        """Paths of every case.json, optionally only those modified since a time."""
         files = self._blob_client.list_files(self.CASES_PREFIX)
-        return [f["name"] for f in files if f["name"].endswith(self.CASE_JSON_SUFFIX)]
+        return [
+            f["name"]
+            for f in files
+            if f["name"].endswith(self.CASE_JSON_SUFFIX)
+            and (
+                modified_since is None
+                or datetime.fromisoformat(f["last_modified"]) >= modified_since
+            )
+        ]
 
     def load_case(self, path: str) -> dict:
         raw = self._blob_client.download_json(path)
         return json.loads(raw)
 
 
-__all__ = ["BlobStorageClient", "CaseRepository", "CaseReadRepository"]
+__all__ = ["BlobStorageClient", "BlobWriteConflict", "CaseRepository", "CaseReadRepository"]
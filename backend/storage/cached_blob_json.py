@@ -0,0 +1,94 @@
+"""A small JSON blob document read through a TTL cache.
+
+Used for the catalog blobs every request consults (the index pointer, the
+shared retrieval generations). Reads are answered from memory and refreshed
+once the TTL has passed; writes go through ``BlobStorageClient.update_json``
+and update the cached copy at once.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from backend.storage.blob_storage import BlobStorageClient
+
+logger = logging.getLogger("cached_blob_json")
+
+# Delay before retrying a document that could not be read.
+_RETRY_BACKOFF_SECONDS = 5.0
+
+
+class CachedBlobJson:
+    """TTL-cached JSON document in a blob, updated with ETag concurrency."""
+
+    def __init__(self, blob_client: BlobStorageClient, path: str, ttl_seconds: float) -> None:
+        self._blob_client = blob_client
+        self._path = path
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._cached: dict = {}
+        self._loaded_at: float | None = None
+        self._next_load_at = 0.0
+
+    def read(self) -> dict:
+        """The cached document (treat as read-only); refreshed after the TTL.
+
+        A failed refresh keeps serving the last document read and is retried
+        after a short backoff; only a failure before the first read raises.
+        The blob is read outside the cache lock, so readers never queue
+        behind a slow refresh.
+        """
+        if time.monotonic() >= self._next_load_at:
+            self._refresh(wait=self._loaded_at is None)
+        with self._lock:
+            return self._cached
+
+    def load(self) -> dict:
+        """The current document, bypassing the cache (``{}`` if absent)."""
+        try:
+            raw, _ = self._blob_client.download_json_with_etag(self._path)
+        except FileNotFoundError:
+            return {}
+        return json.loads(raw)
+
+    def update(self, apply: Callable[[dict], Optional[bool]]) -> Optional[dict]:
+        """Read-modify-write the document (see ``update_json``); caches the result."""
+        written = self._blob_client.update_json(self._path, apply)
+        if written is not None:
+            self._store(written)
+        return written
+
+    def _refresh(self, wait: bool) -> None:
+        # Only the first load blocks; later refreshes are skipped by threads
+        # that find another one already under way.
+        if not self._refresh_lock.acquire(blocking=wait):
+            return
+        try:
+            if time.monotonic() < self._next_load_at:
+                return
+            try:
+                doc = self.load()
+            except Exception as exc:
+                self._next_load_at = time.monotonic() + min(self._ttl, _RETRY_BACKOFF_SECONDS)
+                if self._loaded_at is None:
+                    raise
+                logger.warning(
+                    "[BLOB_JSON] refresh of %s failed, serving last read: %s", self._path, exc
+                )
+                return
+            self._store(doc)
+        finally:
+            self._refresh_lock.release()
+
+    def _store(self, doc: dict) -> None:
+        with self._lock:
+            self._cached = doc
+            self._loaded_at = time.monotonic()
+            self._next_load_at = self._loaded_at + self._ttl
+
+
+__all__ = ["CachedBlobJson"]
@@ -0,0 +1,129 @@
+"""Precomputed nearest closed cases, stored as one blob per case.
+
+``{case_id}/neighbours.json`` holds the top-N most similar closed cases,
+globally and within the case's country. Each entry is denormalised with the
+fields similarity prompts use, so loading a closed case's neighbours is a
+single key lookup. Closed cases are immutable, so the copies never go stale.
+Lists are written when a case closes and patched incrementally (ETag-guarded)
+when a newer case ranks among an existing case's neighbours.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from backend.storage.blob_storage import BlobStorageClient, BlobWriteConflict
+
+logger = logging.getLogger("case_neighbours")
+
+NEIGHBOUR_FIELDS = (
+    "case_id",
+    "organization_country",
+    "organization_site",
+    "opening_date",
+    "closure_date",
+    "problem_description",
+    "five_whys_text",
+    "permanent_actions_text",
+    "ai_summary",
+)
+SCOPES = ("global", "country")
+
+_MAX_WRITE_ATTEMPTS = 5
+
+
+def neighbour_entry(doc: dict, score: float) -> dict:
+    """Project an index document onto a neighbour list entry."""
+    entry = {f: doc.get(f) for f in NEIGHBOUR_FIELDS}
+    entry["score"] = float(score)
+    return entry
+
+
+class CaseNeighbourStore:
+    """Read / write / incrementally patch per-case neighbour lists."""
+
+    def __init__(self, blob_client: BlobStorageClient, top_n: int = 10) -> None:
+        self._blob_client = blob_client
+        self.top_n = top_n
+
+    @staticmethod
+    def _path(case_id: str) -> str:
+        return f"{case_id}/neighbours.json"
+
+    def get(self, case_id: str) -> Optional[dict]:
+        """Stored neighbour document, or None if never computed."""
+        try:
+            raw, _ = self._blob_client.download_json_with_etag(self._path(case_id))
+        except FileNotFoundError:
+            return None
+        return json.loads(raw)
+
+    def neighbours(
+        self, case_id: str, country: Optional[str] = None, top_k: Optional[int] = None
+    ) -> Optional[list[dict]]:
+        """Neighbour entries for ``case_id``; country-scoped when ``country`` is given."""
+        doc = self.get(case_id)
+        if doc is None:
+            return None
+        scope = "country" if country else "global"
+        if country and doc.get("organization_country") != country:
+            return None  # precomputed for a different country
+        entries = doc.get(scope, [])
+        return entries[:top_k] if top_k else entries
+
+    def save(
+        self,
+        case_id: str,
+        country: Optional[str],
+        global_entries: list[dict],
+        country_entries: list[dict],
+    ) -> None:
+        doc = {
+            "case_id": case_id,
+            "organization_country": country,
+            "computed_at": datetime.now(timezone.utc).isoformat(),
+            "top_n": self.top_n,
+            "global": _ranked(global_entries, self.top_n),
+            "country": _ranked(country_entries, self.top_n),
+        }
+        self._blob_client.upload_json(self._path(case_id), json.dumps(doc, indent=2), overwrite=True)
+
+    def offer(self, case_id: str, candidate: dict, scope: str) -> bool:
+        """Insert ``candidate`` into ``case_id``'s ``scope`` list if it ranks.
+
+        Returns True when the stored list changed. Cases whose list was never
+        computed are left alone (the backfill script covers those).
+        """
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown neighbour scope {scope!r}")
+        path = self._path(case_id)
+
+        def _apply(doc: dict) -> bool:
+            current = [e for e in doc.get(scope, []) if e.get("case_id") != candidate["case_id"]]
+            top_n = doc.get("top_n") or self.top_n
+            if len(current) >= top_n and candidate["score"] <= current[-1]["score"]:
+                return False
+            updated = _ranked(current + [candidate], top_n)
+            if updated == doc.get(scope):
+                return False
+            doc[scope] = updated
+            return True
+
+        try:
+            written = self._blob_client.update_json(
+                path, _apply, create=False, attempts=_MAX_WRITE_ATTEMPTS
+            )
+        except BlobWriteConflict:
+            logger.warning(
+                "[NEIGHBOURS] gave up updating %s after %d conflicts", path, _MAX_WRITE_ATTEMPTS
+            )
+            return False
+        return written is not None
+
+def _ranked(entries: list[dict], top_n: int) -> list[dict]:
+    return sorted(entries, key=lambda e: e["score"], reverse=True)[:top_n]
+
+
+__all__ = ["NEIGHBOUR_FIELDS", "SCOPES", "neighbour_entry", "CaseNeighbourStore"]
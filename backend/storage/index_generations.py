@@ -0,0 +1,58 @@
+"""Shared, durable retrieval generations.
+
+Each retrieval domain ("case", "evidence", "knowledge") has a counter in a
+blob next to the index pointer. The ingestion services bump it after every
+write, from any process — API workers, rebuild scripts, seeders — so a cache
+keyed on these counters is invalidated everywhere and stays valid across
+restarts. Readers hold a TTL-cached copy: another process's write is seen
+within INDEX_GENERATIONS_TTL_SECONDS, this process's own writes at once.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+from backend.core.config import settings
+from backend.storage.blob_storage import BlobStorageClient
+from backend.storage.cached_blob_json import CachedBlobJson
+
+
+class IndexGenerations:
+    """Blob-backed map of retrieval domain → generation counter."""
+
+    GENERATIONS_PATH = "_catalog/index_generations.json"
+
+    def __init__(
+        self,
+        blob_client: BlobStorageClient,
+        path: str = GENERATIONS_PATH,
+        ttl_seconds: float = 5.0,
+    ) -> None:
+        self._doc = CachedBlobJson(blob_client, path, ttl_seconds)
+
+    def current(self) -> dict[str, int]:
+        """Return the generation counters (TTL-cached; see ``CachedBlobJson.read``)."""
+        return dict(self._doc.read())
+
+    def bump(self, domain: str) -> int:
+        """Increment ``domain``'s counter; returns the new generation."""
+
+        def _apply(counters: dict[str, int]) -> None:
+            counters[domain] = int(counters.get(domain, 0)) + 1
+
+        return self._doc.update(_apply)[domain]
+
+
+@lru_cache(maxsize=1)
+def get_index_generations() -> Optional[IndexGenerations]:
+    """Process-wide counters, or None when blob storage is not configured."""
+    if not settings.AZURE_STORAGE_CONNECTION_STRING:
+        return None
+    blob_client = BlobStorageClient(
+        settings.AZURE_STORAGE_CONNECTION_STRING,
+        settings.AZURE_STORAGE_CONTAINER,
+    )
+    return IndexGenerations(blob_client, ttl_seconds=settings.INDEX_GENERATIONS_TTL_SECONDS)
+
+
+__all__ = ["IndexGenerations", "get_index_generations"]
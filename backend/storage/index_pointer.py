@@ -0,0 +1,126 @@
+"""Active-index pointer for zero-downtime search index rebuilds.
+
+Settings name each search index by a stable *logical* name (CASE_INDEX_NAME,
+KNOWLEDGE_INDEX_NAME). The rebuild scripts populate a versioned shadow index
+(e.g. ``case_index_v3-20260101120000``) and then swap a pointer blob so that
+every reader and writer resolves the logical name to the new physical index.
+The previous physical index is kept — and recorded — for rollback.
+
+Without a pointer entry the logical name is used as-is, so existing
+deployments keep working untouched until their first rebuild.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+from backend.core.config import settings
+from backend.storage.blob_storage import BlobStorageClient
+from backend.storage.cached_blob_json import CachedBlobJson
+
+logger = logging.getLogger("index_pointer")
+
+_MAX_HISTORY = 5
+
+
+class IndexPointer:
+    """Blob-backed map of logical index name → active physical index."""
+
+    POINTER_PATH = "_catalog/index_pointers.json"
+
+    def __init__(
+        self,
+        blob_client: BlobStorageClient,
+        path: str = POINTER_PATH,
+        ttl_seconds: float = 30.0,
+    ) -> None:
+        self._doc = CachedBlobJson(blob_client, path, ttl_seconds)
+
+    def resolve(self, logical_name: str) -> str:
+        """Return the active physical index for ``logical_name`` (TTL-cached).
+
+        A failed refresh keeps serving the last mapping read (see
+        ``CachedBlobJson.read``).
+        """
+        entry = self._doc.read().get(logical_name)
+        return (entry or {}).get("active") or logical_name
+
+    def get(self, logical_name: str) -> Optional[dict]:
+        """Return the uncached pointer entry (active, previous, updated_at)."""
+        return self._doc.load().get(logical_name)
+
+    def swap(self, logical_name: str, physical_name: str) -> str:
+        """Point ``logical_name`` at ``physical_name``; returns the previous target."""
+        previous = ""
+
+        def _apply(entries: dict[str, dict]) -> None:
+            nonlocal previous
+            entry = entries.get(logical_name) or {}
+            previous = entry.get("active") or logical_name
+            history = [previous] + [
+                p for p in entry.get("previous", []) if p not in (previous, physical_name)
+            ]
+            entries[logical_name] = {
+                "active": physical_name,
+                "previous": history[:_MAX_HISTORY],
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+        self._doc.update(_apply)
+        logger.info("[INDEX_POINTER] %s: %s → %s", logical_name, previous, physical_name)
+        return previous
+
+    def rollback(self, logical_name: str) -> str:
+        """Re-activate the most recent previous index; returns its name."""
+        restored = ""
+
+        def _apply(entries: dict[str, dict]) -> None:
+            nonlocal restored
+            entry = entries.get(logical_name) or {}
+            history = list(entry.get("previous", []))
+            if not history:
+                raise RuntimeError(f"No previous index recorded for {logical_name!r}")
+            restored = history.pop(0)
+            entries[logical_name] = {
+                "active": restored,
+                "previous": history,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+        self._doc.update(_apply)
+        logger.info("[INDEX_POINTER] %s rolled back to %s", logical_name, restored)
+        return restored
+
+
+@lru_cache(maxsize=1)
+def get_index_pointer() -> Optional[IndexPointer]:
+    """Process-wide pointer, or None when blob storage is not configured."""
+    if not settings.AZURE_STORAGE_CONNECTION_STRING:
+        return None
+    blob_client = BlobStorageClient(
+        settings.AZURE_STORAGE_CONNECTION_STRING,
+        settings.AZURE_STORAGE_CONTAINER,
+    )
+    return IndexPointer(blob_client, ttl_seconds=settings.INDEX_POINTER_TTL_SECONDS)
+
+
+def resolve_index_name(logical_name: str) -> str:
+    """Map a logical index name to the active physical index.
+
+    Once the pointer has been read, a storage hiccup keeps the last known
+    mapping. Only if it has never been read does this fall back to the
+    logical name, so search is never taken down.
+    """
+    try:
+        pointer = get_index_pointer()
+        if pointer is None:
+            return logical_name
+        return pointer.resolve(logical_name)
+    except Exception as exc:
+        logger.warning("[INDEX_POINTER] resolve failed for %s: %s", logical_name, exc)
+        return logical_name
+
+
+__all__ = ["IndexPointer", "get_index_pointer", "resolve_index_name"]
@@ -12,35 +12,71 @@ from azure.core.exceptions import ResourceNotFoundError
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import SearchIndex
+from azure.search.documents.models import VectorizedQuery
 
 from backend.core.config import settings
+from backend.core.http_transport import get_azure_transport
 from backend.storage.incident_models import (
     IncidentFactory,
     LegacyCaseModel,
     IncidentStateAdapter,
 )
 from backend.knowledge.embeddings import generate_embedding
+from backend.knowledge.retrieval_cache import bump_generation
 from backend.storage.blob_storage import CaseReadRepository, CaseRepository
+from backend.storage.case_neighbours import (
+    NEIGHBOUR_FIELDS,
+    CaseNeighbourStore,
+    neighbour_entry,
+)
+from backend.storage.index_pointer import resolve_index_name
 
 
 class CaseSearchIndex:
-    """Thin adapter over Azure AI Search for case indexing."""
+    """Thin adapter over Azure AI Search for case indexing.
+
+    ``index_name`` is the logical name and is what document keys are built
+    from, so keys stay stable across rebuilds. Writes go to
+    ``target_index_name`` when given (a shadow index being populated), else
+    to the physical index the pointer currently resolves ``index_name`` to
+    when ``follow_pointer`` is set, else to ``index_name`` itself.
+    """
 
-    def __init__(self, endpoint: str, index_name: str, admin_key: str) -> None:
+    def __init__(
+        self,
+        endpoint: str,
+        index_name: str,
+        admin_key: str,
+        target_index_name: str | None = None,
+        follow_pointer: bool = False,
+    ) -> None:
         self._endpoint = endpoint
         self._index_name = index_name
+        self._target_index_name = target_index_name
+        self._follow_pointer = follow_pointer
         self._admin_key = admin_key
         self._credential = AzureKeyCredential(admin_key)
-        self._search_client = SearchClient(
-            endpoint=endpoint,
-            index_name=index_name,
-            credential=self._credential,
-        )
+        self._search_clients: dict[str, SearchClient] = {}
         self._index_client = SearchIndexClient(
             endpoint=endpoint,
             credential=self._credential,
+            transport=get_azure_transport(endpoint),
         )
 
+    @property
+    def _search_client(self) -> SearchClient:
+        name = self.physical_index_name
+        client = self._search_clients.get(name)
+        if client is None:
+            client = SearchClient(
+                endpoint=self._endpoint,
+                index_name=name,
+                credential=self._credential,
+                transport=get_azure_transport(self._endpoint),
+            )
+            self._search_clients[name] = client
+        return client
+
     def get_document(self, doc_id: str) -> dict[str, object]:
         return self._search_client.get_document(key=doc_id)
 
@@ -48,6 +84,14 @@ class CaseSearchIndex:
     def index_name(self) -> str:
         return self._index_name
 
+    @property
+    def physical_index_name(self) -> str:
+        if self._target_index_name:
+            return self._target_index_name
+        if self._follow_pointer:
+            return resolve_index_name(self._index_name)
+        return self._index_name
+
     def get_doc_id_suffix(self) -> str:
         return f"__{self._index_name}"
 
@@ -60,6 +104,27 @@ class CaseSearchIndex:
     def get_index(self, index_name: str) -> SearchIndex:
         return self._index_client.get_index(index_name)
 
+    def get_document_count(self) -> int:
+        return self._search_client.get_document_count()
+
+    def vector_search(
+        self,
+        vector: list[float],
+        top_k: int,
+        filter_expression: str | None = None,
+        select: Iterable[str] | None = None,
+    ) -> list[dict]:
+        """Pure vector KNN over the ``embedding`` field, pre-filtered."""
+        query = VectorizedQuery(vector=vector, k_nearest_neighbors=top_k, fields="embedding")
+        results = self._search_client.search(
+            search_text=None,
+            vector_queries=[query],
+            filter=filter_expression,
+            select=list(select) if select else None,
+            top=top_k,
+        )
+        return [dict(r) for r in results]
+
     def upload_documents(self, documents: list[dict]) -> list:
         if not isinstance(documents, list):
             raise TypeError(
@@ -227,10 +292,12 @@ class CaseIngestionService:
         search_index: CaseSearchIndex,
         case_repository: CaseReadRepository,
         logger: logging.Logger | None = None,
+        neighbour_store: CaseNeighbourStore | None = None,
     ) -> None:
         self._search_index = search_index
         self._case_repository = case_repository
         self._logger = logger or logging.getLogger("case_ingestion")
+        self._neighbour_store = neighbour_store
 
     def ingest_all_closed_cases(self) -> None:
         paths = self._case_repository.list_case_paths()
@@ -309,18 +376,82 @@ class CaseIngestionService:
             return
 
         self._log_outcome("SUCCESS", case_id)
+        bump_generation("case")
+        if document.get("embedding"):
+            self._refresh_neighbours_safely(case_id, document)
 
-    def index_open_case(self, case_id: str) -> None:
-        """Index (or re-index) an open case so it is immediately searchable.
+    def refresh_neighbours(self, case_id: str) -> bool:
+        """(Re)compute the neighbour lists of an already indexed closed case.
 
-        Unlike ``ingest_closed_case`` this method does NOT require the case to
-        be closed — it is called after CREATE_CASE and UPDATE_CASE so the case
-        appears in search results as soon as it is created.  The content_vector
-        is populated opportunistically; if embedding generation fails the
-        document is still indexed so that filter-based searches (e.g. by
-        case_id) work without a vector.
+        Returns False when the case is not indexed as closed, has no vector
+        or no neighbour store is configured.
+        """
+        if self._neighbour_store is None:
+            return False
+        document = self._search_index.try_get_document(self._build_doc_id(case_id))
+        if not document or document.get("status") != "closed" or not document.get("embedding"):
+            return False
+        self._refresh_neighbours(case_id, dict(document))
+        return True
+
+    def _refresh_neighbours_safely(self, case_id: str, document: dict) -> None:
+        if self._neighbour_store is None:
+            return
+        try:
+            self._refresh_neighbours(case_id, document)
+        except Exception as exc:
+            self._logger.warning(
+                "[NEIGHBOURS] refresh failed for %s (non-fatal): %s", case_id, exc
+            )
+
+    def _refresh_neighbours(self, case_id: str, document: dict) -> None:
+        """Store this case's top-N closed neighbours and offer it to theirs."""
+        store = self._neighbour_store
+        vector = document["embedding"]
+        safe_case_id = case_id.replace("'", "''")
+        base_filter = f"status eq 'closed' and case_id ne '{safe_case_id}'"
+        select = [*NEIGHBOUR_FIELDS]
+        global_hits = self._search_index.vector_search(
+            vector, store.top_n, base_filter, select
+        )
+        country = document.get("organization_country")
+        country_hits: list[dict] = []
+        if country:
+            safe_country = country.replace("'", "''")
+            country_filter = f"{base_filter} and organization_country eq '{safe_country}'"
+            country_hits = self._search_index.vector_search(
+                vector, store.top_n, country_filter, select
+            )
+        store.save(
+            case_id,
+            country,
+            [neighbour_entry(h, h["@search.score"]) for h in global_hits],
+            [neighbour_entry(h, h["@search.score"]) for h in country_hits],
+        )
+
+        # Similarity is symmetric: the new case may now rank among its
+        # neighbours' own top-N.
+        patched = 0
+        for scope, hits in (("global", global_hits), ("country", country_hits)):
+            for hit in hits:
+                entry = neighbour_entry(document, hit["@search.score"])
+                if store.offer(str(hit["case_id"]), entry, scope):
+                    patched += 1
+        self._logger.info(
+            "[NEIGHBOURS] %s: %d global / %d country neighbours, %d lists patched",
+            case_id,
+            len(global_hits),
+            len(country_hits),
+            patched,
+        )
+
+    def prepare_index_document(self, case_id: str) -> tuple[dict, str]:
+        """Load and project a case into its index document, without embedding.
+
+        Returns ``(document, embedding_text)`` so callers that index many
+        cases (the index rebuild) can embed texts in batches. Raises
+        RuntimeError when the case cannot be loaded or validated.
         """
-        self._logger.info("[INDEX_OPEN] called for case_id=%s", case_id)
         path = f"{case_id}/case.json"
         try:
             data = self._case_repository.load_case(path)
@@ -341,19 +472,33 @@ class CaseIngestionService:
 
         doc_id = self._build_doc_id(case_id)
         self._logger.info("[INDEX_OPEN] doc_id=%s", doc_id)
-        document = self._build_index_document(case_model.model_dump(), doc_id)
+        case_doc = case_model.model_dump()
+        document = self._build_index_document(case_doc, doc_id)
 
         # _build_index_document appends 'searchable_hash' which is not a field
         # in the Azure Search index schema — remove it before uploading or the
         # entire document upload will be rejected by the service.
         document.pop("searchable_hash", None)
 
-        # Attempt to generate an embedding for richer search; tolerate failure.
-        bm25_text = self._build_embedding_input(
-            self._build_searchable_fields(case_model.model_dump())
-        )
+        bm25_text = self._build_embedding_input(self._build_searchable_fields(case_doc))
         if not bm25_text:
-            bm25_text = self._build_flattened_embedding_text(case_model.model_dump())
+            bm25_text = self._build_flattened_embedding_text(case_doc)
+        return document, bm25_text
+
+    def index_open_case(self, case_id: str) -> None:
+        """Index (or re-index) an open case so it is immediately searchable.
+
+        Unlike ``ingest_closed_case`` this method does NOT require the case to
+        be closed — it is called after CREATE_CASE and UPDATE_CASE so the case
+        appears in search results as soon as it is created.  The content_vector
+        is populated opportunistically; if embedding generation fails the
+        document is still indexed so that filter-based searches (e.g. by
+        case_id) work without a vector.
+        """
+        self._logger.info("[INDEX_OPEN] called for case_id=%s", case_id)
+        document, bm25_text = self.prepare_index_document(case_id)
+
+        # Attempt to generate an embedding for richer search; tolerate failure.
         if bm25_text:
             try:
                 document["embedding"] = generate_embedding(
@@ -377,6 +522,7 @@ class CaseIngestionService:
         )
         try:
             results = self._search_index.merge_or_upload_documents([document])
+            bump_generation("case")
             self._logger.info(
                 "[INDEX_OPEN] upload complete for %s — result item count: %d",
                 case_id,
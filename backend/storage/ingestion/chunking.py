@@ -0,0 +1,97 @@
+"""Bounded text chunking shared by the ingestion services.
+
+Chunks never exceed the size limit and prefer to end on a paragraph, line,
+sentence or word boundary, in that order, so that every piece fits the
+embedding model's input limit without cutting words in half. Size can be
+measured in characters (``split_bounded``) or in tokens of the deployment's
+tiktoken encoding (``split_by_tokens``).
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Sequence
+
+from backend.utils.tokens import DEFAULT_ENCODING, token_offsets
+
+_BOUNDARIES = ("\n\n", "\n", ". ", " ")
+
+
+def _split_units(
+    text: str, starts: Sequence[int], max_units: int, overlap: int
+) -> list[str]:
+    """Core splitter over abstract units (characters or tokens).
+
+    ``starts[i]`` is the char offset where unit i begins, with a trailing
+    sentinel ``starts[n] == len(text)``. A boundary is only accepted in the
+    second half of the window so chunks do not degenerate into fragments.
+    """
+    if max_units <= 0:
+        raise ValueError("max size must be positive")
+    overlap = max(0, min(overlap, max_units // 2))
+    n_units = len(starts) - 1
+    length = len(text)
+
+    chunks: list[str] = []
+    unit = 0
+    char_start = 0
+    while unit < n_units:
+        end_unit = min(unit + max_units, n_units)
+        char_end = starts[end_unit]
+        if end_unit < n_units:
+            floor = starts[unit + max_units // 2]
+            for sep in _BOUNDARIES:
+                cut = text.rfind(sep, max(floor, char_start), char_end)
+                if cut != -1:
+                    char_end = cut + len(sep)
+                    break
+        piece = text[char_start:char_end].strip()
+        if piece:
+            chunks.append(piece)
+        if char_end >= length:
+            break
+
+        # Unit containing the cut; the next window is measured from there.
+        cut_unit = max(bisect_right(starts, char_end) - 1, unit + 1)
+        if overlap:
+            next_unit = max(cut_unit - overlap, unit + 1)
+            # Start the overlap on a word boundary.
+            space = text.find(" ", starts[next_unit], char_end)
+            char_start = space + 1 if space != -1 else starts[next_unit]
+        else:
+            next_unit = cut_unit
+            char_start = char_end
+        unit = next_unit
+    return chunks
+
+
+def split_bounded(text: str, max_chars: int = 4000, overlap: int = 400) -> list[str]:
+    """Split ``text`` into stripped chunks of at most ``max_chars`` characters."""
+    text = text.strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+    return _split_units(text, range(len(text) + 1), max_chars, overlap)
+
+
+def split_by_tokens(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    encoding_name: str = DEFAULT_ENCODING,
+) -> list[str]:
+    """Split ``text`` into stripped chunks of at most ``max_tokens`` tokens.
+
+    The text is encoded once; window edges are mapped back to character
+    offsets so chunks are cut on natural boundaries rather than mid-token.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    decoded, offsets = token_offsets(text, encoding_name)
+    if len(offsets) <= max_tokens:
+        return [text]
+    return _split_units(decoded, offsets + [len(decoded)], max_tokens, overlap_tokens)
+
+
+__all__ = ["split_bounded", "split_by_tokens"]
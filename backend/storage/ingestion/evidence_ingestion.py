@@ -5,22 +5,37 @@ import logging
 from datetime import datetime, timezone
 from functools import lru_cache
 
+from azure.core.credentials import AzureKeyCredential
+from azure.search.documents import SearchClient
 from langchain_community.vectorstores.azuresearch import AzureSearch
 
 from backend.core.config import settings
+from backend.core.http_transport import get_azure_transport
 from backend.storage.blob_storage import CaseRepository
 from backend.knowledge.embeddings import get_embeddings
+from backend.knowledge.retrieval_cache import bump_generation
+from backend.storage.ingestion.chunking import split_by_tokens
+
+_UPLOAD_BATCH_SIZE = 64
 
 
 @lru_cache(maxsize=1)
 def _get_evidence_store() -> AzureSearch:
-    return AzureSearch(
+    store = AzureSearch(
         azure_search_endpoint=settings.AZURE_SEARCH_ENDPOINT,
         azure_search_key=settings.AZURE_SEARCH_ADMIN_KEY,
         index_name=settings.EVIDENCE_INDEX_NAME,
         embedding_function=get_embeddings(),
         search_type="hybrid",
     )
+    # AzureSearch builds its own client; rebind it to the shared pool.
+    store.client = SearchClient(
+        endpoint=settings.AZURE_SEARCH_ENDPOINT,
+        index_name=settings.EVIDENCE_INDEX_NAME,
+        credential=AzureKeyCredential(settings.AZURE_SEARCH_ADMIN_KEY),
+        transport=get_azure_transport(settings.AZURE_SEARCH_ENDPOINT),
+    )
+    return store
 
 
 class EvidenceIngestionService:
@@ -37,26 +52,118 @@ class EvidenceIngestionService:
         self._ensure_case_exists(case_id)
         self.repo.add_evidence(case_id, filename, data, content_type)
         text = self._extract_text(data, content_type, filename)
-        doc_id = self._build_doc_id(case_id, filename)
+        sha256 = hashlib.sha256(data).hexdigest()
+        self._index_evidence_text(case_id, filename, content_type, text, sha256)
+
+    def reindex_evidence(self, case_id: str, filename: str) -> int:
+        """Re-index one evidence file from its cached text; returns the chunk count.
+
+        Falls back to downloading and extracting the original blob only when no
+        sidecar exists (files uploaded before the cache was introduced).
+        """
+        sidecar = self.repo.load_evidence_text(case_id, filename)
+        if sidecar is not None:
+            self._logger.info(f"[EVIDENCE] reindex from cached text: {filename}")
+            return self._index_evidence_text(
+                case_id,
+                filename,
+                sidecar.get("content_type", ""),
+                sidecar.get("text", ""),
+                sidecar.get("sha256", ""),
+                previous=sidecar,
+            )
 
-        self._logger.info(f"[EVIDENCE] uploading to index: doc_id={doc_id}")
+        data, content_type = self.repo.get_evidence(case_id, filename)
+        text = self._extract_text(data, content_type, filename)
+        return self._index_evidence_text(
+            case_id, filename, content_type, text, hashlib.sha256(data).hexdigest()
+        )
+
+    def _index_evidence_text(
+        self,
+        case_id: str,
+        filename: str,
+        content_type: str,
+        text: str,
+        sha256: str,
+        previous: dict | None = None,
+    ) -> int:
+        """Chunk, embed and index evidence text, then refresh the sidecar."""
+        if previous is None:
+            previous = self.repo.load_evidence_text(case_id, filename)
+
+        parent_id = self._build_doc_id(case_id, filename)
+        chunks = split_by_tokens(
+            text,
+            settings.EVIDENCE_CHUNK_TOKENS,
+            settings.EVIDENCE_CHUNK_OVERLAP_TOKENS,
+            settings.TOKENIZER_ENCODING,
+        ) or [""]
+        chunk_ids = [
+            self._build_chunk_id(case_id, filename, idx) for idx in range(len(chunks))
+        ]
+        created_at = datetime.now(timezone.utc).isoformat()
+
+        self._logger.info(
+            f"[EVIDENCE] uploading to index: parent={parent_id} chunks={len(chunks)}"
+        )
 
         try:
-            self._vector_store.add_texts(
-                texts=[text],
-                metadatas=[{
-                    "case_id": case_id,
-                    "evidence_type": content_type,
-                    "source": filename,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                }],
-                ids=[doc_id],
-            )
+            for start in range(0, len(chunks), _UPLOAD_BATCH_SIZE):
+                batch = range(start, min(start + _UPLOAD_BATCH_SIZE, len(chunks)))
+                # add_texts embeds the whole batch in a single embeddings call.
+                self._vector_store.add_texts(
+                    texts=[chunks[i] for i in batch],
+                    metadatas=[
+                        {
+                            "case_id": case_id,
+                            "evidence_type": content_type,
+                            "source": filename,
+                            "created_at": created_at,
+                            "parent_evidence_id": parent_id,
+                            "chunk_index": i,
+                            "chunk_count": len(chunks),
+                        }
+                        for i in batch
+                    ],
+                    ids=[chunk_ids[i] for i in batch],
+                )
         except Exception as e:
             self._logger.error(f"[EVIDENCE] index upload failed: {e}")
+            bump_generation("evidence")  # some batches may have landed
             raise
 
-        self._logger.info(f"[EVIDENCE] indexed successfully: {doc_id}")
+        # Drop chunks left over from a longer previous version, and the
+        # single whole-file document written before evidence was chunked.
+        stale = [parent_id]
+        if previous:
+            stale.extend(
+                self._build_chunk_id(case_id, filename, idx)
+                for idx in range(len(chunks), int(previous.get("chunk_count", 0)))
+            )
+        try:
+            self._vector_store.delete(ids=stale)
+        except Exception as e:
+            self._logger.warning(f"[EVIDENCE] stale chunk cleanup failed: {e}")
+        bump_generation("evidence")
+
+        self.repo.save_evidence_text(
+            case_id,
+            filename,
+            {
+                "source": filename,
+                "content_type": content_type,
+                "sha256": sha256,
+                "extracted_at": created_at,
+                "chunk_count": len(chunks),
+                "text": text,
+            },
+        )
+
+        self._logger.info(
+            f"[EVIDENCE] indexed successfully: {parent_id} ({len(chunks)} chunks)"
+        )
+        return len(chunks)
 
     def list_evidence(self, case_id: str) -> list[dict]:
         self._ensure_case_exists(case_id)
@@ -72,6 +179,10 @@ class EvidenceIngestionService:
         digest = hashlib.sha1(f"{case_id}:{filename}".encode("utf-8")).hexdigest()
         return f"{case_id}__{digest}__{self._index_name}"
 
+    def _build_chunk_id(self, case_id: str, filename: str, chunk_index: int) -> str:
+        digest = hashlib.sha1(f"{case_id}:{filename}".encode("utf-8")).hexdigest()
+        return f"{case_id}__{digest}_{chunk_index:04d}__{self._index_name}"
+
     def _extract_text(self, data: bytes, content_type: str, filename: str = "") -> str:
         if not data:
             return ""
@@ -4,7 +4,6 @@ from datetime import datetime, timezone
 from functools import lru_cache
 import hashlib
 import os
-import re
 import logging
 from io import BytesIO
 from typing import Any
@@ -18,19 +17,46 @@ from azure.search.documents import SearchClient
 from langchain_community.vectorstores.azuresearch import AzureSearch
 
 from backend.core.config import settings
+from backend.core.http_transport import get_azure_transport
 from backend.storage.blob_storage import BlobStorageClient
+from backend.storage.index_pointer import resolve_index_name
+from backend.storage.ingestion.text_processing import (
+    build_small_chunks,
+    detect_cosolve_phase,
+    split_into_sections,
+)
+from backend.storage.knowledge_catalog import (
+    NO_TEXT_PLACEHOLDER,
+    KnowledgeCatalog,
+    build_catalog_entry,
+)
 from backend.knowledge.embeddings import get_embeddings
+from backend.knowledge.retrieval_cache import bump_generation
+from backend.knowledge.knowledge_search_client import delete_knowledge_by_source
 
 
-@lru_cache(maxsize=1)
-def _get_knowledge_store() -> AzureSearch:
-    return AzureSearch(
+@lru_cache(maxsize=4)
+def _get_knowledge_store(index_name: str) -> AzureSearch:
+    store = AzureSearch(
         azure_search_endpoint=settings.AZURE_SEARCH_ENDPOINT,
         azure_search_key=settings.AZURE_SEARCH_ADMIN_KEY,
-        index_name=settings.KNOWLEDGE_INDEX_NAME,
+        index_name=index_name,
         embedding_function=get_embeddings(),
         search_type="hybrid",
     )
+    # AzureSearch builds its own client; rebind it to the shared pool.
+    store.client = _get_admin_search_client(index_name)
+    return store
+
+
+@lru_cache(maxsize=4)
+def _get_admin_search_client(index_name: str) -> SearchClient:
+    return SearchClient(
+        endpoint=settings.AZURE_SEARCH_ENDPOINT,
+        index_name=index_name,
+        credential=AzureKeyCredential(settings.AZURE_SEARCH_ADMIN_KEY),
+        transport=get_azure_transport(settings.AZURE_SEARCH_ENDPOINT),
+    )
 
 
 class KnowledgeIngestionService:
@@ -38,18 +64,30 @@ class KnowledgeIngestionService:
         self,
         blob_client: BlobStorageClient,
         prefix: str = "knowledge/",
+        catalog: KnowledgeCatalog | None = None,
+        index_name: str | None = None,
     ) -> None:
         self._blob_client = blob_client
         self._prefix = prefix
-        self._vector_store = _get_knowledge_store()
-        # Raw SearchClient kept for delete_by_source (no LangChain equivalent)
-        self._search_client = SearchClient(
-            endpoint=settings.AZURE_SEARCH_ENDPOINT,
-            index_name=settings.KNOWLEDGE_INDEX_NAME,
-            credential=AzureKeyCredential(settings.AZURE_SEARCH_ADMIN_KEY),
-        )
+        self._catalog = catalog or KnowledgeCatalog(blob_client, knowledge_prefix=prefix)
+        # Fixed target (a shadow index during rebuild) or None to follow the
+        # active-index pointer for KNOWLEDGE_INDEX_NAME.
+        self._index_name = index_name
         self._logger = logging.getLogger("knowledge_ingestion")
 
+    @property
+    def _physical_index_name(self) -> str:
+        return self._index_name or resolve_index_name(settings.KNOWLEDGE_INDEX_NAME)
+
+    @property
+    def _vector_store(self) -> AzureSearch:
+        return _get_knowledge_store(self._physical_index_name)
+
+    @property
+    def _search_client(self) -> SearchClient:
+        # Raw SearchClient kept for delete_by_source (no LangChain equivalent)
+        return _get_admin_search_client(self._physical_index_name)
+
     def delete_by_source(self, filename: str) -> int:
         """
         Delete all index documents whose source field matches filename.
@@ -57,19 +95,9 @@ class KnowledgeIngestionService:
         """
         deleted = 0
         try:
-            results = self._search_client.search(
-                search_text="*",
-                filter=f"source eq '{filename}'",
-                select=["doc_id"],
-                top=1000,
-            )
-            doc_ids = [r["doc_id"] for r in results if r.get("doc_id")]
-            if doc_ids:
-                delete_batch = [{"doc_id": doc_id} for doc_id in doc_ids]
-                self._search_client.delete_documents(
-                    documents=delete_batch
-                )
-                deleted = len(doc_ids)
+            deleted = delete_knowledge_by_source(filename, self._search_client)
+            if deleted:
+                self._catalog.remove(filename)
                 self._logger.info(
                     "[KNOWLEDGE] Deleted %d existing chunks for '%s' before re-ingestion",
                     deleted,
@@ -86,6 +114,19 @@ class KnowledgeIngestionService:
         self.delete_by_source(filename)
         path = f"{self._prefix}{filename}"
         self._blob_client.upload_file(path, data, content_type, overwrite=True)
+        self.index_document(filename, data, content_type)
+
+    def index_existing_blob(self, filename: str) -> int:
+        """(Re-)index a document already stored under the knowledge prefix.
+
+        Used by the index rebuild to populate a shadow index from the source
+        blobs without re-uploading them. Returns the number of chunks indexed.
+        """
+        data, content_type = self._blob_client.download_file(f"{self._prefix}{filename}")
+        return self.index_document(filename, data, content_type)
+
+    def index_document(self, filename: str, data: bytes, content_type: str) -> int:
+        """Extract, chunk, embed and index ``data``; returns the chunk count."""
         text = self._extract_text(data, content_type, filename)
 
         base_doc_id = self._build_doc_id(filename)
@@ -160,9 +201,25 @@ class KnowledgeIngestionService:
             ],
             ids=[d["doc_id"] for d in all_docs],
         )
+        bump_generation("knowledge")
 
-        # STEP 4 — Log summary
+        # STEP 4 — Record the document in the catalog used by GET /knowledge
         total_small_chunks = len(all_small_chunk_docs)
+        self._catalog.upsert(
+            build_catalog_entry(
+                source=filename,
+                doc_id=base_doc_id,
+                title=filename,
+                created_at=created_at,
+                size_bytes=len(data),
+                content_type=content_type,
+                section_count=len(section_docs),
+                small_chunk_count=total_small_chunks,
+                has_text=text != NO_TEXT_PLACEHOLDER,
+            )
+        )
+
+        # STEP 5 — Log summary
         self._logger.info(
             "[KNOWLEDGE] '%s' → 1 summary + %d sections + %d small chunks",
             filename,
@@ -173,6 +230,7 @@ class KnowledgeIngestionService:
             f"[KNOWLEDGE] '{filename}' → 1 summary + {len(sections)} sections "
             f"+ {total_small_chunks} small chunks"
         )
+        return len(all_docs)
 
     def delete_knowledge_blob(self, filename: str) -> None:
         """Delete an orphaned blob from storage (no index record required)."""
@@ -186,256 +244,17 @@ class KnowledgeIngestionService:
     # ------------------------------------------------------------------
 
     def _split_into_sections(self, text: str, filename: str) -> list[dict]:
-        """Split document text into logical sections.
-
-        STEP 1: heading-based splitting (3+ headings detected).
-        STEP 2: fixed-size 2000-char / 200-char-overlap fallback.
-        """
-        lines = text.splitlines()
-
-        # STEP 1 — Try heading detection
-        heading_indices: list[int] = []
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            if not stripped:
-                continue
-            is_heading = False
-            if re.match(r"^[A-Z][A-Z0-9 \-/&:,\.]{2,79}$", stripped):
-                is_heading = True
-            elif re.match(r"^\d{1,2}(\.\d+)*[\.\s]+\S", stripped):
-                is_heading = True
-            elif len(stripped) < 60:
-                next_line = lines[i + 1] if i + 1 < len(lines) else ""
-                if next_line.strip() == "":
-                    # Additional guards: reject if line contains sentence-ending
-                    # punctuation mid-string or looks like body text
-                    has_sentence_end = bool(re.search(r"[.!?]\s+\S", stripped))
-                    starts_with_lower = stripped[0].islower() if stripped else False
-                    is_conjunction_start = re.match(
-                        r"^(the|a|an|this|that|these|those|if|when|where|"
-                        r"as|by|for|in|on|or|and|but|to|of|with|from)\b",
-                        stripped,
-                        re.IGNORECASE,
-                    )
-                    if (
-                        not has_sentence_end
-                        and not starts_with_lower
-                        and not is_conjunction_start
-                    ):
-                        is_heading = True
-            if is_heading:
-                heading_indices.append(i)
-
-        if len(heading_indices) >= 3:
-            raw_sections: list[dict] = []
-            for n, hi in enumerate(heading_indices):
-                end_line = (
-                    heading_indices[n + 1]
-                    if n + 1 < len(heading_indices)
-                    else len(lines)
-                )
-                content = "\n".join(lines[hi:end_line]).strip()
-                title = lines[hi].strip()
-                if len(title) > 120:
-                    title = title[:120].rsplit(" ", 1)[0]
-                if len(content) < 200:
-                    continue  # likely a TOC entry
-                raw_sections.append(
-                    {
-                        "section_title": title,
-                        "content": content,
-                        "page_start": 0,
-                        "page_end": 0,
-                    }
-                )
-
-            # Sub-split sections exceeding 3000 chars at paragraph breaks
-            sections: list[dict] = []
-            for sec in raw_sections:
-                if len(sec["content"]) <= 3000:
-                    sections.append(sec)
-                else:
-                    content = sec["content"]
-                    start = 0
-                    part_n = 1
-                    while start < len(content):
-                        end = start + 3000
-                        if end >= len(content):
-                            sub = content[start:].strip()
-                            if sub:
-                                label = (
-                                    sec["section_title"]
-                                    if part_n == 1
-                                    else f"{sec['section_title']} (continued)"
-                                )
-                                sections.append(
-                                    {
-                                        "section_title": label,
-                                        "content": sub,
-                                        "page_start": 0,
-                                        "page_end": 0,
-                                    }
-                                )
-                            break
-                        split_at = content.rfind("\n\n", start, end)
-                        if split_at <= start:
-                            split_at = content.rfind("\n", start, end)
-                        if split_at <= start:
-                            split_at = end
-                        sub = content[start:split_at].strip()
-                        if sub:
-                            label = (
-                                sec["section_title"]
-                                if part_n == 1
-                                else f"{sec['section_title']} (continued)"
-                            )
-                            sections.append(
-                                {
-                                    "section_title": label,
-                                    "content": sub,
-                                    "page_start": 0,
-                                    "page_end": 0,
-                                }
-                            )
-                        # advance past the split point, skipping leading whitespace
-                        start = split_at
-                        while start < len(content) and content[start] in (
-                            "\n",
-                            " ",
-                            "\r",
-                        ):
-                            start += 1
-                        part_n += 1
-
-            if sections:
-                return sections
-
-        # STEP 2 — Fallback: fixed-size 2000-char split with 200-char overlap
-        fallback_sections: list[dict] = []
-        start = 0
-        n = 1
-        while start < len(text):
-            end = start + 2000
-            if end >= len(text):
-                chunk = text[start:].strip()
-                if chunk:
-                    fallback_sections.append(
-                        {
-                            "section_title": f"{filename} \u2014 Part {n}",
-                            "content": chunk,
-                            "page_start": 0,
-                            "page_end": 0,
-                        }
-                    )
-                break
-            split_at = text.rfind("\n\n", start, end)
-            if split_at <= start:
-                split_at = text.rfind("\n", start, end)
-            if split_at <= start:
-                split_at = end
-            chunk = text[start:split_at].strip()
-            if chunk:
-                fallback_sections.append(
-                    {
-                        "section_title": f"{filename} \u2014 Part {n}",
-                        "content": chunk,
-                        "page_start": 0,
-                        "page_end": 0,
-                    }
-                )
-            next_start = split_at - 200
-            if next_start <= start:
-                next_start = split_at
-            start = next_start
-            n += 1
-
-        if not fallback_sections:
-            fallback_sections = [
-                {
-                    "section_title": f"{filename} \u2014 Part 1",
-                    "content": text,
-                    "page_start": 0,
-                    "page_end": 0,
-                }
-            ]
-        return fallback_sections
+        return split_into_sections(
+            text,
+            filename,
+            max_section_tokens=settings.KNOWLEDGE_SECTION_MAX_TOKENS,
+            fallback_tokens=settings.KNOWLEDGE_FALLBACK_SECTION_TOKENS,
+            fallback_overlap_tokens=settings.KNOWLEDGE_FALLBACK_OVERLAP_TOKENS,
+            encoding_name=settings.TOKENIZER_ENCODING,
+        )
 
     def _detect_cosolve_phase(self, text: str) -> str:
-        """Tag text with the most relevant CoSolve reasoning phase.
-
-        Returns one of: 'diagnose' | 'root_cause' | 'correct' | 'prevent' | 'general'
-        """
-        lower = text.lower()
-        phase_keywords: dict[str, list[str]] = {
-            "diagnose": [
-                "symptom",
-                "alarm",
-                "temperature",
-                "observed",
-                "detected",
-                "failure",
-                "overheating",
-                "reading",
-                "telemetry",
-                "monitoring",
-                "measurement",
-            ],
-            "root_cause": [
-                "cause",
-                "root cause",
-                "failure mechanism",
-                "why",
-                "analysis",
-                "confirmed",
-                "investigation",
-                "factor",
-                "contributed",
-                "determined",
-                "evidence",
-            ],
-            "correct": [
-                "corrective action",
-                "replacement",
-                "revised",
-                "updated",
-                "repair",
-                "replaced",
-                "implemented",
-                "fixed",
-                "rework",
-                "modification",
-                "action taken",
-            ],
-            "prevent": [
-                "prevention",
-                "systemic",
-                "recurrence",
-                "policy",
-                "procedure",
-                "training",
-                "audit",
-                "qualification",
-                "specification",
-                "standard",
-                "requirement",
-                "incoming inspection",
-                "supplier",
-            ],
-        }
-        scores: dict[str, int] = {phase: 0 for phase in phase_keywords}
-        for phase, keywords in phase_keywords.items():
-            for kw in keywords:
-                if kw in lower:
-                    scores[phase] += 1
-        best_phase = max(scores, key=lambda p: scores[p])
-        if scores[best_phase] == 0:
-            return "general"
-        # Check for tie
-        top_score = scores[best_phase]
-        tied = [p for p, s in scores.items() if s == top_score]
-        if len(tied) > 1:
-            return "general"
-        return best_phase
+        return detect_cosolve_phase(text)
 
     def _build_small_chunks(
         self,
@@ -446,65 +265,17 @@ class KnowledgeIngestionService:
         cosolve_phase: str,
         created_at: str,
     ) -> list[dict]:
-        """Create small_chunk index documents (500 chars, 100-char overlap) from a section."""
-        small_chunks: list[dict] = []
-        text = section_content
-        start = 0
-        idx = 0
-        while start < len(text):
-            end = start + 500
-            if end >= len(text):
-                chunk_text = text[start:].strip()
-                if chunk_text:
-                    small_chunks.append(
-                        {
-                            "doc_id": f"{section_id}_sc_{idx}",
-                            "doc_type": "knowledge",
-                            "title": source,
-                            "content_text": chunk_text,
-                            "source": source,
-                            "version": "1",
-                            "created_at": created_at,
-                            "chunk_type": "small_chunk",
-                            "section_title": section_title,
-                            "parent_section_id": section_id,
-                            "page_start": 0,
-                            "page_end": 0,
-                            "cosolve_phase": cosolve_phase,
-                            "char_count": len(chunk_text),
-                        }
-                    )
-                break
-            split_at = text.rfind(" ", start, end)
-            if split_at <= start:
-                split_at = end
-            chunk_text = text[start:split_at].strip()
-            if chunk_text:
-                small_chunks.append(
-                    {
-                        "doc_id": f"{section_id}_sc_{idx}",
-                        "doc_type": "knowledge",
-                        "title": source,
-                        "content_text": chunk_text,
-                        "source": source,
-                        "version": "1",
-                        "created_at": created_at,
-                        "chunk_type": "small_chunk",
-                        "section_title": section_title,
-                        "parent_section_id": section_id,
-                        "page_start": 0,
-                        "page_end": 0,
-                        "cosolve_phase": cosolve_phase,
-                        "char_count": len(chunk_text),
-                        "embedding": None,
-                    }
-                )
-            next_start = split_at - 100
-            if next_start <= start:
-                next_start = split_at
-            start = next_start
-            idx += 1
-        return small_chunks
+        return build_small_chunks(
+            section_content,
+            section_id,
+            source,
+            section_title,
+            cosolve_phase,
+            created_at,
+            max_tokens=settings.KNOWLEDGE_SMALL_CHUNK_TOKENS,
+            overlap_tokens=settings.KNOWLEDGE_SMALL_CHUNK_OVERLAP_TOKENS,
+            encoding_name=settings.TOKENIZER_ENCODING,
+        )
 
     def _build_doc_id(self, filename: str) -> str:
         digest = hashlib.sha1(filename.encode("utf-8")).hexdigest()
@@ -640,7 +411,7 @@ class KnowledgeIngestionService:
             f"[KNOWLEDGE] WARNING: no extractable text in PDF {filename!r}; "
             "indexing with '[No extractable text]' placeholder"
         )
-        return "[No extractable text]"
+        return NO_TEXT_PLACEHOLDER
 
 
 __all__ = [
@@ -0,0 +1,353 @@
+"""Text processing for knowledge ingestion: section splitting, phase tagging, small chunks.
+
+With no token limits given, output is identical to the original per-line,
+character-sized implementation in KnowledgeIngestionService; this module only
+removes repeated work — patterns are compiled once, cheap character checks run
+before any regex, and the CoSolve keyword table is built once at import.
+Phase tagging stays a plain substring scan per keyword: CPython's native
+substring search beats a regex alternation over the table several times
+over. When token limits are passed, oversized sections, the
+fixed-size fallback and small chunks are sized in tokens instead.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from backend.storage.ingestion.chunking import split_by_tokens
+from backend.utils.tokens import DEFAULT_ENCODING, count_tokens
+
+# Uppercase title ("SAFETY PRECAUTIONS") or numbered heading ("3.2 Torque").
+_HEADING_RE = re.compile(r"[A-Z][A-Z0-9 \-/&:,\.]{2,79}$|\d{1,2}(?:\.\d+)*[\.\s]+\S")
+_SENTENCE_END_RE = re.compile(r"[.!?]\s+\S")
+_CONJUNCTION_START_RE = re.compile(
+    r"(the|a|an|this|that|these|those|if|when|where|"
+    r"as|by|for|in|on|or|and|but|to|of|with|from)\b",
+    re.IGNORECASE,
+)
+# Longest line _HEADING_RE's uppercase branch can match.
+_MAX_UPPER_HEADING_LEN = 80
+
+_MIN_HEADINGS = 3
+_MIN_SECTION_CHARS = 200
+_MAX_TITLE_CHARS = 120
+_MAX_SECTION_CHARS = 3000
+_FALLBACK_CHARS = 2000
+_FALLBACK_OVERLAP = 200
+_SMALL_CHUNK_CHARS = 500
+_SMALL_CHUNK_OVERLAP = 100
+
+COSOLVE_PHASE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "diagnose": (
+        "symptom",
+        "alarm",
+        "temperature",
+        "observed",
+        "detected",
+        "failure",
+        "overheating",
+        "reading",
+        "telemetry",
+        "monitoring",
+        "measurement",
+    ),
+    "root_cause": (
+        "cause",
+        "root cause",
+        "failure mechanism",
+        "why",
+        "analysis",
+        "confirmed",
+        "investigation",
+        "factor",
+        "contributed",
+        "determined",
+        "evidence",
+    ),
+    "correct": (
+        "corrective action",
+        "replacement",
+        "revised",
+        "updated",
+        "repair",
+        "replaced",
+        "implemented",
+        "fixed",
+        "rework",
+        "modification",
+        "action taken",
+    ),
+    "prevent": (
+        "prevention",
+        "systemic",
+        "recurrence",
+        "policy",
+        "procedure",
+        "training",
+        "audit",
+        "qualification",
+        "specification",
+        "standard",
+        "requirement",
+        "incoming inspection",
+        "supplier",
+    ),
+}
+
+
+def _is_heading(stripped: str, next_line: str) -> bool:
+    first = stripped[0]
+    if first.isdigit() or (
+        "A" <= first <= "Z" and len(stripped) <= _MAX_UPPER_HEADING_LEN
+    ):
+        if _HEADING_RE.match(stripped):
+            return True
+    if len(stripped) >= 60 or next_line.strip() != "":
+        return False
+    # Short line followed by a blank line: reject anything that reads like
+    # body text (mid-line sentence end, lowercase or conjunction start).
+    return not (
+        first.islower()
+        or _SENTENCE_END_RE.search(stripped)
+        or _CONJUNCTION_START_RE.match(stripped)
+    )
+
+
+def _section(title: str, content: str) -> dict:
+    return {
+        "section_title": title,
+        "content": content,
+        "page_start": 0,
+        "page_end": 0,
+    }
+
+
+def _split_long_section(title: str, content: str, out: list[dict]) -> None:
+    """Sub-split an oversized section at paragraph (then line) breaks."""
+    length = len(content)
+    start = 0
+    part_n = 1
+    while start < length:
+        end = start + _MAX_SECTION_CHARS
+        label = title if part_n == 1 else f"{title} (continued)"
+        if end >= length:
+            sub = content[start:].strip()
+            if sub:
+                out.append(_section(label, sub))
+            break
+        split_at = content.rfind("\n\n", start, end)
+        if split_at <= start:
+            split_at = content.rfind("\n", start, end)
+        if split_at <= start:
+            split_at = end
+        sub = content[start:split_at].strip()
+        if sub:
+            out.append(_section(label, sub))
+        # advance past the split point, skipping leading whitespace
+        start = split_at
+        while start < length and content[start] in "\n \r":
+            start += 1
+        part_n += 1
+
+
+def _fallback_sections(text: str, filename: str) -> list[dict]:
+    """Fixed-size split with overlap, used when too few headings are found."""
+    sections: list[dict] = []
+    length = len(text)
+    start = 0
+    n = 1
+    while start < length:
+        end = start + _FALLBACK_CHARS
+        title = f"{filename} — Part {n}"
+        if end >= length:
+            chunk = text[start:].strip()
+            if chunk:
+                sections.append(_section(title, chunk))
+            break
+        split_at = text.rfind("\n\n", start, end)
+        if split_at <= start:
+            split_at = text.rfind("\n", start, end)
+        if split_at <= start:
+            split_at = end
+        chunk = text[start:split_at].strip()
+        if chunk:
+            sections.append(_section(title, chunk))
+        next_start = split_at - _FALLBACK_OVERLAP
+        if next_start <= start:
+            next_start = split_at
+        start = next_start
+        n += 1
+
+    if not sections:
+        sections = [_section(f"{filename} — Part 1", text)]
+    return sections
+
+
+def split_into_sections(
+    text: str,
+    filename: str,
+    max_section_tokens: Optional[int] = None,
+    fallback_tokens: Optional[int] = None,
+    fallback_overlap_tokens: int = 0,
+    encoding_name: str = DEFAULT_ENCODING,
+) -> list[dict]:
+    """Split document text into logical sections.
+
+    STEP 1: heading-based splitting (3+ headings detected); sections longer
+            than 3000 chars (or ``max_section_tokens``) are sub-split.
+    STEP 2: fixed-size fallback — 2000 chars / 200-char overlap, or
+            ``fallback_tokens`` / ``fallback_overlap_tokens``.
+    """
+    lines = text.splitlines()
+    n_lines = len(lines)
+
+    # STEP 1 — single pass over the lines collecting heading positions
+    heading_indices: list[int] = []
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        next_line = lines[i + 1] if i + 1 < n_lines else ""
+        if _is_heading(stripped, next_line):
+            heading_indices.append(i)
+
+    if len(heading_indices) >= _MIN_HEADINGS:
+        sections: list[dict] = []
+        bounds = heading_indices[1:] + [n_lines]
+        for hi, end_line in zip(heading_indices, bounds):
+            content = "\n".join(lines[hi:end_line]).strip()
+            if len(content) < _MIN_SECTION_CHARS:
+                continue  # likely a TOC entry
+            title = lines[hi].strip()
+            if len(title) > _MAX_TITLE_CHARS:
+                title = title[:_MAX_TITLE_CHARS].rsplit(" ", 1)[0]
+            if max_section_tokens:
+                if count_tokens(content, encoding_name) <= max_section_tokens:
+                    sections.append(_section(title, content))
+                else:
+                    parts = split_by_tokens(content, max_section_tokens, 0, encoding_name)
+                    for n, part in enumerate(parts):
+                        label = title if n == 0 else f"{title} (continued)"
+                        sections.append(_section(label, part))
+            elif len(content) <= _MAX_SECTION_CHARS:
+                sections.append(_section(title, content))
+            else:
+                _split_long_section(title, content, sections)
+        if sections:
+            return sections
+
+    # STEP 2 — Fallback
+    if fallback_tokens:
+        parts = split_by_tokens(text, fallback_tokens, fallback_overlap_tokens, encoding_name)
+        if not parts:
+            return [_section(f"{filename} — Part 1", text)]
+        return [
+            _section(f"{filename} — Part {n}", part)
+            for n, part in enumerate(parts, start=1)
+        ]
+    return _fallback_sections(text, filename)
+
+
+def detect_cosolve_phase(text: str) -> str:
+    """Tag text with the most relevant CoSolve reasoning phase.
+
+    Returns one of: 'diagnose' | 'root_cause' | 'correct' | 'prevent' | 'general'
+    """
+    lower = text.lower()
+    scores = {
+        phase: sum(kw in lower for kw in keywords)
+        for phase, keywords in COSOLVE_PHASE_KEYWORDS.items()
+    }
+    top_score = max(scores.values())
+    if top_score == 0:
+        return "general"
+    tied = [p for p, s in scores.items() if s == top_score]
+    if len(tied) > 1:
+        return "general"
+    return tied[0]
+
+
+def _small_chunk_doc(
+    idx: int,
+    chunk_text: str,
+    section_id: str,
+    source: str,
+    section_title: str,
+    cosolve_phase: str,
+    created_at: str,
+) -> dict:
+    return {
+        "doc_id": f"{section_id}_sc_{idx}",
+        "doc_type": "knowledge",
+        "title": source,
+        "content_text": chunk_text,
+        "source": source,
+        "version": "1",
+        "created_at": created_at,
+        "chunk_type": "small_chunk",
+        "section_title": section_title,
+        "parent_section_id": section_id,
+        "page_start": 0,
+        "page_end": 0,
+        "cosolve_phase": cosolve_phase,
+        "char_count": len(chunk_text),
+    }
+
+
+def build_small_chunks(
+    section_content: str,
+    section_id: str,
+    source: str,
+    section_title: str,
+    cosolve_phase: str,
+    created_at: str,
+    max_tokens: Optional[int] = None,
+    overlap_tokens: int = 0,
+    encoding_name: str = DEFAULT_ENCODING,
+) -> list[dict]:
+    """Create small_chunk index documents from a section.
+
+    Sized at 500 chars with 100-char overlap, or ``max_tokens`` /
+    ``overlap_tokens`` when a token limit is given.
+    """
+    meta = (section_id, source, section_title, cosolve_phase, created_at)
+    if max_tokens:
+        parts = split_by_tokens(section_content, max_tokens, overlap_tokens, encoding_name)
+        return [_small_chunk_doc(idx, part, *meta) for idx, part in enumerate(parts)]
+
+    small_chunks: list[dict] = []
+    text = section_content
+    length = len(text)
+    start = 0
+    idx = 0
+    while start < length:
+        end = start + _SMALL_CHUNK_CHARS
+        final = end >= length
+        if final:
+            split_at = length
+        else:
+            split_at = text.rfind(" ", start, end)
+            if split_at <= start:
+                split_at = end
+        chunk_text = text[start:split_at].strip()
+        if chunk_text:
+            doc = _small_chunk_doc(idx, chunk_text, *meta)
+            if not final:
+                doc["embedding"] = None
+            small_chunks.append(doc)
+        if final:
+            break
+        next_start = split_at - _SMALL_CHUNK_OVERLAP
+        if next_start <= start:
+            next_start = split_at
+        start = next_start
+        idx += 1
+    return small_chunks
+
+
+__all__ = [
+    "COSOLVE_PHASE_KEYWORDS",
+    "split_into_sections",
+    "detect_cosolve_phase",
+    "build_small_chunks",
+]
@@ -0,0 +1,186 @@
+"""Knowledge document catalog — one row per source file, kept in a blob manifest.
+
+GET /knowledge reads this manifest instead of scanning every chunk in the
+knowledge index. KnowledgeIngestionService upserts a row after indexing and the
+delete route removes it. If the manifest is missing (first run, or deleted by
+hand) it is rebuilt once from the knowledge index and blob listing.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Callable, Optional
+
+from backend.storage.blob_storage import BlobStorageClient
+
+logger = logging.getLogger("knowledge_catalog")
+
+NO_TEXT_PLACEHOLDER = "[No extractable text]"
+
+
+class KnowledgeCatalog:
+    """Blob-backed manifest of knowledge documents, written with ETag concurrency."""
+
+    CATALOG_PATH = "_catalog/knowledge_catalog.json"
+
+    def __init__(
+        self,
+        blob_client: BlobStorageClient,
+        path: str = CATALOG_PATH,
+        knowledge_prefix: str = "knowledge/",
+    ) -> None:
+        self._blob_client = blob_client
+        self._path = path
+        self._knowledge_prefix = knowledge_prefix
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def list_documents(
+        self, offset: int = 0, limit: Optional[int] = None
+    ) -> tuple[int, list[dict]]:
+        """Return (total, page) of catalog rows ordered by source name."""
+        entries = self._load_or_rebuild()
+        rows = [entries[k] for k in sorted(entries, key=str.lower)]
+        offset = max(offset, 0)
+        end = None if limit is None else offset + max(limit, 0)
+        return len(rows), rows[offset:end]
+
+    def get(self, source: str) -> Optional[dict]:
+        return self._load_or_rebuild().get(source)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def upsert(self, entry: dict) -> None:
+        """Insert or replace the row for ``entry["source"]``."""
+        source = entry["source"]
+
+        def _apply(entries: dict[str, dict]) -> None:
+            entries[source] = dict(entry)
+
+        self._mutate(_apply)
+        logger.info("[CATALOG] upserted %r", source)
+
+    def remove(self, source: str) -> bool:
+        """Drop the row for ``source``; returns True if a row was present."""
+        removed = False
+
+        def _apply(entries: dict[str, dict]) -> None:
+            nonlocal removed
+            removed = entries.pop(source, None) is not None
+
+        self._mutate(_apply)
+        if removed:
+            logger.info("[CATALOG] removed %r", source)
+        return removed
+
+    def rebuild(self) -> int:
+        """Recompute the manifest from the knowledge index and blob listing."""
+        entries = self._scan_index()
+        self._mutate(lambda current: (current.clear(), current.update(entries)))
+        logger.info("[CATALOG] rebuilt with %d document(s)", len(entries))
+        return len(entries)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _load(self) -> Optional[dict[str, dict]]:
+        try:
+            raw, _ = self._blob_client.download_json_with_etag(self._path)
+        except FileNotFoundError:
+            return None
+        return json.loads(raw).get("documents", {})
+
+    def _load_or_rebuild(self) -> dict[str, dict]:
+        entries = self._load()
+        if entries is not None:
+            return entries
+        logger.info("[CATALOG] manifest missing — rebuilding from index")
+        self.rebuild()
+        return self._load() or {}
+
+    def _mutate(self, apply: Callable[[dict[str, dict]], object]) -> None:
+        """Read-modify-write the manifest, retrying when another writer wins."""
+        self._blob_client.update_json(
+            self._path, lambda manifest: apply(manifest.setdefault("documents", {}))
+        )
+
+    def _scan_index(self) -> dict[str, dict]:
+        # Imported lazily so the catalog can be constructed without search settings.
+        from backend.knowledge.knowledge_search_client import iter_knowledge_chunks
+
+        blob_meta = {
+            f["name"][len(self._knowledge_prefix):]: f
+            for f in self._blob_client.list_files(self._knowledge_prefix)
+        }
+
+        entries: dict[str, dict] = {}
+        # content_text is deliberately not selected — pages of full section
+        # bodies are slow to transfer. No-text sources come from a filter query.
+        for r in iter_knowledge_chunks(
+            ["doc_id", "title", "source", "created_at", "chunk_type"]
+        ):
+            source = r.get("source") or r.get("title") or r.get("doc_id", "")
+            row = entries.get(source)
+            if row is None:
+                meta = blob_meta.get(source, {})
+                doc_id = r.get("doc_id", "")
+                row = entries[source] = build_catalog_entry(
+                    source=source,
+                    doc_id=doc_id.split("_", 1)[0] if doc_id else "",
+                    title=r.get("title") or source,
+                    created_at=r.get("created_at", ""),
+                    size_bytes=meta.get("size") or 0,
+                    content_type=meta.get("content_type") or "",
+                    section_count=0,
+                    small_chunk_count=0,
+                    has_text=True,
+                )
+                row["chunk_count"] = 0
+            row["chunk_count"] += 1
+            if r.get("chunk_type") == "section":
+                row["section_count"] += 1
+            elif r.get("chunk_type") == "small_chunk":
+                row["small_chunk_count"] += 1
+
+        for r in iter_knowledge_chunks(
+            ["source"], f"content_text eq '{NO_TEXT_PLACEHOLDER}'"
+        ):
+            row = entries.get(r.get("source") or "")
+            if row is not None:
+                row["status"] = "no_text"
+        return entries
+
+
+def build_catalog_entry(
+    *,
+    source: str,
+    doc_id: str,
+    title: str,
+    created_at: str,
+    size_bytes: int,
+    content_type: str,
+    section_count: int,
+    small_chunk_count: int,
+    has_text: bool,
+) -> dict:
+    """Shape one catalog row; chunk_count includes the document summary."""
+    return {
+        "doc_id": doc_id,
+        "title": title,
+        "source": source,
+        "created_at": created_at,
+        "size_bytes": size_bytes,
+        "content_type": content_type,
+        "chunk_count": 1 + section_count + small_chunk_count,
+        "section_count": section_count,
+        "small_chunk_count": small_chunk_count,
+        "status": "indexed" if has_text else "no_text",
+    }
+
+
+__all__ = ["KnowledgeCatalog", "build_catalog_entry", "NO_TEXT_PLACEHOLDER"]
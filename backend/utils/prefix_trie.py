@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Generic, Hashable, Iterator, TypeVar
+
+_V = TypeVar("_V", bound=Hashable)
+
+
+class _Node:
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.values: list = []
+
+
+class PrefixTrie(Generic[_V]):
+    """Case-insensitive prefix index from string keys to values.
+
+    A value may be inserted under several keys (e.g. a case under its id, site
+    and country); ``search`` returns each value once, shortest matching keys
+    first, so exact and near-exact matches lead.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, key: str, value: _V) -> None:
+        key = (key or "").strip().lower()
+        if not key:
+            return
+        node = self._root
+        for ch in key:
+            node = node.children.setdefault(ch, _Node())
+        if value not in node.values:
+            node.values.append(value)
+            self._size += 1
+
+    def search(self, prefix: str, limit: int = 10) -> list[_V]:
+        """Up to ``limit`` distinct values whose key starts with ``prefix``."""
+        node = self._root
+        for ch in (prefix or "").strip().lower():
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        seen: set = set()
+        out: list[_V] = []
+        for value in self._walk(node):
+            if value in seen:
+                continue
+            seen.add(value)
+            out.append(value)
+            if len(out) >= limit:
+                break
+        return out
+
+    @staticmethod
+    def _walk(node: _Node) -> Iterator:
+        # Breadth-first, so shorter keys are yielded before longer ones.
+        level = [node]
+        while level:
+            nxt: list[_Node] = []
+            for n in level:
+                yield from n.values
+                nxt.extend(n.children[ch] for ch in sorted(n.children))
+            level = nxt
+
+
+__all__ = ["PrefixTrie"]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+# Encoding used by text-embedding-3-* and the GPT-4 family deployments.
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=4)
+def get_encoding(name: str = DEFAULT_ENCODING):
+    """Return the tiktoken encoding ``name``, loaded once per process."""
+    import tiktoken
+
+    return tiktoken.get_encoding(name)
+
+
+def count_tokens(text: str, encoding_name: str = DEFAULT_ENCODING) -> int:
+    """Number of tokens ``text`` encodes to under ``encoding_name``."""
+    if not text:
+        return 0
+    return len(get_encoding(encoding_name).encode(text, disallowed_special=()))
+
+
+def token_offsets(text: str, encoding_name: str = DEFAULT_ENCODING) -> tuple[str, list[int]]:
+    """Encode ``text`` once and return (decoded text, char offset of each token)."""
+    enc = get_encoding(encoding_name)
+    tokens = enc.encode(text, disallowed_special=())
+    decoded, offsets = enc.decode_with_offsets(tokens)
+    return decoded, offsets
+
+
+__all__ = ["DEFAULT_ENCODING", "get_encoding", "count_tokens", "token_offsets"]
@@ -0,0 +1,87 @@
+"""
+backfill_case_neighbours.py — Compute precomputed neighbour lists for closed
+cases that were ingested before neighbour lists existed (or after a change of
+CASE_NEIGHBOURS_TOP_N / an index rebuild).
+
+New closures keep the lists fresh on their own (ingest_closed_case stores the
+new case's list and patches its neighbours'); this script only seeds them.
+
+Run from project root:
+    python -m scripts.backfill_case_neighbours              # only missing lists
+    python -m scripts.backfill_case_neighbours --all        # recompute every list
+    python -m scripts.backfill_case_neighbours --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from dotenv import load_dotenv
+load_dotenv(override=True)
+
+from backend.core.config import settings
+from backend.storage.blob_storage import BlobStorageClient, CaseReadRepository
+from backend.storage.case_neighbours import CaseNeighbourStore
+from backend.storage.ingestion.case_ingestion import CaseIngestionService, CaseSearchIndex
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s  %(levelname)-8s  %(message)s",
+    datefmt="%H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+def run(recompute_all: bool, workers: int) -> None:
+    blob_client = BlobStorageClient(
+        settings.AZURE_STORAGE_CONNECTION_STRING,
+        settings.AZURE_STORAGE_CONTAINER,
+    )
+    store = CaseNeighbourStore(blob_client, top_n=settings.CASE_NEIGHBOURS_TOP_N)
+    case_read_repo = CaseReadRepository(
+        settings.AZURE_STORAGE_CONNECTION_STRING,
+        settings.AZURE_STORAGE_CONTAINER,
+    )
+    ingestion = CaseIngestionService(
+        search_index=CaseSearchIndex(
+            endpoint=settings.AZURE_SEARCH_ENDPOINT,
+            index_name=settings.CASE_INDEX_NAME,
+            admin_key=settings.AZURE_SEARCH_ADMIN_KEY,
+            follow_pointer=True,
+        ),
+        case_repository=case_read_repo,
+        neighbour_store=store,
+    )
+
+    case_ids = [p.replace("/case.json", "") for p in case_read_repo.list_case_paths()]
+    if not recompute_all:
+        case_ids = [c for c in case_ids if store.get(c) is None]
+    logger.info("Computing neighbour lists for %d case(s)", len(case_ids))
+
+    def _one(case_id: str) -> bool:
+        try:
+            return ingestion.refresh_neighbours(case_id)
+        except Exception as exc:
+            logger.error("  ✗ %s: %s", case_id, exc)
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        done = sum(pool.map(_one, case_ids))
+    # Open cases and cases indexed without a vector are skipped by design.
+    logger.info("Done. Lists written: %d  Skipped/failed: %d", done, len(case_ids) - done)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill precomputed case neighbour lists.")
+    parser.add_argument("--all", action="store_true", help="Recompute existing lists too.")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    run(recompute_all=args.all, workers=args.workers)
@@ -0,0 +1,532 @@
+"""
+bench_text_processing.py — Benchmark knowledge text processing, legacy vs current.
+
+Generates synthetic 1–5 MB documents (a heading-structured manual and an
+unstructured text dump that exercises the fixed-size fallback), runs the
+section split → phase tagging → small-chunk pipeline with both the original
+per-line implementation (reproduced below verbatim as the reference) and
+backend.storage.ingestion.text_processing, checks the outputs are identical,
+and prints timings.
+
+With --tokens it also times the token-sized pipeline used in production
+(requires tiktoken) and reports the token size spread of the small chunks
+for both sizing modes.
+
+Run from project root:
+    python -m scripts.bench_text_processing
+    python -m scripts.bench_text_processing --sizes 1 5 --repeat 5
+    python -m scripts.bench_text_processing --tokens
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from backend.storage.ingestion.text_processing import (
+    COSOLVE_PHASE_KEYWORDS,
+    build_small_chunks,
+    detect_cosolve_phase,
+    split_into_sections,
+)
+
+_CREATED_AT = "2025-01-01T00:00:00+00:00"
+
+
+# ── Legacy reference implementation (KnowledgeIngestionService, pre-refactor) ──
+
+def legacy_split_into_sections(text: str, filename: str) -> list[dict]:
+    """Split document text into logical sections.
+
+    STEP 1: heading-based splitting (3+ headings detected).
+    STEP 2: fixed-size 2000-char / 200-char-overlap fallback.
+    """
+    lines = text.splitlines()
+
+    # STEP 1 — Try heading detection
+    heading_indices: list[int] = []
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        is_heading = False
+        if re.match(r"^[A-Z][A-Z0-9 \-/&:,\.]{2,79}$", stripped):
+            is_heading = True
+        elif re.match(r"^\d{1,2}(\.\d+)*[\.\s]+\S", stripped):
+            is_heading = True
+        elif len(stripped) < 60:
+            next_line = lines[i + 1] if i + 1 < len(lines) else ""
+            if next_line.strip() == "":
+                # Additional guards: reject if line contains sentence-ending
+                # punctuation mid-string or looks like body text
+                has_sentence_end = bool(re.search(r"[.!?]\s+\S", stripped))
+                starts_with_lower = stripped[0].islower() if stripped else False
+                is_conjunction_start = re.match(
+                    r"^(the|a|an|this|that|these|those|if|when|where|"
+                    r"as|by|for|in|on|or|and|but|to|of|with|from)\b",
+                    stripped,
+                    re.IGNORECASE,
+                )
+                if (
+                    not has_sentence_end
+                    and not starts_with_lower
+                    and not is_conjunction_start
+                ):
+                    is_heading = True
+        if is_heading:
+            heading_indices.append(i)
+
+    if len(heading_indices) >= 3:
+        raw_sections: list[dict] = []
+        for n, hi in enumerate(heading_indices):
+            end_line = (
+                heading_indices[n + 1]
+                if n + 1 < len(heading_indices)
+                else len(lines)
+            )
+            content = "\n".join(lines[hi:end_line]).strip()
+            title = lines[hi].strip()
+            if len(title) > 120:
+                title = title[:120].rsplit(" ", 1)[0]
+            if len(content) < 200:
+                continue  # likely a TOC entry
+            raw_sections.append(
+                {
+                    "section_title": title,
+                    "content": content,
+                    "page_start": 0,
+                    "page_end": 0,
+                }
+            )
+
+        # Sub-split sections exceeding 3000 chars at paragraph breaks
+        sections: list[dict] = []
+        for sec in raw_sections:
+            if len(sec["content"]) <= 3000:
+                sections.append(sec)
+            else:
+                content = sec["content"]
+                start = 0
+                part_n = 1
+                while start < len(content):
+                    end = start + 3000
+                    if end >= len(content):
+                        sub = content[start:].strip()
+                        if sub:
+                            label = (
+                                sec["section_title"]
+                                if part_n == 1
+                                else f"{sec['section_title']} (continued)"
+                            )
+                            sections.append(
+                                {
+                                    "section_title": label,
+                                    "content": sub,
+                                    "page_start": 0,
+                                    "page_end": 0,
+                                }
+                            )
+                        break
+                    split_at = content.rfind("\n\n", start, end)
+                    if split_at <= start:
+                        split_at = content.rfind("\n", start, end)
+                    if split_at <= start:
+                        split_at = end
+                    sub = content[start:split_at].strip()
+                    if sub:
+                        label = (
+                            sec["section_title"]
+                            if part_n == 1
+                            else f"{sec['section_title']} (continued)"
+                        )
+                        sections.append(
+                            {
+                                "section_title": label,
+                                "content": sub,
+                                "page_start": 0,
+                                "page_end": 0,
+                            }
+                        )
+                    # advance past the split point, skipping leading whitespace
+                    start = split_at
+                    while start < len(content) and content[start] in (
+                        "\n",
+                        " ",
+                        "\r",
+                    ):
+                        start += 1
+                    part_n += 1
+
+        if sections:
+            return sections
+
+    # STEP 2 — Fallback: fixed-size 2000-char split with 200-char overlap
+    fallback_sections: list[dict] = []
+    start = 0
+    n = 1
+    while start < len(text):
+        end = start + 2000
+        if end >= len(text):
+            chunk = text[start:].strip()
+            if chunk:
+                fallback_sections.append(
+                    {
+                        "section_title": f"{filename} \u2014 Part {n}",
+                        "content": chunk,
+                        "page_start": 0,
+                        "page_end": 0,
+                    }
+                )
+            break
+        split_at = text.rfind("\n\n", start, end)
+        if split_at <= start:
+            split_at = text.rfind("\n", start, end)
+        if split_at <= start:
+            split_at = end
+        chunk = text[start:split_at].strip()
+        if chunk:
+            fallback_sections.append(
+                {
+                    "section_title": f"{filename} \u2014 Part {n}",
+                    "content": chunk,
+                    "page_start": 0,
+                    "page_end": 0,
+                }
+            )
+        next_start = split_at - 200
+        if next_start <= start:
+            next_start = split_at
+        start = next_start
+        n += 1
+
+    if not fallback_sections:
+        fallback_sections = [
+            {
+                "section_title": f"{filename} \u2014 Part 1",
+                "content": text,
+                "page_start": 0,
+                "page_end": 0,
+            }
+        ]
+    return fallback_sections
+
+def legacy_detect_cosolve_phase(text: str) -> str:
+    """Tag text with the most relevant CoSolve reasoning phase.
+
+    Returns one of: 'diagnose' | 'root_cause' | 'correct' | 'prevent' | 'general'
+    """
+    lower = text.lower()
+    phase_keywords: dict[str, list[str]] = {
+        "diagnose": [
+            "symptom",
+            "alarm",
+            "temperature",
+            "observed",
+            "detected",
+            "failure",
+            "overheating",
+            "reading",
+            "telemetry",
+            "monitoring",
+            "measurement",
+        ],
+        "root_cause": [
+            "cause",
+            "root cause",
+            "failure mechanism",
+            "why",
+            "analysis",
+            "confirmed",
+            "investigation",
+            "factor",
+            "contributed",
+            "determined",
+            "evidence",
+        ],
+        "correct": [
+            "corrective action",
+            "replacement",
+            "revised",
+            "updated",
+            "repair",
+            "replaced",
+            "implemented",
+            "fixed",
+            "rework",
+            "modification",
+            "action taken",
+        ],
+        "prevent": [
+            "prevention",
+            "systemic",
+            "recurrence",
+            "policy",
+            "procedure",
+            "training",
+            "audit",
+            "qualification",
+            "specification",
+            "standard",
+            "requirement",
+            "incoming inspection",
+            "supplier",
+        ],
+    }
+    scores: dict[str, int] = {phase: 0 for phase in phase_keywords}
+    for phase, keywords in phase_keywords.items():
+        for kw in keywords:
+            if kw in lower:
+                scores[phase] += 1
+    best_phase = max(scores, key=lambda p: scores[p])
+    if scores[best_phase] == 0:
+        return "general"
+    # Check for tie
+    top_score = scores[best_phase]
+    tied = [p for p, s in scores.items() if s == top_score]
+    if len(tied) > 1:
+        return "general"
+    return best_phase
+
+
+def legacy_build_small_chunks(
+    section_content: str,
+    section_id: str,
+    source: str,
+    section_title: str,
+    cosolve_phase: str,
+    created_at: str,
+) -> list[dict]:
+    """Create small_chunk index documents (500 chars, 100-char overlap) from a section."""
+    small_chunks: list[dict] = []
+    text = section_content
+    start = 0
+    idx = 0
+    while start < len(text):
+        end = start + 500
+        if end >= len(text):
+            chunk_text = text[start:].strip()
+            if chunk_text:
+                small_chunks.append(
+                    {
+                        "doc_id": f"{section_id}_sc_{idx}",
+                        "doc_type": "knowledge",
+                        "title": source,
+                        "content_text": chunk_text,
+                        "source": source,
+                        "version": "1",
+                        "created_at": created_at,
+                        "chunk_type": "small_chunk",
+                        "section_title": section_title,
+                        "parent_section_id": section_id,
+                        "page_start": 0,
+                        "page_end": 0,
+                        "cosolve_phase": cosolve_phase,
+                        "char_count": len(chunk_text),
+                    }
+                )
+            break
+        split_at = text.rfind(" ", start, end)
+        if split_at <= start:
+            split_at = end
+        chunk_text = text[start:split_at].strip()
+        if chunk_text:
+            small_chunks.append(
+                {
+                    "doc_id": f"{section_id}_sc_{idx}",
+                    "doc_type": "knowledge",
+                    "title": source,
+                    "content_text": chunk_text,
+                    "source": source,
+                    "version": "1",
+                    "created_at": created_at,
+                    "chunk_type": "small_chunk",
+                    "section_title": section_title,
+                    "parent_section_id": section_id,
+                    "page_start": 0,
+                    "page_end": 0,
+                    "cosolve_phase": cosolve_phase,
+                    "char_count": len(chunk_text),
+                    "embedding": None,
+                }
+            )
+        next_start = split_at - 100
+        if next_start <= start:
+            next_start = split_at
+        start = next_start
+        idx += 1
+    return small_chunks
+
+
+# ── Synthetic documents ─────────────────────────────────────────────────────
+
+_VOCAB = (
+    "pump valve seal bearing operator shift line plant motor check inspect "
+    "torque flow pressure level sensor report team review housing gasket "
+    "coupling alignment vibration lubrication schedule batch station"
+).split()
+_KEYWORDS = [kw for kws in COSOLVE_PHASE_KEYWORDS.values() for kw in kws]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [
+        rng.choice(_KEYWORDS) if rng.random() < 0.03 else rng.choice(_VOCAB)
+        for _ in range(rng.randint(8, 22))
+    ]
+    return words[0].capitalize() + " " + " ".join(words[1:]) + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(2, 7)))
+
+
+def make_manual(size_bytes: int, seed: int = 7) -> str:
+    """Heading-structured manual: numbered/uppercase headings, paragraphs, tables."""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    total = 0
+    chapter = 0
+    while total < size_bytes:
+        chapter += 1
+        block = [f"{chapter}. {rng.choice(_VOCAB).upper()} {rng.choice(_VOCAB).upper()}", ""]
+        for sub in range(1, rng.randint(2, 6)):
+            block += [f"{chapter}.{sub} {rng.choice(_VOCAB).capitalize()} procedure", ""]
+            for _ in range(rng.randint(1, 8)):
+                block += [_paragraph(rng), ""]
+            if rng.random() < 0.3:
+                block += [f"Step {i}  {rng.choice(_VOCAB)}  {rng.randint(1, 99)} Nm" for i in range(5)]
+                block.append("")
+        chunk = "\n".join(block)
+        parts.append(chunk)
+        total += len(chunk) + 1
+    return "\n".join(parts)
+
+
+def make_unstructured(size_bytes: int, seed: int = 11) -> str:
+    """Long prose without headings — forces the fixed-size fallback path."""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    total = 0
+    while total < size_bytes:
+        para = "the " + _paragraph(rng).lower()
+        parts.append(para)
+        total += len(para) + 2
+    return "\n\n".join(parts)
+
+
+# ── Pipeline ────────────────────────────────────────────────────────────────
+
+
+def _pipeline(text: str, split, detect, small) -> list:
+    out = [detect(text)]
+    for idx, sec in enumerate(split(text, "bench.pdf")):
+        phase = detect(sec["content"])
+        section_id = f"bench_sec_{idx}"
+        out.append((sec, phase))
+        out.append(
+            small(sec["content"], section_id, "bench.pdf", sec["section_title"], phase, _CREATED_AT)
+        )
+    return out
+
+
+def _token_pipeline(text: str, args: argparse.Namespace) -> list:
+    def split(t: str, filename: str) -> list[dict]:
+        return split_into_sections(
+            t,
+            filename,
+            max_section_tokens=args.section_tokens,
+            fallback_tokens=args.fallback_tokens,
+            fallback_overlap_tokens=args.fallback_overlap_tokens,
+        )
+
+    def small(*a) -> list[dict]:
+        return build_small_chunks(
+            *a,
+            max_tokens=args.small_chunk_tokens,
+            overlap_tokens=args.small_chunk_overlap_tokens,
+        )
+
+    return _pipeline(text, split, detect_cosolve_phase, small)
+
+
+def _small_chunk_token_spread(result: list) -> str:
+    from backend.utils.tokens import count_tokens
+
+    sizes = sorted(
+        count_tokens(doc["content_text"])
+        for chunks in result[2::2]
+        for doc in chunks
+    )
+    if not sizes:
+        return "-"
+    return f"{sizes[0]}/{sizes[len(sizes) // 2]}/{sizes[-1]}"
+
+
+def _time(fn, repeat: int) -> tuple[float, list]:
+    best = float("inf")
+    result: list = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1, 2, 5], help="document sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    parser.add_argument("--tokens", action="store_true", help="also time the token-sized pipeline")
+    parser.add_argument("--section-tokens", type=int, default=750)
+    parser.add_argument("--fallback-tokens", type=int, default=500)
+    parser.add_argument("--fallback-overlap-tokens", type=int, default=50)
+    parser.add_argument("--small-chunk-tokens", type=int, default=128)
+    parser.add_argument("--small-chunk-overlap-tokens", type=int, default=25)
+    args = parser.parse_args()
+
+    print(f"{'document':<22}{'sections':>10}{'legacy ms':>12}{'current ms':>12}{'speedup':>9}  identical")
+    mismatches = 0
+    for mb in args.sizes:
+        size = int(mb * 1024 * 1024)
+        for kind, make in (("manual", make_manual), ("unstructured", make_unstructured)):
+            text = make(size)
+            legacy_s, legacy = _time(
+                lambda: _pipeline(
+                    text,
+                    legacy_split_into_sections,
+                    legacy_detect_cosolve_phase,
+                    legacy_build_small_chunks,
+                ),
+                args.repeat,
+            )
+            current_s, current = _time(
+                lambda: _pipeline(text, split_into_sections, detect_cosolve_phase, build_small_chunks),
+                args.repeat,
+            )
+            same = legacy == current
+            mismatches += not same
+            n_sections = (len(current) - 1) // 2
+            print(
+                f"{f'{kind} {mb:g} MB':<22}{n_sections:>10}{legacy_s * 1e3:>12.1f}"
+                f"{current_s * 1e3:>12.1f}{legacy_s / current_s:>8.2f}x  {same}"
+            )
+            if args.tokens:
+                token_s, token_result = _time(lambda: _token_pipeline(text, args), args.repeat)
+                print(
+                    f"{'  token-sized':<22}{(len(token_result) - 1) // 2:>10}{'':>12}"
+                    f"{token_s * 1e3:>12.1f}{'':>9}  small chunk tokens min/median/max: "
+                    f"chars {_small_chunk_token_spread(current)}, "
+                    f"tokens {_small_chunk_token_spread(token_result)}"
+                )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
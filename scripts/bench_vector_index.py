@@ -0,0 +1,193 @@
+"""
+bench_vector_index.py — Recall vs latency of HNSW vector search per index.
+
+For every query vector, the top-k from the approximate (HNSW) search is
+compared with an exhaustive KNN search over the same index and field, which
+serves as ground truth. The script reports recall@k and p50/p95 latency for
+both modes, together with each index's HNSW / compression parameters.
+Candidate indexes built with ``--no-swap`` can be compared side by side with
+the live one before activating a configuration.
+
+Query vectors are either the embeddings of a query file (one query per line,
+embedded once in a batch) or the stored vectors of documents sampled from the
+first index (``--sample``, no embedding calls).
+
+Run from project root:
+    python -m scripts.bench_vector_index --queries queries.txt
+    python -m scripts.bench_vector_index --index case_index_v3 \\
+        --index case_index_v3-20260101120000 --sample 200 --k 10 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from dotenv import load_dotenv
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+load_dotenv(override=True)
+
+from azure.core.credentials import AzureKeyCredential
+from azure.search.documents import SearchClient
+from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.models import VectorizedQuery
+
+from backend.core.config import settings
+from backend.knowledge.embeddings import get_embeddings
+from backend.storage.index_pointer import resolve_index_name
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (``pct`` in 0–100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def recall_at_k(approx: list[str], exact: list[str], k: int) -> float:
+    """Share of the exact top-k keys that the approximate top-k recovered."""
+    truth = exact[:k]
+    if not truth:
+        return 1.0
+    return len(set(approx[:k]) & set(truth)) / len(truth)
+
+
+def describe_vector_config(index_client: SearchIndexClient, index_name: str) -> str:
+    vector_search = index_client.get_index(index_name).vector_search
+    if vector_search is None or not vector_search.algorithms:
+        return "no vector search"
+    parts = []
+    for algo in vector_search.algorithms:
+        p = getattr(algo, "parameters", None)
+        if p is not None:
+            parts.append(
+                f"{algo.kind} m={p.m} efC={p.ef_construction} "
+                f"efS={p.ef_search} metric={p.metric}"
+            )
+        else:
+            parts.append(str(algo.kind))
+    for comp in vector_search.compressions or []:
+        parts.append(f"compression={comp.kind}")
+    return ", ".join(parts)
+
+
+def _search_keys(
+    client: SearchClient, key_field: str, field: str, vector: list[float], k: int, exhaustive: bool
+) -> tuple[list[str], float]:
+    query = VectorizedQuery(
+        vector=vector, k_nearest_neighbors=k, fields=field, exhaustive=exhaustive
+    )
+    start = time.perf_counter()
+    results = client.search(search_text=None, vector_queries=[query], select=[key_field], top=k)
+    keys = [r[key_field] for r in results]
+    return keys, (time.perf_counter() - start) * 1000
+
+
+def sample_query_vectors(
+    client: SearchClient, field: str, n: int, seed: int
+) -> list[list[float]]:
+    """Stored vectors of ``n`` randomly chosen documents."""
+    docs = [
+        d[field]
+        for d in client.search(search_text="*", select=[field], top=1000)
+        if d.get(field)
+    ]
+    random.Random(seed).shuffle(docs)
+    return docs[:n]
+
+
+def bench_index(
+    client: SearchClient,
+    key_field: str,
+    field: str,
+    vectors: list[list[float]],
+    k: int,
+    repeat: int,
+) -> dict:
+    recalls: list[float] = []
+    ann_ms: list[float] = []
+    exact_ms: list[float] = []
+    for vector in vectors:
+        exact, _ = _search_keys(client, key_field, field, vector, k, exhaustive=True)
+        approx: list[str] = []
+        for _ in range(repeat):
+            approx, ms = _search_keys(client, key_field, field, vector, k, exhaustive=False)
+            ann_ms.append(ms)
+            _, ms = _search_keys(client, key_field, field, vector, k, exhaustive=True)
+            exact_ms.append(ms)
+        recalls.append(recall_at_k(approx, exact, k))
+    return {
+        "recall_mean": sum(recalls) / len(recalls) if recalls else 0.0,
+        "recall_min": min(recalls) if recalls else 0.0,
+        "ann_p50": percentile(ann_ms, 50),
+        "ann_p95": percentile(ann_ms, 95),
+        "exact_p50": percentile(exact_ms, 50),
+        "exact_p95": percentile(exact_ms, 95),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HNSW recall@k vs latency benchmark")
+    parser.add_argument(
+        "--index",
+        action="append",
+        help="Physical index to benchmark (repeatable). Default: active case index.",
+    )
+    parser.add_argument("--field", default="embedding")
+    parser.add_argument("--key-field", default="doc_id")
+    parser.add_argument("--queries", help="Text file with one query per line.")
+    parser.add_argument("--sample", type=int, default=100, help="Sampled documents when no --queries.")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per query.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    indexes = args.index or [resolve_index_name(settings.CASE_INDEX_NAME)]
+    credential = AzureKeyCredential(settings.AZURE_SEARCH_ADMIN_KEY)
+    index_client = SearchIndexClient(endpoint=settings.AZURE_SEARCH_ENDPOINT, credential=credential)
+    clients = {
+        name: SearchClient(
+            endpoint=settings.AZURE_SEARCH_ENDPOINT, index_name=name, credential=credential
+        )
+        for name in indexes
+    }
+
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as fh:
+            queries = [line.strip() for line in fh if line.strip()]
+        vectors = get_embeddings().embed_documents(queries)
+        source = f"{len(vectors)} queries from {args.queries}"
+    else:
+        vectors = sample_query_vectors(clients[indexes[0]], args.field, args.sample, args.seed)
+        source = f"{len(vectors)} document vectors sampled from {indexes[0]}"
+    if not vectors:
+        raise SystemExit("No query vectors — check --queries / --sample and the index contents.")
+
+    print(f"\nrecall@{args.k} vs latency  ({source}, {args.repeat} timed runs each)\n")
+    header = (
+        f"{'index':<40} {'recall':>7} {'min':>6} {'ann p50':>9} {'ann p95':>9} "
+        f"{'knn p50':>9} {'knn p95':>9}"
+    )
+    print(header)
+    print("─" * len(header))
+    for name in indexes:
+        r = bench_index(clients[name], args.key_field, args.field, vectors, args.k, args.repeat)
+        print(
+            f"{name:<40} {r['recall_mean']:>7.3f} {r['recall_min']:>6.2f} "
+            f"{r['ann_p50']:>7.1f}ms {r['ann_p95']:>7.1f}ms "
+            f"{r['exact_p50']:>7.1f}ms {r['exact_p95']:>7.1f}ms"
+        )
+        print(f"  {describe_vector_config(index_client, name)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,40 @@
 """
-rebuild_index.py — Deletes and recreates case_index_v3 with corrected schema.
+rebuild_index.py — Rebuilds the case index with zero downtime.
+
+A versioned shadow index (``<CASE_INDEX_NAME>-<UTC timestamp>``) is created
+with the schema below and populated from blob storage in parallel, with
+embeddings requested in batches. Cases modified while the rebuild ran are
+re-indexed in a catch-up pass, document counts are validated, and only then
+is the active-index pointer swapped. A second catch-up runs once the pointer
+TTL has passed, for cases written by processes still on the old index. The
+previous index is left in place so the swap can be reverted with
+``--rollback``.
 
 Changes vs previous schema:
   - organization_department  →  organization_unit  (renamed)
   - organization_country, organization_site, organization_unit  →  now SearchableField
     (previously only filterable; now both filterable AND searchable for full-text queries)
 
-Run once from project root:
-    python -m scripts.rebuild_index
+Run from project root:
+    python -m scripts.rebuild_index [--workers 8] [--batch-size 16]
+    python -m scripts.rebuild_index --no-swap --hnsw-m 8 --ef-search 800
+    python -m scripts.rebuild_index --activate case_index_v3-20260101120000
+    python -m scripts.rebuild_index --rollback
+
+HNSW / quantization parameters default to the CASE_* settings
+(backend/knowledge/vector_index_config.py); build candidates with --no-swap
+and compare them with scripts.bench_vector_index before activating one.
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 
 from dotenv import load_dotenv
 
@@ -26,21 +46,28 @@ if _PROJECT_ROOT not in sys.path:
 load_dotenv(override=True)
 
 from azure.core.credentials import AzureKeyCredential
-from azure.core.exceptions import ResourceNotFoundError
+from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import (
-    HnswAlgorithmConfiguration,
     SearchField,
     SearchFieldDataType,
     SearchIndex,
+    SearchSuggester,
     SearchableField,
     SimpleField,
-    VectorSearch,
-    VectorSearchProfile,
 )
 
 from backend.core.config import settings
+from backend.knowledge.case_search_client import CASE_SUGGESTER, SUGGEST_FIELDS
+from backend.knowledge.vector_index_config import (
+    add_vector_arguments,
+    build_vector_search,
+    hnsw_params,
+    vector_params_from_args,
+)
+from backend.knowledge.embeddings import get_embeddings
 from backend.storage.blob_storage import CaseReadRepository
+from backend.storage.index_pointer import get_index_pointer
 from backend.storage.ingestion.case_ingestion import CaseIngestionService, CaseSearchIndex
 
 logging.basicConfig(
@@ -61,8 +88,13 @@ EMBEDDING_DIM = 3072  # text-embedding-3-large
 # ─────────────────────────────────────────────────────────────────────────────
 
 
-def build_index_schema() -> SearchIndex:
-    """Corrected case_index_v3 schema with organization_unit."""
+def build_index_schema(
+    index_name: str = INDEX_NAME, vector_params: dict | None = None
+) -> SearchIndex:
+    """Corrected case_index_v3 schema with organization_unit.
+
+    ``vector_params`` overrides the CASE_* HNSW / quantization settings.
+    """
 
     # Collection helper
     Coll = SearchFieldDataType.Collection
@@ -192,17 +224,20 @@ def build_index_schema() -> SearchIndex:
         ),
     ]
 
-    vector_search = VectorSearch(
-        algorithms=[HnswAlgorithmConfiguration(name=VECTOR_ALGO)],
-        profiles=[
-            VectorSearchProfile(
-                name=VECTOR_PROFILE,
-                algorithm_configuration_name=VECTOR_ALGO,
-            )
-        ],
+    vector_search = build_vector_search(
+        VECTOR_ALGO, VECTOR_PROFILE, **(vector_params or hnsw_params("case"))
     )
 
-    return SearchIndex(name=INDEX_NAME, fields=fields, vector_search=vector_search)
+    suggesters = [
+        SearchSuggester(name=CASE_SUGGESTER, source_fields=list(SUGGEST_FIELDS))
+    ]
+
+    return SearchIndex(
+        name=index_name,
+        fields=fields,
+        vector_search=vector_search,
+        suggesters=suggesters,
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -210,59 +245,255 @@ def build_index_schema() -> SearchIndex:
 # ─────────────────────────────────────────────────────────────────────────────
 
 
-def rebuild() -> None:
+def _case_ids(case_read_repo: CaseReadRepository, modified_since=None) -> list[str]:
+    paths = case_read_repo.list_case_paths(modified_since=modified_since)
+    return [p.replace("/case.json", "") for p in paths]
+
+
+def _index_batch(
+    case_ingestion: CaseIngestionService,
+    search_index: CaseSearchIndex,
+    case_ids: list[str],
+) -> tuple[list[str], list[str]]:
+    """Prepare, batch-embed and upload one batch; returns (indexed, failed)."""
+    prepared: list[tuple[str, dict, str]] = []
+    failed: list[str] = []
+    for case_id in case_ids:
+        try:
+            document, text = case_ingestion.prepare_index_document(case_id)
+            prepared.append((case_id, document, text))
+        except Exception as exc:
+            logger.error("  ✗ Failed %s: %s", case_id, exc)
+            failed.append(case_id)
+    if not prepared:
+        return [], failed
+
+    to_embed = [(doc, text) for _, doc, text in prepared if text]
+    if to_embed:
+        try:
+            vectors = get_embeddings().embed_documents([t for _, t in to_embed])
+            for (doc, _), vector in zip(to_embed, vectors):
+                doc["embedding"] = vector
+        except Exception as exc:
+            # Same policy as index_open_case: index without vectors.
+            logger.warning("Batch embedding failed (indexed without vectors): %s", exc)
+
+    indexed: list[str] = []
+    try:
+        results = search_index.merge_or_upload_documents([d for _, d, _ in prepared])
+    except Exception as exc:
+        logger.error("  ✗ Upload failed for %d case(s): %s", len(prepared), exc)
+        return [], failed + [case_id for case_id, _, _ in prepared]
+    by_key = {r.key: r for r in results}
+    for case_id, doc, _ in prepared:
+        result = by_key.get(doc["doc_id"])
+        if result is not None and result.succeeded:
+            indexed.append(case_id)
+        else:
+            error = result.error_message if result is not None else "no result"
+            logger.error("  ✗ Rejected %s: %s", case_id, error)
+            failed.append(case_id)
+    return indexed, failed
+
+
+def populate(
+    case_ingestion: CaseIngestionService,
+    search_index: CaseSearchIndex,
+    case_ids: list[str],
+    workers: int,
+    batch_size: int,
+) -> tuple[set[str], set[str]]:
+    """Index ``case_ids`` in parallel batches; returns (indexed, failed) ids."""
+    batches = [case_ids[i:i + batch_size] for i in range(0, len(case_ids), batch_size)]
+    indexed: set[str] = set()
+    failed: set[str] = set()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(_index_batch, case_ingestion, search_index, batch)
+            for batch in batches
+        ]
+        for future in as_completed(futures):
+            ok, bad = future.result()
+            indexed.update(ok)
+            failed.update(bad)
+            logger.info("  progress: %d/%d indexed", len(indexed), len(case_ids))
+    return indexed, failed
+
+
+def _catch_up(
+    case_read_repo: CaseReadRepository,
+    case_ingestion: CaseIngestionService,
+    search_index: CaseSearchIndex,
+    since: datetime,
+    workers: int,
+    batch_size: int,
+) -> tuple[set[str], set[str]]:
+    """Re-index cases modified since ``since``; returns (indexed, failed) ids."""
+    changed = _case_ids(case_read_repo, modified_since=since)
+    if not changed:
+        return set(), set()
+    logger.info("Catch-up: re-indexing %d case(s) modified since %s", len(changed), since)
+    return populate(case_ingestion, search_index, changed, workers, batch_size)
+
+
+def _wait_for_count(search_index: CaseSearchIndex, expected: int, timeout_s: float) -> int:
+    """Document counts are eventually consistent; poll until they settle."""
+    deadline = time.monotonic() + timeout_s
+    count = search_index.get_document_count()
+    while count < expected and time.monotonic() < deadline:
+        time.sleep(2)
+        count = search_index.get_document_count()
+    return count
+
+
+def rebuild(
+    workers: int = 8,
+    batch_size: int = 16,
+    min_ratio: float = 0.95,
+    count_timeout_s: float = 60.0,
+    vector_params: dict | None = None,
+    swap: bool = True,
+) -> None:
+    pointer = get_index_pointer()
+    if pointer is None:
+        raise SystemExit("AZURE_STORAGE_CONNECTION_STRING is required for the index pointer.")
+
     credential = AzureKeyCredential(settings.AZURE_SEARCH_ADMIN_KEY)
     index_client = SearchIndexClient(
         endpoint=settings.AZURE_SEARCH_ENDPOINT,
         credential=credential,
     )
 
-    # ── Step 1: delete existing index ────────────────────────────────────────
-    try:
-        index_client.delete_index(INDEX_NAME)
-        logger.info("Deleted existing index: %s", INDEX_NAME)
-    except ResourceNotFoundError:
-        logger.info("Index %s did not exist — nothing to delete.", INDEX_NAME)
-    except Exception as exc:
-        logger.warning("Could not delete index (non-fatal): %s", exc)
-
-    # ── Step 2: create new index ──────────────────────────────────────────────
-    schema = build_index_schema()
+    # ── Step 1: create the versioned shadow index ────────────────────────────
+    live_name = pointer.resolve(INDEX_NAME)
+    shadow_name = f"{INDEX_NAME}-{datetime.now(timezone.utc):%Y%m%d%H%M%S}"
+    schema = build_index_schema(shadow_name, vector_params)
     index_client.create_index(schema)
-    logger.info("Created new index: %s", INDEX_NAME)
+    logger.info(
+        "Created shadow index %s (live: %s) vector params: %s",
+        shadow_name, live_name, vector_params or hnsw_params("case"),
+    )
 
-    # ── Step 3: re-index all cases from blob ─────────────────────────────────
+    # ── Step 2: populate it from blob in parallel batches ────────────────────
     case_read_repo = CaseReadRepository(
         connection_string=settings.AZURE_STORAGE_CONNECTION_STRING,
         container_name=settings.AZURE_STORAGE_CONTAINER,
     )
+    # Keys keep the logical index name so they survive the swap unchanged.
     search_index = CaseSearchIndex(
         endpoint=settings.AZURE_SEARCH_ENDPOINT,
         index_name=INDEX_NAME,
         admin_key=settings.AZURE_SEARCH_ADMIN_KEY,
+        target_index_name=shadow_name,
     )
     case_ingestion = CaseIngestionService(
         search_index=search_index,
         case_repository=case_read_repo,
     )
 
-    paths = case_read_repo.list_case_paths()
-    case_ids = [p.replace("/case.json", "") for p in paths]
-    logger.info("Found %d case(s) to re-index: %s", len(case_ids), case_ids)
+    started_at = datetime.now(timezone.utc)
+    case_ids = _case_ids(case_read_repo)
+    logger.info("Found %d case(s) to index into %s", len(case_ids), shadow_name)
+    indexed, failed = populate(case_ingestion, search_index, case_ids, workers, batch_size)
 
-    success = 0
-    failed = 0
-    for case_id in case_ids:
-        try:
-            case_ingestion.index_open_case(case_id)
-            logger.info("  ✓ Indexed %s", case_id)
-            success += 1
-        except Exception as exc:
-            logger.error("  ✗ Failed %s: %s", case_id, exc)
-            failed += 1
+    # ── Step 3: catch up with cases written while we were populating ─────────
+    catch_up_at = datetime.now(timezone.utc)
+    ok, bad = _catch_up(case_read_repo, case_ingestion, search_index, started_at, workers, batch_size)
+    indexed |= ok
+    failed = (failed | bad) - indexed
 
-    logger.info("Done. Success: %d  Failed: %d", success, failed)
+    # ── Step 4: validate before swapping ─────────────────────────────────────
+    shadow_count = _wait_for_count(search_index, len(indexed), count_timeout_s)
+    logger.info(
+        "Shadow %s: %d documents (indexed %d, failed %d)",
+        shadow_name, shadow_count, len(indexed), len(failed),
+    )
+    if shadow_count != len(indexed):
+        raise SystemExit(
+            f"Validation failed: {shadow_count} documents in {shadow_name}, "
+            f"expected {len(indexed)}. Pointer NOT swapped."
+        )
+    try:
+        live_count = SearchClient(
+            endpoint=settings.AZURE_SEARCH_ENDPOINT,
+            index_name=live_name,
+            credential=credential,
+        ).get_document_count()
+    except Exception:
+        live_count = 0  # no live index yet (first build)
+    if live_count and shadow_count < live_count * min_ratio:
+        raise SystemExit(
+            f"Validation failed: {shadow_count} documents vs {live_count} in "
+            f"{live_name} (min ratio {min_ratio}). Pointer NOT swapped."
+        )
+
+    # ── Step 5: swap — previous index is kept for rollback ───────────────────
+    if not swap:
+        logger.info(
+            "Validated %s; pointer left on %s. Benchmark it with "
+            "scripts.bench_vector_index, then --activate %s.",
+            shadow_name, live_name, shadow_name,
+        )
+        return
+    previous = pointer.swap(INDEX_NAME, shadow_name)
+
+    # ── Step 6: second catch-up once every process sees the new pointer ──────
+    # App processes keep resolving the old index for up to the pointer TTL,
+    # so cases written meanwhile only reached the previous index.
+    logger.info(
+        "Waiting %.0fs for the pointer to propagate before the final catch-up",
+        settings.INDEX_POINTER_TTL_SECONDS,
+    )
+    time.sleep(settings.INDEX_POINTER_TTL_SECONDS)
+    ok, bad = _catch_up(case_read_repo, case_ingestion, search_index, catch_up_at, workers, batch_size)
+    failed = (failed | bad) - ok
+    logger.info(
+        "Done. %s now serves %s (previous: %s — kept for --rollback). Failed: %d",
+        shadow_name, INDEX_NAME, previous, len(failed),
+    )
+
+
+def activate(physical_name: str) -> None:
+    """Point CASE_INDEX_NAME at an already-built index (e.g. after --no-swap)."""
+    pointer = get_index_pointer()
+    if pointer is None:
+        raise SystemExit("AZURE_STORAGE_CONNECTION_STRING is required for the index pointer.")
+    previous = pointer.swap(INDEX_NAME, physical_name)
+    logger.info("%s now serves %s (previous: %s)", physical_name, INDEX_NAME, previous)
+
+
+def rollback() -> None:
+    pointer = get_index_pointer()
+    if pointer is None:
+        raise SystemExit("AZURE_STORAGE_CONNECTION_STRING is required for the index pointer.")
+    restored = pointer.rollback(INDEX_NAME)
+    logger.info("Rolled back: %s now serves %s", restored, INDEX_NAME)
 
 
 if __name__ == "__main__":
-    rebuild()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument(
+        "--min-ratio",
+        type=float,
+        default=0.95,
+        help="Abort unless the shadow holds at least this share of the live document count.",
+    )
+    parser.add_argument("--no-swap", action="store_true", help="Build and validate only.")
+    parser.add_argument("--activate", metavar="INDEX", help="Swap the pointer to INDEX.")
+    parser.add_argument("--rollback", action="store_true", help="Re-activate the previous index.")
+    add_vector_arguments(parser)
+    args = parser.parse_args()
+    if args.rollback:
+        rollback()
+    elif args.activate:
+        activate(args.activate)
+    else:
+        rebuild(
+            workers=args.workers,
+            batch_size=args.batch_size,
+            min_ratio=args.min_ratio,
+            vector_params=vector_params_from_args(args, "case"),
+            swap=not args.no_swap,
+        )
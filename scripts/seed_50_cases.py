@@ -164,6 +164,7 @@ def main() -> None:
         endpoint=settings.AZURE_SEARCH_ENDPOINT,
         index_name=settings.CASE_INDEX_NAME or "case_index_v3",
         admin_key=settings.AZURE_SEARCH_ADMIN_KEY,
+        follow_pointer=True,
     )
     embedding_client = EmbeddingClient()
     ingestion_service = CaseIngestionService(
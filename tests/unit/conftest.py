@@ -0,0 +1,59 @@
+import pytest
+
+
+class FakeClock:
+    """Manually advanced stand-in for ``time.monotonic`` / ``time.time``."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture()
+def blob_client():
+    """In-memory ``BlobStorageClient`` for the JSON blob methods.
+
+    ``interleave`` holds callbacks run just before the next conditional
+    writes, to stage a concurrent writer; ``fail`` makes reads raise.
+    """
+    blob_storage = pytest.importorskip("backend.storage.blob_storage")
+
+    class FakeBlobClient(blob_storage.BlobStorageClient):
+        def __init__(self) -> None:
+            self.blobs: dict[str, tuple[str, int]] = {}
+            self.interleave: list = []
+            self.fail = False
+            self.reads = 0
+
+        def download_json_with_etag(self, path: str) -> tuple[str, str]:
+            self.reads += 1
+            if self.fail:
+                raise ConnectionError("blob unavailable")
+            if path not in self.blobs:
+                raise FileNotFoundError(path)
+            data, version = self.blobs[path]
+            return data, str(version)
+
+        def upload_json(self, path: str, data: str, overwrite: bool = False) -> None:
+            self.blobs[path] = (data, self.blobs.get(path, ("", 0))[1] + 1)
+
+        def upload_json_if_match(self, path: str, data: str, etag) -> bool:
+            if self.interleave:
+                self.interleave.pop(0)()
+            current = self.blobs.get(path)
+            if (current is None) != (etag is None) or (current and str(current[1]) != etag):
+                return False
+            self.upload_json(path, data)
+            return True
+
+    return FakeBlobClient()
@@ -0,0 +1,181 @@
+import threading
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("azure.storage.blob")
+pytest.importorskip("azure.search.documents")
+
+from backend.core.config import settings
+from backend.gateway import answer_cache
+from backend.gateway.answer_cache import AnswerCache, invoke_graph_cached, normalize_question
+from backend.gateway.semantic_cache import SemanticAnswerCache
+from backend.knowledge import retrieval_cache
+from backend.knowledge.retrieval_cache import bump_generation
+from backend.storage.index_generations import IndexGenerations
+from backend.utils.single_flight import SingleFlight
+
+
+class _FakeGraph:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.states = []
+
+    def invoke(self, state: dict) -> dict:
+        self.calls += 1
+        self.states.append(state)
+        return {"final_response": {"result": {"summary": f"answer {self.calls}"}}, "question_ready": True}
+
+
+@pytest.fixture()
+def cache(monkeypatch, tmp_path):
+    cache = AnswerCache(max_entries=16, ttl_seconds=60, path=str(tmp_path / "answers.db"))
+    monkeypatch.setattr(answer_cache, "_cache", cache)
+    monkeypatch.setattr(answer_cache, "_semantic", SemanticAnswerCache(0.9, 60))
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_ENABLED", True)
+    vectors = {"how are we doing this year?": (1.0, 0.1), "overall performance this year": (0.97, 0.15)}
+    monkeypatch.setattr(answer_cache, "query_vector", lambda q: vectors.get(q, (0.0, 1.0)))
+    cases = {"TRM-1": {"case_id": "TRM-1", "meta": {"version": 3}}}
+    monkeypatch.setattr(answer_cache, "load_case_document", lambda cid: cases.get(cid))
+    return cache, cases
+
+
+def test_normalize_question() -> None:
+    assert normalize_question("  How is our   overall performance this year?? ") == (
+        "how is our overall performance this year"
+    )
+
+
+def test_repeated_question_is_served_from_cache(cache) -> None:
+    graph = _FakeGraph()
+    state = {"case_id": "TRM-1", "question": "What is the root cause?"}
+    first, hit = invoke_graph_cached(graph, state, "AI_REASONING")
+    assert not hit and graph.states[0]["case_context"]["meta"]["version"] == 3
+    again, hit = invoke_graph_cached(graph, {**state, "question": "what is the root cause"}, "AI_REASONING")
+    assert hit and again["final_response"] == first["final_response"] and graph.calls == 1
+
+
+def test_case_version_and_index_writes_invalidate(cache) -> None:
+    _, cases = cache
+    graph = _FakeGraph()
+    state = {"case_id": "TRM-1", "question": "Next steps?"}
+    invoke_graph_cached(graph, state, "AI_REASONING")
+    cases["TRM-1"]["meta"]["version"] = 4
+    assert not invoke_graph_cached(graph, state, "AI_REASONING")[1]
+    bump_generation("knowledge")
+    assert not invoke_graph_cached(graph, state, "AI_REASONING")[1]
+    assert graph.calls == 3
+
+
+def test_clarifying_results_are_not_cached(cache) -> None:
+    class _Unsure(_FakeGraph):
+        def invoke(self, state: dict) -> dict:
+            self.calls += 1
+            return {"classification_low_confidence": True, "final_response": {}}
+
+    graph = _Unsure()
+    for _ in range(2):
+        assert not invoke_graph_cached(graph, {"question": "hmm"}, "AI_REASONING")[1]
+    assert graph.calls == 2
+
+
+def test_answers_on_degraded_retrieval_are_not_cached(cache) -> None:
+    class _Degraded(_FakeGraph):
+        def invoke(self, state: dict) -> dict:
+            return {**super().invoke(state), "retrieval_degraded": True}
+
+    graph = _Degraded()
+    for _ in range(2):
+        assert not invoke_graph_cached(graph, {"question": "Open cases?"}, "AI_REASONING")[1]
+    assert graph.calls == 2
+
+
+def test_entries_persist_to_disk(tmp_path) -> None:
+    path = str(tmp_path / "answers.db")
+    key = AnswerCache.make_key("q", None, None, "AI_REASONING")
+    AnswerCache(16, 60, path).put(key, {"final_response": {"x": 1}, "ignored": 2})
+    assert AnswerCache(16, 60, path).get(key) == {"final_response": {"x": 1}}
+
+
+def test_keys_follow_generations_shared_between_processes(monkeypatch, blob_client) -> None:
+    worker = IndexGenerations(blob_client, ttl_seconds=0)
+    other = IndexGenerations(blob_client, ttl_seconds=0)
+    monkeypatch.setattr(retrieval_cache, "get_index_generations", lambda: worker)
+    key = AnswerCache.make_key("q", None, None, "AI_REASONING")
+    monkeypatch.setattr(retrieval_cache, "_BOOT_ID", "restarted")
+    assert AnswerCache.make_key("q", None, None, "AI_REASONING") == key
+    other.bump("knowledge")  # an index write made by another process
+    assert AnswerCache.make_key("q", None, None, "AI_REASONING") != key
+
+
+def test_failed_shared_bump_still_invalidates_local_keys(monkeypatch, blob_client) -> None:
+    worker = IndexGenerations(blob_client, ttl_seconds=60)
+    monkeypatch.setattr(retrieval_cache, "get_index_generations", lambda: worker)
+    monkeypatch.setattr(retrieval_cache, "_unshared", set())
+    key = AnswerCache.make_key("q", None, None, "AI_REASONING")
+    blob_client.fail = True
+    bump_generation("case")
+    assert AnswerCache.make_key("q", None, None, "AI_REASONING") != key
+    blob_client.fail = False
+    bump_generation("case")
+    assert retrieval_cache._unshared == set()
+    assert AnswerCache.make_key("q", None, None, "AI_REASONING") != key
+
+
+def test_keys_are_process_local_without_shared_generations(monkeypatch) -> None:
+    monkeypatch.setattr(retrieval_cache, "get_index_generations", lambda: None)
+    key = AnswerCache.make_key("q", None, None, "AI_REASONING")
+    monkeypatch.setattr(retrieval_cache, "_BOOT_ID", "restarted")
+    assert AnswerCache.make_key("q", None, None, "AI_REASONING") != key
+
+
+def test_disk_errors_are_misses(tmp_path) -> None:
+    path = str(tmp_path / "answers.db")
+    key = AnswerCache.make_key("q", None, None, "AI_REASONING")
+    AnswerCache(16, 60, path).put(key, {"final_response": {"x": 1}})
+    cache = AnswerCache(16, 60, path)
+    with cache._disk._conn:
+        cache._disk._conn.execute("UPDATE answers SET value = 'not json'")
+    assert cache.get(key) is None
+    with cache._disk._conn:
+        cache._disk._conn.execute("DROP TABLE answers")
+    assert cache.get(key) is None and "disk_error" in cache.stats()
+    assert AnswerCache(16, 60, str(tmp_path / "missing" / "answers.db"))._disk is None
+
+
+def test_paraphrase_is_served_by_the_semantic_cache(cache) -> None:
+    graph = _FakeGraph()
+    first, hit = invoke_graph_cached(graph, {"question": "how are we doing this year?"}, "AI_REASONING")
+    assert not hit
+    again, hit = invoke_graph_cached(graph, {"question": "overall performance this year"}, "AI_REASONING")
+    assert hit and again["final_response"] == first["final_response"] and graph.calls == 1
+
+
+def test_concurrent_duplicates_share_one_graph_run(cache, monkeypatch) -> None:
+    flights = SingleFlight()
+    monkeypatch.setattr(answer_cache, "_flights", flights)
+    release = threading.Event()
+
+    class _Slow(_FakeGraph):
+        def invoke(self, state: dict) -> dict:
+            release.wait(5)
+            return super().invoke(state)
+
+    graph = _Slow()
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(invoke_graph_cached(graph, {"question": "Why?"}, "AI_REASONING"))
+        )
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    while flights.stats()["waiting"] < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert graph.calls == 1 and sorted(hit for _, hit in results) == [False, True, True, True]
+    assert all(r["final_response"] == results[0][0]["final_response"] for r, _ in results)
+    assert flights.stats()["coalesced"] == 3 and flights.stats()["in_flight"] == 0
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("langchain_community")
+
+from backend.gateway.case_manager import iter_bulk_import
+
+
+class FakeCaseServices:
+    """CaseEntryService + CaseIngestionService stand-in recording calls.
+
+    Cases listed in ``broken`` fail to index; every call holds the worker
+    for ``delay`` seconds so concurrent imports overlap.
+    """
+
+    def __init__(self, delay: float = 0.0, broken: tuple[str, ...] = ()) -> None:
+        self.delay = delay
+        self.broken = set(broken)
+        self.saved: list[tuple[str, dict]] = []
+        self.started = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def save_case_document(self, case_id: str, case_doc: dict) -> None:
+        with self._lock:
+            self.saved.append((case_id, case_doc))
+            self.started += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+
+    def ingest_closed_case(self, case_id: str) -> None:
+        with self._lock:
+            self.running -= 1
+        if case_id in self.broken:
+            raise RuntimeError(f"index rejected {case_id}")
+
+
+def _cases(*ids: str) -> list[dict]:
+    return [{"case_id": case_id, "case_doc": {"n": n}} for n, case_id in enumerate(ids)]
+
+
+def test_items_for_one_case_run_in_submission_order() -> None:
+    services = FakeCaseServices(delay=0.005)
+    cases = _cases("A", "B", "A", "C", "A")
+    results = list(iter_bulk_import(cases, services, services, max_workers=3))
+    assert [doc["n"] for case_id, doc in services.saved if case_id == "A"] == [0, 2, 4]
+    assert results[-1]["status"] == "bulk_imported"
+    assert results[-1]["imported"] == 5
+
+
+def test_failures_are_reported_per_case() -> None:
+    services = FakeCaseServices(broken=("B",))
+    cases = _cases("A", "B", "C") + [{"case_doc": {}}]
+    results = list(iter_bulk_import(cases, services, services, max_workers=2))
+    by_status = {r["case_id"]: r["status"] for r in results[:-1]}
+    assert by_status == {None: "failed", "A": "imported", "B": "failed", "C": "imported"}
+    assert "index rejected B" in next(r["error"] for r in results if r["case_id"] == "B")
+    assert (results[-1]["imported"], results[-1]["failed"]) == (2, 2)
+
+
+def test_in_flight_work_is_capped() -> None:
+    services = FakeCaseServices(delay=0.02)
+    results = list(iter_bulk_import(_cases(*"ABCDEFGH"), services, services, max_workers=3))
+    assert results[-1]["imported"] == 8
+    assert services.max_running == 3
+
+
+def test_slow_consumer_throttles_submission() -> None:
+    services = FakeCaseServices()
+    stream = iter_bulk_import(_cases(*"ABCDEFGH"), services, services, max_workers=2)
+    next(stream)
+    time.sleep(0.05)
+    assert services.started == 2
+    stream.close()
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("azure.storage.blob")
+
+from backend.storage.case_neighbours import CaseNeighbourStore, neighbour_entry
+
+
+def _entry(case_id: str, score: float) -> dict:
+    return neighbour_entry({"case_id": case_id, "organization_country": "AT"}, score)
+
+
+def test_save_ranks_and_truncates_to_top_n(blob_client) -> None:
+    store = CaseNeighbourStore(blob_client, top_n=2)
+    store.save("C1", "AT", [_entry("C2", 0.5), _entry("C3", 0.9), _entry("C4", 0.7)], [])
+    assert [e["case_id"] for e in store.neighbours("C1")] == ["C3", "C4"]
+    assert store.neighbours("C1", country="AT") == []
+    assert store.neighbours("C1", country="DE") is None
+
+
+def test_offer_inserts_only_when_candidate_ranks(blob_client) -> None:
+    store = CaseNeighbourStore(blob_client, top_n=2)
+    store.save("C1", "AT", [_entry("C2", 0.8), _entry("C3", 0.6)], [])
+
+    assert not store.offer("C1", _entry("C9", 0.5), "global")
+    assert store.offer("C1", _entry("C9", 0.7), "global")
+    assert [e["case_id"] for e in store.neighbours("C1")] == ["C2", "C9"]
+    # Lists that were never computed are left for the backfill.
+    assert not store.offer("C404", _entry("C9", 0.99), "global")
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("pydantic")
+
+from backend.reasoning.services.case_reranker import bm25_scores, select_cases_for_prompt
+
+
+def _case(case_id: str, text: str, score=None) -> dict:
+    return {"case_id": case_id, "problem_description": text, "score": score}
+
+
+def _words(text: str) -> int:
+    return len(text.split())
+
+
+def test_bm25_prefers_documents_with_rarer_query_terms() -> None:
+    docs = [["bearing", "noise"], ["bearing", "overheating"], ["pump", "leak"]]
+    scores = bm25_scores("bearing overheating", docs)
+    assert scores[1] > scores[0] > scores[2] == 0.0
+
+
+def test_mmr_skips_near_duplicates() -> None:
+    cases = [
+        _case("C1", "gearbox bearing overheating after grease change"),
+        _case("C2", "gearbox bearing overheating after grease change"),
+        _case("C3", "bearing overheating caused by misalignment"),
+    ]
+    picked = select_cases_for_prompt(
+        "bearing overheating", cases, token_budget=10_000, max_cases=2,
+        mmr_lambda=0.5, token_counter=_words,
+    )
+    ids = {c["case_id"] for c in picked}
+    assert "C3" in ids and not {"C1", "C2"} <= ids
+
+
+def test_token_budget_limits_selection_but_keeps_first_pick() -> None:
+    cases = [_case(f"C{i}", "bearing overheating " * 20, score=1.0 - i / 10) for i in range(4)]
+    picked = select_cases_for_prompt("bearing", cases, token_budget=1, token_counter=_words)
+    assert [c["case_id"] for c in picked] == ["C0"]
@@ -0,0 +1,89 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("azure.search.documents")
+
+from fastapi import HTTPException
+
+from backend.gateway.api import support_routes as routes
+from backend.gateway.api.schemas import CaseSearchRequest
+
+
+@pytest.fixture()
+def search(monkeypatch):
+    """The /cases/search endpoint over a fake index of ``calls["total"]`` cases."""
+    calls = {"total": 25, "pages": [], "lookups": []}
+
+    def search_cases_page(top, skip, select=None, **query):
+        calls["pages"].append({"top": top, "skip": skip, "select": select})
+        count = max(0, min(top, calls["total"] - skip))
+        return [{"case_id": f"TRM-20250000-{skip + i:04d}"} for i in range(count)], calls["total"]
+
+    def get_case_document(case_id, select=None):
+        calls["lookups"].append((case_id, select))
+        return {"case_id": case_id}
+
+    monkeypatch.setattr(routes, "search_cases_page", search_cases_page)
+    monkeypatch.setattr(routes, "get_case_document", get_case_document)
+    router = routes.build_support_router(None, None, None, knowledge_catalog=object())
+    endpoint = next(r.endpoint for r in router.routes if r.path == "/cases/search")
+
+    def run(**request):
+        return endpoint(CaseSearchRequest(**request))
+
+    run.calls = calls
+    return run
+
+
+def test_cursor_roundtrip() -> None:
+    fingerprint = routes._query_fingerprint("text", "pump", "full")
+    cursor = routes._encode_cursor(fingerprint, 40)
+    assert "=" not in cursor
+    assert routes._decode_cursor(cursor, fingerprint) == 40
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", routes._encode_cursor("abc", -1)])
+def test_malformed_cursor_is_rejected(cursor) -> None:
+    with pytest.raises(HTTPException) as exc:
+        routes._decode_cursor(cursor, "abc")
+    assert exc.value.status_code == 400
+
+
+def test_cursor_from_another_query_is_rejected() -> None:
+    cursor = routes._encode_cursor(routes._query_fingerprint("text", "pump", "full"), 10)
+    other = routes._query_fingerprint("text", "valve", "full")
+    with pytest.raises(HTTPException) as exc:
+        routes._decode_cursor(cursor, other)
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Cursor does not match this query"
+
+
+def test_pages_follow_the_cursor_to_the_end(search) -> None:
+    first = search(query="pump", limit=10)
+    second = search(query="pump", limit=10, cursor=first["next_cursor"])
+    third = search(query="pump", limit=10, cursor=second["next_cursor"])
+    assert [p["skip"] for p in search.calls["pages"]] == [0, 10, 20]
+    assert third["count"] == 5
+    assert third["next_cursor"] is None
+
+
+def test_cursor_reused_with_other_fields_is_rejected(search) -> None:
+    cursor = search(query="pump", limit=10)["next_cursor"]
+    with pytest.raises(HTTPException) as exc:
+        search(query="pump", limit=10, cursor=cursor, fields="compact")
+    assert exc.value.status_code == 400
+
+
+def test_no_cursor_past_the_skip_limit(search, monkeypatch) -> None:
+    monkeypatch.setattr(routes, "_MAX_SKIP", 25)
+    search.calls["total"] = 1000
+    first = search(query="pump", limit=10)
+    second = search(query="pump", limit=10, cursor=first["next_cursor"])
+    assert first["next_cursor"] is not None
+    assert second["next_cursor"] is None
+
+
+def test_case_id_lookup_honours_the_field_set(search) -> None:
+    result = search(query="trm-20250101-0001", search_type="case_id", fields="compact")
+    assert search.calls["lookups"] == [("TRM-20250101-0001", routes._FIELD_SETS["compact"])]
+    assert result["next_cursor"] is None
@@ -0,0 +1,58 @@
+import pytest
+
+from backend.storage.ingestion.chunking import _split_units, split_bounded, split_by_tokens
+
+
+def test_split_bounded_short_text_is_single_chunk() -> None:
+    assert split_bounded("  short report  ", max_chars=100) == ["short report"]
+
+
+def test_split_bounded_empty_text_returns_no_chunks() -> None:
+    assert split_bounded("   \n ", max_chars=100) == []
+
+
+def test_split_bounded_respects_max_chars() -> None:
+    text = " ".join(f"word{i}" for i in range(2000))
+    chunks = split_bounded(text, max_chars=300, overlap=50)
+    assert len(chunks) > 1
+    assert all(len(c) <= 300 for c in chunks)
+
+
+def test_split_bounded_prefers_paragraph_breaks() -> None:
+    para = "x" * 150
+    text = "\n\n".join([para, para, para])
+    chunks = split_bounded(text, max_chars=320, overlap=0)
+    assert chunks[0] == "\n\n".join([para, para])
+    assert chunks[1] == para
+
+
+def test_split_bounded_covers_all_words() -> None:
+    words = [f"w{i}" for i in range(500)]
+    chunks = split_bounded(" ".join(words), max_chars=120, overlap=30)
+    seen = set(" ".join(chunks).split())
+    assert seen == set(words)
+
+
+def test_split_units_measures_in_units_not_chars() -> None:
+    # Word-level units stand in for tokens: each window holds at most 10 words.
+    words = [f"word{i}" for i in range(95)]
+    text = " ".join(words)
+    starts = [0]
+    for w in words[:-1]:
+        starts.append(starts[-1] + len(w) + 1)
+    starts.append(len(text))
+    chunks = _split_units(text, starts, max_units=10, overlap=0)
+    assert all(len(c.split()) <= 10 for c in chunks)
+    assert " ".join(chunks).split() == words
+
+
+def test_split_by_tokens_respects_token_limit() -> None:
+    pytest.importorskip("tiktoken")
+    from backend.utils.tokens import count_tokens
+
+    text = "\n\n".join(
+        f"Paragraph {i}: the pump seal leaked after the torque check." for i in range(200)
+    )
+    chunks = split_by_tokens(text, max_tokens=64, overlap_tokens=8)
+    assert len(chunks) > 1
+    assert all(count_tokens(c) <= 64 for c in chunks)
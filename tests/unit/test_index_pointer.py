@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("azure.storage.blob")
+
+from backend.storage import cached_blob_json, index_pointer
+from backend.storage.index_pointer import IndexPointer
+
+
+@pytest.fixture()
+def pointers(blob_client):
+    blob_client.upload_json(
+        IndexPointer.POINTER_PATH, json.dumps({"case_index": {"active": "case_index-2"}})
+    )
+    return blob_client
+
+
+def test_failed_refresh_keeps_last_mapping_and_backs_off(monkeypatch, pointers) -> None:
+    now = [0.0]
+    monkeypatch.setattr(cached_blob_json.time, "monotonic", lambda: now[0])
+    pointer = IndexPointer(pointers, ttl_seconds=30)
+    assert pointer.resolve("case_index") == "case_index-2"
+
+    pointers.fail = True
+    now[0] = 31.0
+    assert pointer.resolve("case_index") == "case_index-2"
+    assert pointer.resolve("case_index") == "case_index-2"
+    assert pointers.reads == 2  # no retry within the backoff
+
+    pointers.fail = False
+    pointers.upload_json(
+        IndexPointer.POINTER_PATH, json.dumps({"case_index": {"active": "case_index-3"}})
+    )
+    now[0] = 31.0 + cached_blob_json._RETRY_BACKOFF_SECONDS
+    assert pointer.resolve("case_index") == "case_index-3"
+
+
+def test_first_load_failure_falls_back_to_logical_name(monkeypatch, pointers) -> None:
+    pointers.fail = True
+    monkeypatch.setattr(index_pointer, "get_index_pointer", lambda: IndexPointer(pointers))
+    assert index_pointer.resolve_index_name("case_index") == "case_index"
+
+
+def test_swap_retries_a_conflicting_write_and_keeps_both_updates(pointers) -> None:
+    pointer, other = IndexPointer(pointers), IndexPointer(pointers)
+    pointers.interleave.append(lambda: other.swap("knowledge_index", "knowledge_index-7"))
+    assert pointer.swap("case_index", "case_index-3") == "case_index-2"
+    assert pointer.resolve("case_index") == "case_index-3"
+    assert pointer.get("knowledge_index")["active"] == "knowledge_index-7"
+    assert pointer.get("case_index")["previous"] == ["case_index-2"]
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+pytest.importorskip("azure.storage.blob")
+
+from backend.storage.blob_storage import BlobWriteConflict
+from backend.storage.knowledge_catalog import KnowledgeCatalog, build_catalog_entry
+
+
+def _entry(source: str) -> dict:
+    return build_catalog_entry(
+        source=source,
+        doc_id=source.split(".")[0],
+        title=source,
+        created_at="2025-01-01T00:00:00Z",
+        size_bytes=100,
+        content_type="application/pdf",
+        section_count=2,
+        small_chunk_count=3,
+        has_text=True,
+    )
+
+
+@pytest.fixture()
+def catalog(blob_client):
+    catalog = KnowledgeCatalog(blob_client)
+    catalog._scan_index = lambda: {}
+    return catalog
+
+
+def _manifest(blob_client) -> dict:
+    return json.loads(blob_client.blobs[KnowledgeCatalog.CATALOG_PATH][0])["documents"]
+
+
+def test_upsert_merges_with_a_concurrent_writer(blob_client, catalog) -> None:
+    catalog.upsert(_entry("pump.pdf"))
+    other = KnowledgeCatalog(blob_client)
+    blob_client.interleave.append(lambda: other.upsert(_entry("valve.pdf")))
+    catalog.upsert(_entry("seal.pdf"))
+    assert sorted(_manifest(blob_client)) == ["pump.pdf", "seal.pdf", "valve.pdf"]
+
+
+def test_remove_keeps_a_concurrent_upsert(blob_client, catalog) -> None:
+    catalog.upsert(_entry("pump.pdf"))
+    other = KnowledgeCatalog(blob_client)
+    blob_client.interleave.append(lambda: other.upsert(_entry("valve.pdf")))
+    assert catalog.remove("pump.pdf") is True
+    assert list(_manifest(blob_client)) == ["valve.pdf"]
+    assert catalog.remove("pump.pdf") is False
+
+
+def test_gives_up_when_every_write_conflicts(blob_client, catalog) -> None:
+    catalog.upsert(_entry("pump.pdf"))
+    path = KnowledgeCatalog.CATALOG_PATH
+
+    def rewrite() -> None:
+        blob_client.upload_json(path, blob_client.blobs[path][0])
+
+    blob_client.interleave.extend([rewrite] * 8)
+    with pytest.raises(BlobWriteConflict):
+        catalog.upsert(_entry("seal.pdf"))
+    assert "seal.pdf" not in _manifest(blob_client)
+
+
+def test_missing_manifest_is_rebuilt_once(blob_client, catalog) -> None:
+    scans = []
+    catalog._scan_index = lambda: scans.append(1) or {"pump.pdf": _entry("pump.pdf")}
+    total, rows = catalog.list_documents()
+    assert (total, [r["source"] for r in rows]) == (1, ["pump.pdf"])
+    catalog.list_documents()
+    assert len(scans) == 1
+
+
+def test_list_documents_pages_by_source_name(catalog) -> None:
+    for source in ("b.pdf", "A.pdf", "c.pdf"):
+        catalog.upsert(_entry(source))
+    total, rows = catalog.list_documents(offset=1, limit=1)
+    assert total == 3
+    assert [r["source"] for r in rows] == ["b.pdf"]
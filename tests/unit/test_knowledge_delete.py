@@ -0,0 +1,88 @@
+import re
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("azure.search.documents")
+pytest.importorskip("langchain_community")
+
+from backend.knowledge import knowledge_search_client as ksc
+
+
+class FakeSearchClient:
+    """Knowledge index of ``{doc_id: source}`` supporting source filters and paging.
+
+    ``stuck`` holds doc ids whose first delete is acknowledged but not applied,
+    like a delete that is not yet visible to queries.
+    """
+
+    def __init__(self, docs: dict[str, str]) -> None:
+        self.docs = dict(docs)
+        self.stuck: set[str] = set()
+        self.batches: list[int] = []
+        self._lock = threading.Lock()
+
+    def _matching(self, filter):
+        source = re.fullmatch(r"source eq '(.*)'", filter).group(1).replace("''", "'")
+        return sorted(d for d, s in self.docs.items() if s == source)
+
+    def search(self, search_text, filter, select=None, top=50, skip=0, include_total_count=False):
+        ids = self._matching(filter)
+        if include_total_count:
+            return SimpleNamespace(get_count=lambda: len(ids))
+        return [{"doc_id": d} for d in ids[skip : skip + top]]
+
+    def delete_documents(self, documents):
+        with self._lock:
+            self.batches.append(len(documents))
+            for doc in documents:
+                if doc["doc_id"] in self.stuck:
+                    self.stuck.discard(doc["doc_id"])
+                else:
+                    self.docs.pop(doc["doc_id"], None)
+        return [SimpleNamespace(succeeded=True) for _ in documents]
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(ksc, "_PAGE_SIZE", 10)
+    monkeypatch.setattr(ksc, "_DELETE_BATCH_SIZE", 10)
+    monkeypatch.setattr(ksc, "_DELETE_VERIFY_DELAY_S", 0.0)
+    bumps = []
+    monkeypatch.setattr(ksc, "bump_generation", bumps.append)
+    return bumps
+
+
+def _index(count: int, source: str = "manual.pdf") -> dict[str, str]:
+    return {f"{source}_{i:03d}": source for i in range(count)}
+
+
+def test_deletes_every_page_of_a_source(small_pages) -> None:
+    client = FakeSearchClient({**_index(35), **_index(4, "other.pdf")})
+    assert ksc.delete_knowledge_by_source("manual.pdf", client) == 35
+    assert sorted(set(client.docs.values())) == ["other.pdf"]
+    assert sorted(client.batches) == [5, 10, 10, 10]
+    assert small_pages == ["knowledge"]
+
+
+def test_unknown_source_deletes_nothing(small_pages) -> None:
+    client = FakeSearchClient(_index(3))
+    assert ksc.delete_knowledge_by_source("missing.pdf", client) == 0
+    assert client.batches == []
+    assert small_pages == []
+
+
+def test_chunks_still_visible_are_deleted_again() -> None:
+    client = FakeSearchClient(_index(12))
+    client.stuck = {"manual.pdf_003", "manual.pdf_011"}
+    assert ksc.delete_knowledge_by_source("manual.pdf", client) == 12
+    assert client.docs == {}
+    assert client.batches[-1] == 2
+
+
+def test_raises_when_chunks_survive_the_retries(monkeypatch) -> None:
+    client = FakeSearchClient(_index(3))
+    monkeypatch.setattr(client, "delete_documents", lambda documents: [])
+    with pytest.raises(RuntimeError, match="3 chunk"):
+        ksc.delete_knowledge_by_source("manual.pdf", client)
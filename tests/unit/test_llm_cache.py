@@ -0,0 +1,105 @@
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("langchain_openai")
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_openai import AzureChatOpenAI
+from pydantic import BaseModel
+
+import backend.core.llm as llm_module
+from backend.core import llm_cache
+from backend.core.config import settings
+from backend.core.llm_cache import LLMCallCache, make_key
+
+
+class _Verdict(BaseModel):
+    label: str
+    confidence: float
+
+
+def _result(text: str) -> ChatResult:
+    return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+def test_key_covers_deployment_messages_and_schema() -> None:
+    messages = [SystemMessage(content="classify"), HumanMessage(content="pump trips")]
+    key = make_key("gpt-4o-mini", messages, None, {"response_format": _Verdict})
+    assert key == make_key("gpt-4o-mini", list(messages), None, {"response_format": _Verdict})
+    assert key != make_key("gpt-4o", messages, None, {"response_format": _Verdict})
+    assert key != make_key("gpt-4o-mini", messages[:1], None, {"response_format": _Verdict})
+    assert key != make_key("gpt-4o-mini", messages, None, {})
+
+
+def test_lru_and_size_eviction(tmp_path, clock) -> None:
+    cache = LLMCallCache(str(tmp_path / "calls.db"), max_entries=2, max_bytes=10_000, clock=clock)
+    for key in "ab":
+        clock.advance(1)
+        cache.put(key, _result(key))
+    clock.advance(1)
+    assert cache.get("a") is not None       # a is now more recent than b
+    clock.advance(1)
+    cache.put("c", _result("c"))
+    assert cache.get("b") is None and cache.get("a").generations[0].message.content == "a"
+
+    size = cache.stats()["bytes"] // 2
+    small = LLMCallCache(":memory:", max_entries=100, max_bytes=size * 2, clock=clock)
+    for key in "xyz":
+        clock.advance(1)
+        small.put(key, _result(key))
+    assert small.stats()["entries"] == 2 and small.get("x") is None and small.evictions == 1
+
+
+def test_entries_persist_to_disk(tmp_path) -> None:
+    path = str(tmp_path / "calls.db")
+    LLMCallCache(path, 10, 10_000).put("k", _result("cached"))
+    assert LLMCallCache(path, 10, 10_000).get("k").generations[0].message.content == "cached"
+
+
+def test_database_errors_are_misses_and_skipped_writes(tmp_path) -> None:
+    cache = LLMCallCache(str(tmp_path / "calls.db"), 10, 10_000)
+    cache.put("k", _result("cached"))
+    with cache._conn:
+        cache._conn.execute("DROP TABLE llm_calls")
+    cache.put("k", _result("again"))
+    assert cache.get("k") is None and cache.misses == 1
+    assert cache.stats()["entries"] is None and cache.stats()["error"]
+
+
+def test_unopenable_path_falls_back_to_memory(monkeypatch, tmp_path) -> None:
+    (tmp_path / "file").write_text("")
+    monkeypatch.setattr(settings, "LLM_CACHE_PATH", str(tmp_path / "file" / "calls.db"))
+    monkeypatch.setattr(llm_cache, "_cache", None)
+    cache = llm_cache.get_llm_cache()
+    cache.put("k", _result("cached"))
+    assert cache.stats()["path"] == ":memory:" and cache.get("k") is not None
+
+
+def test_temperature_zero_structured_calls_hit_the_cache(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test")
+    monkeypatch.setattr(llm_module, "count_tokens", lambda text: len(text.split()))
+    monkeypatch.setattr(llm_cache, "_cache", LLMCallCache(str(tmp_path / "calls.db"), 10, 100_000))
+    calls = []
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(self.temperature)
+        verdict = _Verdict(label="operational", confidence=0.9)
+        message = AIMessage(content=verdict.model_dump_json(), additional_kwargs={"parsed": verdict})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    monkeypatch.setattr(AzureChatOpenAI, "_generate", fake_generate)
+    provider = llm_module.LLMProvider()
+    backend = llm_module.LLMBackend("https://weu.example.com", "gpt-4o-mini")
+    prompt = [SystemMessage(content="classify"), HumanMessage(content="pump trips")]
+
+    llm = provider.get_pool_llm((backend,), 0.0)
+    first = llm.with_structured_output(_Verdict).invoke(prompt)
+    again = llm.with_structured_output(_Verdict).invoke(prompt)
+    assert first == again == _Verdict(label="operational", confidence=0.9)
+    assert calls == [0.0]
+
+    warm = provider.get_pool_llm((backend,), 0.2)
+    warm.with_structured_output(_Verdict).invoke(prompt)
+    warm.with_structured_output(_Verdict).invoke(prompt)
+    assert calls == [0.0, 0.2, 0.2]
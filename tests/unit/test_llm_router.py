@@ -0,0 +1,119 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from backend.core.llm_router import BackendPool, LLMBackend, parse_backends
+
+
+_A = LLMBackend("https://weu.example.com", "gpt-4o")
+_B = LLMBackend("https://sec.example.com", "gpt-4o")
+
+
+def test_parse_backends() -> None:
+    pools = parse_backends(
+        "reasoning=https://a.example.com|gpt-4o;https://b.example.com|gpt-4o|KEY_B,"
+        "intent=https://a.example.com|gpt-4o-mini"
+    )
+    assert pools["reasoning"][1] == LLMBackend("https://b.example.com", "gpt-4o", "KEY_B")
+    assert pools["intent"] == (LLMBackend("https://a.example.com", "gpt-4o-mini"),)
+    assert _A.key == "weu.example.com/gpt-4o"
+
+
+def test_choose_prefers_low_latency_and_quota_headroom() -> None:
+    headroom = {_A.key: 1.0, _B.key: 1.0}
+    pool = BackendPool([_A, _B], headroom=headroom.get, ewma_alpha=0.5)
+    pool.record_success(_A, 2.0)
+    pool.record_success(_B, 1.0)
+    assert pool.choose() == _B
+    # B is nearly out of quota: A's higher latency is now the better deal.
+    headroom[_B.key] = 0.1
+    assert pool.choose() == _A
+
+
+def test_failed_backend_is_ejected_then_restored(clock) -> None:
+    pool = BackendPool([_A, _B], eject_seconds=30, clock=clock)
+    pool.record_success(_A, 0.1)
+    pool.record_success(_B, 0.5)
+    pool.record_failure(_A)
+    assert pool.choose() == _B
+    assert pool.choose(exclude=[_B]) == _A  # nothing healthy left: least-ejected
+    clock.now = 31.0
+    assert pool.choose() == _A
+    pool.record_failure(_A, retry_after=5.0)
+    assert pool.stats()[0]["ejected_for_seconds"] == 5.0
+
+
+class _FakeAzureOpenAI(BaseHTTPRequestHandler):
+    """Minimal Azure OpenAI chat-completions endpoint."""
+
+    status = 200
+    calls = 0
+
+    def do_POST(self) -> None:  # noqa: N802
+        type(self).calls += 1
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        if self.status != 200:
+            body = json.dumps({"error": {"code": str(self.status), "message": "busy"}})
+            self.send_response(self.status)
+            self.send_header("retry-after", "20")
+        else:
+            body = json.dumps({
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": f"ok from {self.server.server_port}"},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8},
+            })
+            self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _serve(status: int) -> ThreadingHTTPServer:
+    handler = type("Handler", (_FakeAzureOpenAI,), {"status": status, "calls": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_routed_llm_fails_over_from_throttled_endpoint(monkeypatch) -> None:
+    pytest.importorskip("langchain_openai")
+    import backend.core.llm as llm_module
+
+    throttled, healthy = _serve(429), _serve(200)
+    try:
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test")
+        monkeypatch.setattr(llm_module, "count_tokens", lambda text: len(text.split()))
+        monkeypatch.setattr(llm_module.settings, "LLM_CACHE_ENABLED", False)
+        backends = (
+            LLMBackend(f"http://127.0.0.1:{throttled.server_port}", "gpt-4o"),
+            LLMBackend(f"http://127.0.0.1:{healthy.server_port}", "gpt-4o"),
+        )
+        provider = llm_module.LLMProvider()
+        llm = provider.get_pool_llm(backends, 0.0)
+
+        assert llm.invoke("hi").content == f"ok from {healthy.server_port}"
+        assert throttled.RequestHandlerClass.calls == 1
+        # The throttled region is ejected for its Retry-After: no second attempt.
+        assert llm.invoke("hi again").content == f"ok from {healthy.server_port}"
+        assert throttled.RequestHandlerClass.calls == 1
+
+        stats = provider.pool_for(backends).stats()
+        assert [s["healthy"] for s in stats] == [False, True]
+    finally:
+        throttled.shutdown()
+        healthy.shutdown()
@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+from backend.core.llm_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    LLMQueueTimeout,
+    LLMScheduler,
+    TokenBucket,
+    parse_quotas,
+    retry_after_seconds,
+)
+
+
+class _Response:
+    def __init__(self, headers: dict) -> None:
+        self.headers = headers
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code: int, headers: dict | None = None) -> None:
+        super().__init__(status_code)
+        self.status_code = status_code
+        self.response = _Response(headers or {})
+
+
+def test_token_bucket_refills_and_reports_delay(clock) -> None:
+    bucket = TokenBucket(capacity=100, per_second=10, clock=clock)
+    bucket.take(100)
+    assert bucket.delay_for(50) == pytest.approx(5.0)
+    clock.now = 5.0
+    assert bucket.delay_for(50) == 0.0
+    # Requests larger than the bucket are clamped instead of waiting forever.
+    clock.now = 100.0
+    assert bucket.delay_for(1_000) == 0.0
+
+
+def test_parse_quotas_and_retry_after() -> None:
+    assert parse_quotas("gpt-4o=150000/900, mini=30000,bad") == {
+        "gpt-4o": (150000, 900),
+        "mini": (30000, 0),
+    }
+    assert retry_after_seconds(_HTTPError(429, {"retry-after": "7"})) == 7.0
+    assert retry_after_seconds(_HTTPError(429, {"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(_HTTPError(429)) is None
+
+
+def test_interactive_requests_are_admitted_before_background() -> None:
+    # 60 TPM -> 10-token buckets refilled at 1 token/s; the first call drains it.
+    scheduler = LLMScheduler(default_tpm=60, default_rpm=6000)
+    first = scheduler.acquire("d", 10, PRIORITY_INTERACTIVE)
+    order: list[str] = []
+
+    def worker(name: str, priority: int) -> None:
+        scheduler.release(scheduler.acquire("d", 1, priority), 1)
+        order.append(name)
+
+    background = threading.Thread(target=worker, args=("background", PRIORITY_BACKGROUND))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=worker, args=("interactive", PRIORITY_INTERACTIVE))
+    interactive.start()
+    time.sleep(0.05)
+    assert scheduler.stats()["d"]["queue_depth"] == 2
+
+    scheduler.release(first, actual_tokens=0)  # refund makes room immediately
+    background.join(5)
+    interactive.join(5)
+    assert order == ["interactive", "background"]
+
+
+def test_throttled_call_is_retried_after_pause() -> None:
+    scheduler = LLMScheduler(default_tpm=600_000, max_retries=2)
+    calls = []
+
+    def call() -> str:
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise _HTTPError(429, {"retry-after-ms": "100"})
+        return "ok"
+
+    assert scheduler.run("d", 10, call) == "ok"
+    assert calls[1] - calls[0] >= 0.09
+    assert scheduler.stats()["d"]["throttled"] == 1
+
+    def bad_request() -> str:
+        raise _HTTPError(400)
+
+    with pytest.raises(_HTTPError):
+        scheduler.run("d", 10, bad_request)
+
+
+def test_queue_timeout() -> None:
+    scheduler = LLMScheduler(default_tpm=6, queue_timeout=0.05)
+    scheduler.acquire("d", 1)
+    with pytest.raises(LLMQueueTimeout):
+        scheduler.acquire("d", 1)
+    assert scheduler.stats()["d"]["queue_depth"] == 0
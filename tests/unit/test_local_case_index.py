@@ -0,0 +1,93 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from backend.knowledge.local_case_index import LocalCaseIndex
+
+
+def _doc(case_id: str, vector: list[float], country: str = "AT", updated_at: str = "2025-01-01T00:00:00Z") -> dict:
+    return {
+        "case_id": case_id,
+        "organization_country": country,
+        "problem_description": f"problem {case_id}",
+        "embedding": vector,
+        "updated_at": updated_at,
+    }
+
+
+def test_search_ranks_by_cosine_and_applies_filters(tmp_path) -> None:
+    index = LocalCaseIndex(str(tmp_path))
+    index.upsert(
+        [
+            _doc("C1", [1.0, 0.0]),
+            _doc("C2", [0.8, 0.2], country="DE"),
+            _doc("C3", [0.0, 1.0]),
+        ]
+    )
+    hits = index.search([1.0, 0.0], top_k=2)
+    assert [h["case_id"] for h in hits] == ["C1", "C2"]
+    assert hits[0]["@search.score"] == pytest.approx(1.0)
+
+    assert [h["case_id"] for h in index.search([1.0, 0.0], 5, country="AT")] == ["C1", "C3"]
+    assert [h["case_id"] for h in index.search([1.0, 0.0], 1, exclude_case_id="C1")] == ["C2"]
+
+
+def test_replica_survives_reload_and_upserts_by_case_id(tmp_path) -> None:
+    index = LocalCaseIndex(str(tmp_path))
+    index.upsert([_doc("C1", [1.0, 0.0]), _doc("C2", [0.0, 1.0])])
+    index.upsert([_doc("C2", [1.0, 0.1])])
+
+    reloaded = LocalCaseIndex(str(tmp_path))
+    assert reloaded.load()
+    assert reloaded.size == 2
+    assert {h["case_id"] for h in reloaded.search([1.0, 0.0], 2)} == {"C1", "C2"}
+
+
+def test_writers_sharing_a_directory_keep_each_others_files(tmp_path) -> None:
+    api, script = LocalCaseIndex(str(tmp_path)), LocalCaseIndex(str(tmp_path))
+    api.upsert([_doc("C1", [1.0, 0.0])])
+    first = set(tmp_path.iterdir())
+    script.upsert([_doc("C2", [0.0, 1.0])], replace=True)
+    assert first <= set(tmp_path.iterdir())  # the API's mapped generation survives
+    script_files = set(tmp_path.iterdir()) - first
+
+    api.upsert([_doc("C3", [1.0, 1.0])])
+    remaining = set(tmp_path.iterdir())
+    assert script_files <= remaining and not any(p.name.endswith(".tmp") for p in remaining)
+    assert len([p for p in remaining if p.name.startswith("vectors-")]) == 2
+
+
+def test_sync_is_incremental_and_resets_on_source_change(tmp_path) -> None:
+    calls: list = []
+
+    def fetch(since):
+        calls.append(since)
+        if since is None:
+            return [_doc("C1", [1.0, 0.0], updated_at="2025-01-01T00:00:00Z")]
+        return [_doc("C2", [0.0, 1.0], updated_at="2025-02-01T00:00:00Z")]
+
+    index = LocalCaseIndex(str(tmp_path))
+    index.sync(fetch, "case_index_v3")
+    index.sync(fetch, "case_index_v3")
+    assert calls == [None, "2025-01-01T00:00:00Z"]
+    assert index.size == 2
+    assert index.state["watermark"] == "2025-02-01T00:00:00Z"
+
+    index.sync(fetch, "case_index_v3-20260101000000")
+    assert calls[-1] is None
+    assert index.size == 1
+
+
+def test_sync_without_changes_writes_nothing(tmp_path) -> None:
+    def fetch(since):
+        # The watermark boundary is inclusive: the newest case comes back.
+        return [_doc("C1", [1.0, 0.0], updated_at="2025-01-01T00:00:00Z")]
+
+    index = LocalCaseIndex(str(tmp_path))
+    index.sync(fetch, "case_index_v3")
+    files = sorted(p.name for p in tmp_path.iterdir())
+    mtime = (tmp_path / "records.json").stat().st_mtime_ns
+
+    assert index.sync(fetch, "case_index_v3") == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == files
+    assert (tmp_path / "records.json").stat().st_mtime_ns == mtime
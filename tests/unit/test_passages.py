@@ -0,0 +1,30 @@
+from backend.knowledge.passages import best_passage, query_terms
+
+
+_SECTION = (
+    "Bearings are delivered in sealed packaging. Store them in a dry room. "
+    "Mounting requires a clean workbench and the correct press tools. "
+    "Lubrication with the wrong grease causes early overheating of the bearing. "
+    "Check grease compatibility before relubrication to prevent overheating. "
+    "Dismounting is described in chapter nine."
+)
+
+
+def test_query_terms_drop_stopwords_and_case() -> None:
+    assert query_terms("Why is the Bearing overheating?") == {"bearing", "overheating"}
+
+
+def test_short_text_is_returned_whole() -> None:
+    assert best_passage("Short section.", "anything", max_chars=100) == "Short section."
+
+
+def test_picks_window_covering_most_query_terms() -> None:
+    passage = best_passage(_SECTION, "bearing overheating grease", max_chars=150)
+    assert passage.startswith("…Lubrication with the wrong grease")
+    assert "relubrication" in passage
+    assert len(passage) <= 150
+
+
+def test_falls_back_to_head_without_matches() -> None:
+    passage = best_passage(_SECTION, "hydraulic pump", max_chars=60)
+    assert passage == "Bearings are delivered in sealed packaging. Store them in a"
@@ -0,0 +1,22 @@
+from backend.utils.prefix_trie import PrefixTrie
+
+
+def test_search_is_case_insensitive_and_deduplicates_values() -> None:
+    trie: PrefixTrie = PrefixTrie()
+    case = ("TRM-20250101-0001", "Linz", "AT")
+    for key in case:
+        trie.insert(key, case)
+    trie.insert("TRM-20250102-0002", ("TRM-20250102-0002", "Graz", "AT"))
+
+    assert trie.search("trm-2025", limit=5) == [case, ("TRM-20250102-0002", "Graz", "AT")]
+    assert trie.search("li") == [case]
+    assert trie.search("a") == [case]  # "at" matches once, not per key
+    assert trie.search("x") == []
+
+
+def test_shorter_keys_come_first_and_limit_applies() -> None:
+    trie: PrefixTrie = PrefixTrie()
+    for key in ("abcd", "ab", "abc"):
+        trie.insert(key, key)
+    assert trie.search("ab") == ["ab", "abc", "abcd"]
+    assert trie.search("ab", limit=2) == ["ab", "abc"]
@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("azure.core")
+
+from azure.core.exceptions import HttpResponseError, ServiceRequestError
+
+from backend.core.config import settings
+from backend.knowledge import resilience
+from backend.knowledge.resilience import (
+    CircuitBreaker,
+    DegradedList,
+    resilient_search,
+    track_degraded,
+)
+
+
+@pytest.fixture(autouse=True)
+def _test_guards():
+    # resilient_search registers guards globally; keep test ones out of
+    # /admin/search-resilience.
+    yield
+    for name in [n for n in resilience._guards if n.startswith("test.")]:
+        del resilience._guards[name]
+
+
+@pytest.fixture(autouse=True)
+def _fast_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_DEADLINE_SECONDS", 0.3)
+    monkeypatch.setattr(settings, "SEARCH_HEDGE_MIN_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "SEARCH_BREAKER_FAILURES", 2)
+
+
+def test_breaker_opens_then_allows_one_trial(clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    clock.now = 10.0
+    assert breaker.allow()       # the half-open trial
+    assert not breaker.allow()   # ...and only one
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_deadline_degrades_to_last_good_result() -> None:
+    slow = threading.Event()
+
+    @resilient_search("test.deadline", hedge=False)
+    def search(query: str) -> list:
+        if slow.is_set():
+            time.sleep(1.0)
+        return [query]
+
+    assert search("pump") == ["pump"]
+    slow.set()
+    result = search("pump")
+    assert isinstance(result, DegradedList) and result == ["pump"]
+    assert search("valve") == []
+    assert search.guard.timeouts == 2
+
+
+def test_outages_open_the_breaker_but_bad_requests_propagate() -> None:
+    calls = []
+
+    @resilient_search("test.breaker", hedge=False)
+    def search(query: str) -> list:
+        calls.append(query)
+        if query == "bad":
+            raise HttpResponseError(message="invalid filter")
+        raise ServiceRequestError("connection refused")
+
+    with pytest.raises(HttpResponseError):
+        search("bad")
+    assert search("a") == [] and search("b") == []
+    assert search("c") == [] and calls == ["bad", "a", "b"]  # short-circuited
+    assert search.guard.short_circuits == 1
+
+
+def test_degraded_calls_are_tracked() -> None:
+    @resilient_search("test.tracked", hedge=False)
+    def search(query: str) -> list:
+        if query == "down":
+            raise ServiceRequestError("connection refused")
+        return [query]
+
+    with track_degraded() as degraded:
+        search("up")
+        assert degraded == []
+        search("down")
+    assert degraded == ["test.tracked"]
+    search("down")  # outside a tracked block
+    assert degraded == ["test.tracked"]
+
+
+def test_slow_call_is_hedged_after_p95() -> None:
+    attempts = []
+    lock = threading.Lock()
+
+    @resilient_search("test.hedge")
+    def search(query: str) -> list:
+        with lock:
+            attempts.append(query)
+            first_slow = query == "slow" and attempts.count("slow") == 1
+        time.sleep(0.25 if first_slow else 0.001)
+        return [query]
+
+    for _ in range(resilience._MIN_SAMPLES_FOR_HEDGE):
+        search("fast")
+    start = time.monotonic()
+    assert search("slow") == ["slow"]
+    assert time.monotonic() - start < 0.2
+    assert search.guard.hedges == 1 and search.guard.hedge_wins == 1
+
+
+def test_no_hedge_without_an_idle_worker(monkeypatch) -> None:
+    monkeypatch.setattr(resilience, "_has_idle_worker", lambda: False)
+    slow = threading.Event()
+
+    @resilient_search("test.saturated")
+    def search(query: str) -> list:
+        time.sleep(0.05 if slow.is_set() else 0.001)
+        return [query]
+
+    for _ in range(resilience._MIN_SAMPLES_FOR_HEDGE):
+        search("fast")
+    slow.set()
+    assert search("slow") == ["slow"]
+    assert search.guard.hedges == 0 and search.guard.hedges_skipped == 1
+
+
+def test_deadline_caps_sdk_request_timeouts(monkeypatch) -> None:
+    from azure.core.pipeline.transport import RequestsTransport
+
+    from backend.core.http_transport import get_azure_transport, request_deadline
+
+    sent = {}
+    monkeypatch.setattr(RequestsTransport, "send", lambda self, request, **kw: sent.update(kw))
+    transport = get_azure_transport("https://search.example.com")
+    transport.send(None)
+    assert sent == {}
+    with request_deadline(time.monotonic() + 2.0):
+        transport.send(None)
+    assert sent["read_timeout"] <= 2.0 and sent["connection_timeout"] <= 2.0
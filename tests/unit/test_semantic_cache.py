@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from backend.gateway.semantic_cache import SemanticAnswerCache, guard_terms
+
+
+def test_guard_terms_keep_time_and_negation_words() -> None:
+    assert guard_terms("How are we doing this year?") == {"this", "year"}
+    assert guard_terms("Cases without containment in 2024") == {"without", "2024"}
+
+
+def test_guard_terms_keep_alphanumeric_and_entity_tokens() -> None:
+    assert guard_terms("status of D4") == {"d4"}
+    assert guard_terms("open cases in Linz", frozenset({"linz", "graz"})) == {"linz"}
+
+
+def test_paraphrase_above_threshold_is_a_hit() -> None:
+    cache = SemanticAnswerCache(threshold=0.9, ttl_seconds=60)
+    cache.add("scope", "how are we doing this year?", [1.0, 0.1, 0.0], {"answer": 1})
+
+    hit = cache.lookup("scope", "overall performance this year", [0.98, 0.15, 0.0])
+    assert hit is not None and hit[0] == {"answer": 1} and hit[1] > 0.9
+    assert cache.lookup("other-scope", "overall performance this year", [1.0, 0.1, 0.0]) is None
+    assert cache.lookup("scope", "who owns the case", [0.0, 1.0, 0.0]) is None
+
+
+def test_guard_words_block_near_identical_embeddings() -> None:
+    cache = SemanticAnswerCache(threshold=0.9, ttl_seconds=60)
+    cache.add("scope", "how are we doing this year?", [1.0, 0.1, 0.0], {"answer": 1})
+    assert cache.lookup("scope", "how did we do last year?", [1.0, 0.1, 0.0]) is None
+
+
+@pytest.mark.parametrize(
+    ("stored", "asked"),
+    [("open cases in Linz", "open cases in Graz"), ("status of D4", "status of D5")],
+)
+def test_different_entities_or_codes_do_not_share_answers(stored, asked) -> None:
+    cache = SemanticAnswerCache(
+        threshold=0.9, ttl_seconds=60, entities=lambda: frozenset({"linz", "graz", "austria"})
+    )
+    cache.add("scope", stored, [1.0, 0.1, 0.0], {"answer": 1})
+    assert cache.lookup("scope", asked, [1.0, 0.1, 0.0]) is None
+    assert cache.lookup("scope", stored.upper(), [1.0, 0.1, 0.0]) is not None
+
+
+def test_entity_vocabulary_is_read_once_per_call_with_precomputed_terms() -> None:
+    reads = []
+    cache = SemanticAnswerCache(
+        threshold=0.9, ttl_seconds=60, entities=lambda: reads.append(1) or frozenset({"linz"})
+    )
+    terms = cache.guard("open cases in Linz")
+    cache.lookup("scope", "open cases in Linz", [1.0, 0.0], terms)
+    cache.add("scope", "open cases in Linz", [1.0, 0.0], {"answer": 1}, terms)
+    assert terms == {"linz"} and len(reads) == 1
+
+
+def test_entries_expire_and_scopes_are_bounded(clock) -> None:
+    cache = SemanticAnswerCache(threshold=0.9, ttl_seconds=10, max_per_scope=2, max_scopes=1, clock=clock)
+    cache.add("a", "q1", [1.0, 0.0], {"n": 1})
+    cache.add("a", "q2", [0.0, 1.0], {"n": 2})
+    cache.add("a", "q3", [0.7, 0.7], {"n": 3})
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup("a", "q1", [1.0, 0.0]) is None  # evicted
+    clock.now = 11.0
+    assert cache.lookup("a", "q2", [0.0, 1.0]) is None  # expired
+    cache.add("b", "q", [1.0, 0.0], {"n": 4})
+    assert cache.stats()["scopes"] == 1
@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from backend.utils.single_flight import SingleFlight
+
+
+def _start_waiters(flights: SingleFlight, key: str, fn, n: int) -> tuple[list, list]:
+    outcomes = []
+
+    def call():
+        try:
+            outcomes.append(flights.do(key, fn))
+        except Exception as exc:
+            outcomes.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, outcomes
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    flights = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        release.wait(5)
+        return "done"
+
+    threads, outcomes = _start_waiters(flights, "k", work, 5)
+    while flights.stats()["waiting"] < 4:
+        release.wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(runs) == 1
+    assert sorted(outcomes, key=lambda o: o[1]) == [("done", False)] + [("done", True)] * 4
+    assert flights.stats() == {
+        "executions": 1, "coalesced": 4, "coalesced_ratio": 0.8, "in_flight": 0, "waiting": 0,
+    }
+
+
+def test_leader_error_reaches_waiters_and_key_is_released() -> None:
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, outcomes = _start_waiters(flights, "k", fail, 3)
+    while flights.stats()["waiting"] < 2:
+        release.wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(outcomes) == 3 and all(isinstance(o, ValueError) for o in outcomes)
+    assert flights.do("k", lambda: 42) == (42, False)
+
+
+def test_different_keys_do_not_coalesce() -> None:
+    flights = SingleFlight()
+    assert flights.do("a", lambda: 1) == (1, False)
+    assert flights.do("a", lambda: 2) == (2, False)
+    with pytest.raises(KeyError):
+        flights.do("b", lambda: {}["x"])
+    assert flights.stats()["executions"] == 3 and flights.stats()["coalesced"] == 0
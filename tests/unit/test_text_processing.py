@@ -0,0 +1,17 @@
+from backend.storage.ingestion.text_processing import detect_cosolve_phase
+
+
+def test_detect_cosolve_phase_picks_unique_best() -> None:
+    text = "Prevention plan: update the procedure and training for the supplier."
+    assert detect_cosolve_phase(text) == "prevent"
+
+
+def test_detect_cosolve_phase_tie_and_empty_are_general() -> None:
+    assert detect_cosolve_phase("alarm and repair") == "general"
+    assert detect_cosolve_phase("nothing relevant here") == "general"
+
+
+def test_detect_cosolve_phase_matches_substrings_case_insensitively() -> None:
+    # "root cause" also counts "cause"; "Proofreading" contains "reading".
+    assert detect_cosolve_phase("ROOT CAUSE analysis") == "root_cause"
+    assert detect_cosolve_phase("Proofreading") == "diagnose"
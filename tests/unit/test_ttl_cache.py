@@ -0,0 +1,24 @@
+from backend.utils.ttl_cache import MISSING, TTLCache
+
+
+def test_entries_expire_after_ttl(clock) -> None:
+    cache = TTLCache(maxsize=4, ttl_seconds=10, clock=clock)
+    cache.put("q", [1, 2])
+    clock.now = 9.9
+    assert cache.get("q") == [1, 2]
+    clock.now = 10.0
+    assert cache.get("q") is MISSING
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(clock) -> None:
+    cache = TTLCache(maxsize=2, ttl_seconds=60, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b", None) is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("azure.search.documents")
+
+from backend.knowledge import case_search_client as csc
+from backend.knowledge.retrieval_cache import bump_generation
+from backend.utils.prefix_trie import PrefixTrie
+
+
+def _trie(*sites: str) -> PrefixTrie:
+    trie = PrefixTrie()
+    for i, site in enumerate(sites):
+        entry = (f"TRM-2025000{i}-0001", site, "AT")
+        trie.insert(site, entry)
+    return trie
+
+
+@pytest.fixture()
+def typeahead(monkeypatch):
+    monkeypatch.setattr(csc, "_typeahead_trie", None)
+    monkeypatch.setattr(csc, "_typeahead_built", (-1, 0.0))
+    monkeypatch.setattr(csc, "_typeahead_refreshing", False)
+    monkeypatch.setattr(csc, "resolve_index_name", lambda name: "case_index_v3")
+    monkeypatch.setattr(csc, "_suggester_present", {"case_index_v3": False})
+
+    def no_suggest():
+        raise AssertionError("suggest must not be called without a suggester")
+
+    monkeypatch.setattr(csc, "_get_case_search_client", no_suggest)
+    builds = []
+    monkeypatch.setattr(csc, "_build_typeahead_trie", lambda: builds.pop(0)())
+    return builds
+
+
+def test_index_without_suggester_goes_straight_to_the_trie(typeahead) -> None:
+    typeahead.append(lambda: _trie("Linz"))
+    assert csc.suggest_cases("li")[0]["organization_site"] == "Linz"
+
+
+def test_stale_trie_keeps_serving_while_rebuilt_in_background(typeahead) -> None:
+    release = threading.Event()
+
+    def slow_build():
+        release.wait(5)
+        return _trie("Linz", "Graz")
+
+    typeahead.extend([lambda: _trie("Linz"), slow_build])
+    assert [h["organization_site"] for h in csc.suggest_cases("l")] == ["Linz"]
+
+    bump_generation("case")
+    assert csc.suggest_cases("g") == []  # old trie answers; rebuild runs meanwhile
+    release.set()
+    while csc._typeahead_refreshing:
+        release.wait(0.01)
+    assert csc.suggest_cases("gr")[0]["organization_site"] == "Graz"
+
+
+def test_entity_terms_build_the_trie_in_the_background(typeahead) -> None:
+    release = threading.Event()
+
+    def slow_build():
+        release.wait(5)
+        return _trie("Linz", "Wiener Neustadt")
+
+    typeahead.append(slow_build)
+    assert csc.entity_terms() == frozenset()  # cold: no build on this thread
+    release.set()
+    while csc._typeahead_refreshing:
+        release.wait(0.01)
+    assert csc.entity_terms() == {"linz", "wiener", "neustadt", "at"}
@@ -382,6 +382,12 @@ document.addEventListener("DOMContentLoaded", () => {
     // but Lucene wildcard queries bypass the analyser at query time → "TRM*" misses "trm".
     const searchQuery = (isPartialCaseId && !isFullCaseId) ? query.toLowerCase() + "*" : query;
     caseSearchResults.innerHTML = "<div class='muted empty-state'>Searching cases...</div>";
+    caseSearchPaging = {
+      query: searchQuery,
+      searchType: isCaseId ? "case_id" : "text",
+      nextCursor: null,
+      loading: false,
+    };
 
     try {
       const res = await fetch(`${API_BASE}/cases/search`, {
@@ -389,7 +395,7 @@ document.addEventListener("DOMContentLoaded", () => {
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
           query: searchQuery,
-          search_type: isCaseId ? "case_id" : "text",
+          search_type: caseSearchPaging.searchType,
           limit: 10
         })
       });
@@ -403,6 +409,7 @@ document.addEventListener("DOMContentLoaded", () => {
       }
 
       const data = await res.json();
+      caseSearchPaging.nextCursor = data?.next_cursor || null;
       renderCaseSearchResults(data);
     } catch (err) {
       console.error("[Search] fetch error", err);
@@ -410,8 +417,80 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
+  // Lazy-load further result pages when the list is scrolled near its end.
+  let caseSearchPaging = null;
+
+  async function loadMoreCaseResults() {
+    const paging = caseSearchPaging;
+    if (!paging || !paging.nextCursor || paging.loading) return;
+    paging.loading = true;
+    try {
+      const res = await fetch(`${API_BASE}/cases/search`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          query: paging.query,
+          search_type: paging.searchType,
+          limit: 10,
+          cursor: paging.nextCursor
+        })
+      });
+      if (!res.ok || paging !== caseSearchPaging) return;
+      const data = await res.json();
+      paging.nextCursor = data?.next_cursor || null;
+      renderCaseSearchResults(data, { append: true });
+    } catch (err) {
+      console.error("[Search] next page error", err);
+    } finally {
+      paging.loading = false;
+    }
+  }
+
+  caseSearchResults?.addEventListener("scroll", () => {
+    const el = caseSearchResults;
+    if (el.scrollTop + el.clientHeight >= el.scrollHeight - 80) loadMoreCaseResults();
+  });
+
   runCaseSearchBtn?.addEventListener("click", runCaseSearch);
 
+  // Typeahead: prefix suggestions for case id / site / country.
+  const searchSuggestions = document.getElementById("search_suggestions");
+  let suggestTimer = null;
+  let suggestSeq = 0;
+
+  async function loadSuggestions(prefix) {
+    const seq = ++suggestSeq;
+    try {
+      const res = await fetch(`${API_BASE}/cases/suggest?q=${encodeURIComponent(prefix)}&top=8`);
+      if (!res.ok || seq !== suggestSeq) return;
+      const data = await res.json();
+      if (seq !== suggestSeq) return;
+      const values = new Set();
+      for (const s of data.suggestions || []) {
+        const lower = prefix.toLowerCase();
+        const match = [s.case_id, s.organization_site, s.organization_country]
+          .find((v) => v && v.toLowerCase().startsWith(lower));
+        values.add(match || s.case_id);
+      }
+      searchSuggestions.innerHTML = [...values]
+        .map((v) => `<option value="${escapeHtml(v)}"></option>`)
+        .join("");
+    } catch (err) {
+      console.warn("[Suggest] fetch error", err);
+    }
+  }
+
+  searchInput?.addEventListener("input", () => {
+    if (!searchSuggestions) return;
+    clearTimeout(suggestTimer);
+    const prefix = searchInput.value.trim();
+    if (prefix.length < 2) {
+      searchSuggestions.innerHTML = "";
+      return;
+    }
+    suggestTimer = setTimeout(() => loadSuggestions(prefix), 120);
+  });
+
   searchInput?.addEventListener("keydown", (e) => {
     if (e.key === "Enter") runCaseSearch();
   });
@@ -2293,7 +2372,7 @@ document.addEventListener("DOMContentLoaded", () => {
   // Expose for inline onclick handlers in search result cards
   window.loadCaseById = loadCaseById;
 
-  function renderCaseSearchResults(payload) {
+  function renderCaseSearchResults(payload, { append = false } = {}) {
     if (!caseSearchResults) return;
 
     let results = [];
@@ -2308,11 +2387,11 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     if (!results.length) {
-      caseSearchResults.innerHTML = "<div class='muted empty-state'>No results found.</div>";
+      if (!append) caseSearchResults.innerHTML = "<div class='muted empty-state'>No results found.</div>";
       return;
     }
 
-    caseSearchResults.innerHTML = results.map((c) => {
+    const html = results.map((c) => {
       const id = c?.case_id ?? c?.case_number ?? (typeof c === "string" ? c : "");
       const status = (c?.case_status ?? c?.status ?? "").toLowerCase();
       const statusLabel = status || "unknown";
@@ -2344,6 +2423,12 @@ document.addEventListener("DOMContentLoaded", () => {
           : ""}
         </div>`;
     }).join("");
+    if (append) {
+      caseSearchResults.insertAdjacentHTML("beforeend", html);
+    } else {
+      caseSearchResults.innerHTML = html;
+      caseSearchResults.scrollTop = 0;
+    }
   }
 
   function bindJsonField(el) {
@@ -3168,21 +3253,48 @@ document.addEventListener("DOMContentLoaded", () => {
 
     if (!cases.length) return;
 
+    // Per-file tally: a CSV row failing marks its whole file as failed.
+    const filenameByCaseId = new Map(cases.map((c) => [String(c.case_id).trim(), c.filename]));
+    const failedFiles = new Set();
+    const setFileStatus = (filename, ok) => {
+      const statusEl = byName.get(filename);
+      if (!statusEl) return;
+      statusEl.textContent = ok ? "Uploaded" : "Failed";
+      statusEl.className = ok
+        ? "status-badge status-success"
+        : "status-badge status-failed";
+    };
+
     try {
-      const res = await fetch(`${API_BASE}/entry/case`, {
+      // Results stream back as NDJSON, one line per case, then a summary line.
+      const res = await fetch(`${API_BASE}/entry/case/bulk`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(buildEntryEnvelope("UPDATE_CASE", null, { cases }))
-      });
-      const ok = res.ok;
-      cases.forEach((c) => {
-        const statusEl = byName.get(c.filename);
-        if (!statusEl) return;
-        statusEl.textContent = ok ? "Uploaded" : "Failed";
-        statusEl.className = ok
-          ? "status-badge status-success"
-          : "status-badge status-failed";
+        body: JSON.stringify({ cases })
       });
+      if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      const handleLine = (line) => {
+        if (!line.trim()) return;
+        const result = JSON.parse(line);
+        if (result.status === "bulk_imported") return;
+        const filename = filenameByCaseId.get(result.case_id);
+        if (!filename) return;
+        if (result.status !== "imported") failedFiles.add(filename);
+        setFileStatus(filename, !failedFiles.has(filename));
+      };
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split("\n");
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+      }
+      handleLine(buffer);
     } catch (e) {
       cases.forEach((c) => {
         const statusEl = byName.get(c.filename);